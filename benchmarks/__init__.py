@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Rules 벤치마크
+
+- corpus: 합성 Rules 코퍼스 생성기 (규모/길이 분포/프론트매터 변형/한·영/중복 비율)
+- timing: 측정 도우미 (첫 회 = cold, 나머지 중앙값 = warm - 모든 벤치마크 공통)
+- bench_suite: 핫 패스 규모별 측정 → JSON 결과, 이전 결과와 비교 (회귀 감지)
+- bench_*: 개별 기법 마이크로 벤치마크 (corpus 생성기 + timing 도우미 사용)
+"""
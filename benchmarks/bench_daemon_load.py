@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 검색 데몬 부하 벤치마크
+
+- 임시 워크스페이스에 합성 Rules 코퍼스(benchmarks/corpus.py) 생성 → scripts/rules_daemon.py 실행
+- 동시 클라이언트 N개가 연결을 유지한 채 JSON-lines로 검색 요청 반복
+- 질의는 소수의 문제 설명에서 뽑아 동일 질의 coalescing이 일어나도록 함
+- 클라이언트 1개/N개 각각 p50/p99 지연과 QPS, 데몬 배치/coalescing 통계 출력
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DAEMON_SCRIPT = ROOT / "scripts" / "rules_daemon.py"
+sys.path.insert(0, str(ROOT))
+from benchmarks.corpus import PROBLEMS, generate_corpus
+from benchmarks.timing import percentile
+
+
+async def request(reader, writer, payload):
+    """요청 한 줄 → 응답 한 줄"""
+    writer.write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(socket_path: Path, queries, latencies):
+    """연결 하나로 질의를 차례로 보내며 지연 기록"""
+    reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=1 << 24)
+    try:
+        for payload in queries:
+            start = time.perf_counter()
+            response = await request(reader, writer, payload)
+            latencies.append(time.perf_counter() - start)
+            if not response.get("ok"):
+                raise RuntimeError(response.get("error"))
+    finally:
+        writer.close()
+
+
+async def run_load(socket_path: Path, clients: int, requests: int, top_k, seed: int = 7):
+    """동시 클라이언트 부하 → (지연 목록, 소요 시간)"""
+    rng = random.Random(seed)
+    per_client = max(1, requests // clients)
+    plans = [
+        [{"op": "search", "problem": rng.choice(PROBLEMS), "top_k": top_k} for _ in range(per_client)]
+        for _ in range(clients)
+    ]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(socket_path, plan, latencies) for plan in plans))
+    return latencies, time.perf_counter() - start
+
+
+async def control(socket_path: Path, op: str):
+    """제어 요청 (stats / shutdown)"""
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    try:
+        return await request(reader, writer, {"op": op})
+    finally:
+        writer.close()
+
+
+def wait_for_daemon(socket_path: Path, process, timeout: float = 120.0):
+    """소켓이 생길 때까지 대기 (초기 색인 포함)"""
+    deadline = time.monotonic() + timeout
+    while not socket_path.exists():
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("데몬을 시작하지 못했습니다.")
+        time.sleep(0.05)
+
+
+def main():
+    """메인 실행"""
+    parser = argparse.ArgumentParser(description="Rules 검색 데몬 부하 벤치마크")
+    parser.add_argument("--rules", type=int, default=1000, help="합성 Rules 수")
+    parser.add_argument("--clients", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=2000, help="전체 요청 수")
+    parser.add_argument("--top-k", type=int, default=10, help="검색 top-k (0 = 전체 검색)")
+    args = parser.parse_args()
+    top_k = args.top_k or None
+
+    print("=" * 70)
+    print(f"⚡ Rules 검색 데몬 부하 벤치마크 (Rules {args.rules:,}개, 요청 {args.requests:,}개)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as workspace:
+        rules_dir = Path(workspace) / ".cursor" / "rules"
+        socket_path = rules_dir.parent / "rules_daemon.sock"
+        generate_corpus(rules_dir, args.rules)
+
+        env = dict(os.environ, CURSOR_WORKSPACE=workspace)
+        process = subprocess.Popen([sys.executable, str(DAEMON_SCRIPT)], env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            start = time.perf_counter()
+            wait_for_daemon(socket_path, process)
+            print(f"초기 색인: {time.perf_counter() - start:.2f}s\n")
+
+            for clients in (1, args.clients):
+                before = asyncio.run(control(socket_path, "stats"))["stats"]
+                latencies, elapsed = asyncio.run(run_load(socket_path, clients, args.requests, top_k))
+                after = asyncio.run(control(socket_path, "stats"))["stats"]
+                batches = after["batches"] - before["batches"]
+                coalesced = after["coalesced"] - before["coalesced"]
+                print(f"클라이언트 {clients:>3}개: p50 {percentile(latencies, 0.50) * 1000:6.2f}ms  "
+                      f"p99 {percentile(latencies, 0.99) * 1000:6.2f}ms  "
+                      f"{len(latencies) / elapsed:8.0f} QPS  "
+                      f"(배치 {batches}개, 배치당 {len(latencies) / max(batches, 1):.1f}건, coalesced {coalesced}건)")
+        finally:
+            try:
+                asyncio.run(control(socket_path, "shutdown"))
+                process.wait(timeout=10)
+            except Exception:
+                process.kill()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프론트매터 파싱 마이크로 벤치마크
+
+- 기존 방식: 파일 전체 read_text → content.split('---', 2) → 줄마다 ':' 분리
+  (check_rules_before_solution.parse_rule_metadata / RulesManager.parse_rule_file)
+- 기존 방식(정규식): 파일 전체 read_text → re.search (rules_optimizer)
+- 현재 방식: rules_frontmatter.read_front_matter (헤더 바이트만 읽음)
+- 합성 코퍼스(benchmarks/corpus.py)의 프론트매터 변형 + 본문 줄 수별 파일당 비용(µs)을 비교 출력
+"""
+
+import ast
+import random
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.corpus import body_lines, english_sentence, front_matter_lines, rule_name, rule_text
+from benchmarks.timing import per_call
+from rules_frontmatter import read_front_matter
+
+KOREAN_RATIO = 0.5
+
+
+def legacy_split(rule_file: Path) -> dict:
+    """기존 split('---') 파서 (+ tags/globs literal_eval)"""
+    content = rule_file.read_text(encoding='utf-8')
+    metadata = {}
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            for line in parts[1].split('\n'):
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    value = value.strip().strip('"').strip("'")
+                    if key.strip() in ('tags', 'globs') and value.startswith('['):
+                        value = ast.literal_eval(value)
+                    metadata[key.strip()] = value
+    return metadata
+
+
+def legacy_regex(rule_file: Path) -> dict:
+    """기존 rules_optimizer 정규식 탐지"""
+    content = rule_file.read_text(encoding='utf-8')
+    priority_match = re.search(r'priority:\s*(\d+)', content)
+    return {
+        "always_apply": bool(re.search(r'alwaysApply:\s*true', content, re.IGNORECASE)),
+        "priority": int(priority_match.group(1)) if priority_match else 5,
+        "has_globs": bool(re.search(r'globs:\s*\[', content)),
+    }
+
+
+def make_files(directory: Path, count: int, line_count: int, seed: int = 42):
+    """합성 Rules 파일 (파일마다 다른 프론트매터, 본문 line_count줄은 규모별로 한 번 생성해 공유)"""
+    rng = random.Random(seed)
+    directory = directory / f"lines-{line_count}"
+    directory.mkdir()
+    body = body_lines(rng, line_count, KOREAN_RATIO, "Rule")
+    files = []
+    for i in range(count):
+        rule_file = directory / rule_name(rng, i)
+        header = front_matter_lines(rng, english_sentence(rng)[:80])
+        rule_file.write_text(rule_text(header, body), encoding='utf-8')
+        files.append(rule_file)
+    return files
+
+
+def main():
+    """메인 실행"""
+    print("=" * 70)
+    print("⏱️ 프론트매터 파싱 마이크로 벤치마크 (파일당 비용)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count, line_count in [(200, 30), (100, 1000), (20, 15000)]:
+            files = make_files(Path(tmp), count, line_count)
+            body_kb = files[0].stat().st_size / 1024
+            split = per_call(legacy_split, files)
+            regex = per_call(legacy_regex, files)
+            header = per_call(read_front_matter, files)
+            print(f"파일 {count}개 x 본문 {line_count:,}줄 (~{body_kb:,.0f}KB)")
+            print(f"  기존 split('---'):  {split * 1e6:11.1f} µs/파일")
+            print(f"  기존 정규식:        {regex * 1e6:11.1f} µs/파일")
+            print(f"  헤더만 읽기:        {header * 1e6:11.1f} µs/파일")
+            print(f"  개선: split 대비 {split / header:.1f}x, 정규식 대비 {regex / header:.1f}x")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+globs 적용 판정 벤치마크
+
+- 기존 방식: 경로마다, Rules마다, glob마다 fnmatch (중괄호는 미리 확장)
+- 비교용: 같은 규칙의 정규식을 경로마다 전부 확인 (색인 효과만 분리, 결과 동일 검증)
+- 현재 방식: GlobMatcher (컴파일 1회 + 접두사 트라이/확장자/세그먼트 색인으로 후보만 확인)
+- 합성 코퍼스(benchmarks/corpus.py)의 globs/변경 파일 목록 1만 개 x Rules 500개 판정 시간 비교
+"""
+
+import fnmatch
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.corpus import changed_paths, rule_globs, rule_name
+from benchmarks.timing import warm_time
+from rules_globs import GlobMatcher, expand_braces, glob_to_regex
+
+PATH_COUNT = 10_000
+RULE_COUNT = 500
+
+
+def make_rules(count: int, seed: int = 42):
+    """합성 Rules globs {이름: globs}"""
+    rng = random.Random(seed)
+    return {rule_name(rng, i): rule_globs(rng) for i in range(count)}
+
+
+def legacy_match(rules, paths):
+    """경로 x Rules x glob fnmatch 루프"""
+    expanded = {name: [p for g in globs for p in expand_braces(g)] for name, globs in rules.items()}
+    return {
+        path: sorted(name for name, globs in expanded.items()
+                     if any(fnmatch.fnmatchcase(path, glob) for glob in globs))
+        for path in paths
+    }
+
+
+def regex_loop_match(rules, paths):
+    """경로 x 전체 glob 정규식 루프 (GlobMatcher와 같은 규칙, 후보 색인 없음)"""
+    compiled = {name: [re.compile(glob_to_regex(p)) for g in globs for p in expand_braces(g)]
+                for name, globs in rules.items()}
+    return {
+        path: sorted(name for name, patterns in compiled.items() if any(p.fullmatch(path) for p in patterns))
+        for path in paths
+    }
+
+
+def main():
+    """메인 실행"""
+    rules = make_rules(RULE_COUNT)
+    paths = changed_paths(random.Random(7), PATH_COUNT)
+
+    print("=" * 70)
+    print(f"📐 globs 적용 판정 벤치마크 (경로 {PATH_COUNT:,}개 x Rules {RULE_COUNT}개)")
+    print("=" * 70)
+
+    legacy_time, _ = warm_time(lambda i: legacy_match(rules, paths), repeat=1)
+    regex_time, baseline = warm_time(lambda i: regex_loop_match(rules, paths), repeat=1)
+    build_time, matcher = warm_time(lambda i: GlobMatcher(rules))
+    match_time, result = warm_time(lambda i: matcher.match_many(paths))
+    assert result == baseline
+
+    print(f"fnmatch 루프:   {legacy_time:7.2f}s ('*'가 '/'를 넘는 등 규칙이 달라 참고용, 1회)")
+    print(f"정규식 루프:    {regex_time:7.2f}s (1회)")
+    print(f"GlobMatcher:    {match_time:7.2f}s (컴파일 {build_time * 1000:.0f}ms, 고유 glob {matcher.glob_count}개)")
+    print(f"속도 향상: fnmatch 대비 x{legacy_time / match_time:.0f}, 정규식 루프 대비 x{regex_time / match_time:.0f}")
+
+
+if __name__ == "__main__":
+    main()
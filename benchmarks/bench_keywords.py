@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+키워드 사전 매칭 마이크로 벤치마크
+
+- 기존 방식: 사전 단어마다 `keyword in problem_lower` (사전 크기에 비례)
+- 현재 방식: Aho–Corasick 오토마톤으로 문장 한 번 순회
+- 사전 크기별 질의당 비용(µs), load_matcher 콜드(컴파일 + 캐시 저장)/웜(디스크 캐시 로드) 시간 비교
+  (load_matcher는 프로세스 안에서 메모하므로 콜드/웜 각각 새 프로세스에서 측정)
+"""
+
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from benchmarks.timing import per_call
+from rules_keywords import DEFAULT_KEYWORDS, KeywordMatcher
+
+# 새 프로세스에서 load_matcher 한 번 → (소요 ms, 사전 단어 수)
+LOAD_SCRIPT = """
+import json, sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from rules_keywords import load_matcher
+start = time.perf_counter()
+matcher = load_matcher(Path(sys.argv[2]), Path(sys.argv[3]))
+print(json.dumps([(time.perf_counter() - start) * 1000, len(matcher.keywords)]))
+"""
+
+QUERIES = [
+    "SSH 키 배포 문제 해결 방법", "hostinger vps 환경 변수 설정 오류",
+    "rules 우선순위 충돌과 workflow 정리", "보안 에이전트 비밀번호 저장 위치",
+    "daily 일일 리포트 자동화 스크립트 실패", "f-drive 경로 독립성 검증",
+]
+
+
+def make_dictionary(size: int, seed: int = 42):
+    """합성 도메인 사전 (한/영 혼합, 기본 사전 포함)"""
+    rng = random.Random(seed)
+    syllables = "가나다라마바사아자차카타파하보안배포환경규칙검증설정"
+    terms = list(DEFAULT_KEYWORDS)
+    while len(terms) < size:
+        if rng.random() < 0.5:
+            terms.append(''.join(rng.choices(syllables, k=rng.randint(2, 4))))
+        else:
+            terms.append(''.join(rng.choices("abcdefghijklmnopqrstuvwxyz-", k=rng.randint(3, 10))))
+    return terms[:size]
+
+
+def legacy_find(keywords, problem_lower):
+    """기존 extract_keywords의 사전 루프"""
+    return [keyword for keyword in keywords if keyword in problem_lower]
+
+
+def load_ms(dictionary_path: Path, cache_path: Path) -> float:
+    """새 프로세스에서 load_matcher 소요 시간(ms, 인터프리터 시작 제외)"""
+    completed = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, str(ROOT), str(dictionary_path), str(cache_path)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout)[0]
+
+
+def per_query_us(func, rounds: int) -> float:
+    """질의당 warm 시간(µs)"""
+    return per_call(func, [q.lower() for q in QUERIES], repeat=max(3, rounds)) * 1e6
+
+
+def main():
+    """메인 실행"""
+    print("=" * 70)
+    print("🔤 키워드 사전 매칭 벤치마크")
+    print("=" * 70)
+    print(f"{'사전 크기':>10} {'기존(µs)':>10} {'AC(µs)':>10} {'콜드(ms)':>10} {'웜(ms)':>10}")
+
+    for size in (len(DEFAULT_KEYWORDS), 1_000, 10_000, 50_000):
+        terms = make_dictionary(size)
+        matcher = KeywordMatcher.build(terms)
+        for query in QUERIES:
+            assert matcher.find(query.lower()) == legacy_find(matcher.keywords, query.lower())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dictionary_path = Path(tmp) / "rules_keywords.txt"
+            dictionary_path.write_text("\n".join(terms), encoding="utf-8")
+            cache_path = Path(tmp) / "rules_keywords_automaton.json"
+            cold_ms = load_ms(dictionary_path, cache_path)  # 컴파일 + 캐시 저장
+            warm_ms = load_ms(dictionary_path, cache_path)  # 디스크 캐시 로드
+
+        rounds = max(1, 20_000 // size)
+        legacy_us = per_query_us(lambda q: legacy_find(matcher.keywords, q), rounds)
+        matcher_us = per_query_us(matcher.find, rounds * 10)
+        print(f"{size:>10,} {legacy_us:>10.1f} {matcher_us:>10.1f} {cold_ms:>10.1f} {warm_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rule 레코드 메모리/직렬화 벤치마크
+
+- 기존 방식: Rule당 dict (원본 metadata dict + datetime + 중복 문자열)
+- 현재 방식: RuleRecord (__slots__, RuleType 열거형, epoch mtime, 공유 문자열)
+- 합성 10만 Rules 코퍼스(benchmarks/corpus.py 프론트매터/줄 수 분포)의 tracemalloc 할당량과
+  JSON 내보내기 시간 비교
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.corpus import (english_sentence, front_matter_lines, korean_sentence, line_count_for,
+                               mtime_for, rule_name)
+from benchmarks.timing import warm_time
+from rules_frontmatter import FrontMatter, parse_header_lines
+from rules_record import RuleRecord, records_to_dicts
+
+RULE_COUNT = 100_000
+DIRECTORY = ".cursor/rules"
+BYTES_PER_LINE = 60  # 본문을 만들지 않고 줄 수로 파일 크기 추정 (코퍼스 평균 수준)
+
+
+def make_front_matters(count: int, seed: int = 42):
+    """합성 프론트매터 원문 (파일마다 parse_header_lines로 새로 파싱된 문자열)"""
+    rng = random.Random(seed)
+    now = time.time()
+    rows = []
+    for i in range(count):
+        description = korean_sentence(rng) if rng.random() < 0.5 else english_sentence(rng)
+        front_matter = parse_header_lines(front_matter_lines(rng, description[:80]))
+        lines = line_count_for(rng, 30, 0.002)
+        rows.append((rule_name(rng, i), lines * BYTES_PER_LINE, mtime_for(rng, now), front_matter, lines))
+    return rows
+
+
+def legacy_rule_info(name, size, mtime, metadata, content_lines):
+    """기존 RulesManager._build_rule_info 결과 형태"""
+    front_matter = FrontMatter(metadata)
+    return {
+        "name": name,
+        "path": str(Path(DIRECTORY) / name),
+        "size": size,
+        "modified": datetime.fromtimestamp(mtime),
+        "priority": front_matter.priority if front_matter.priority is not None else 5,
+        "always_apply": bool(front_matter.always_apply),
+        "description": metadata.get("description", ""),
+        "globs": metadata.get("globs", ""),
+        "type": metadata.get("type", ""),
+        "tags": metadata.get("tags", ""),
+        "content_lines": content_lines,
+        "metadata": metadata
+    }
+
+
+def measure(build):
+    """합성 코퍼스 파싱 → build 후 결과가 붙잡고 있는 메모리(바이트)와 결과"""
+    tracemalloc.start()
+    result = build(make_front_matters(RULE_COUNT))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    """메인 실행"""
+    print("=" * 70)
+    print(f"🧮 Rule 레코드 벤치마크 (합성 {RULE_COUNT:,}개)")
+    print("=" * 70)
+
+    # 파싱된 프론트매터는 측정 구간 안에서 만들고, 결과가 참조하는 부분만 남음
+    legacy_bytes, legacy = measure(lambda rows: [legacy_rule_info(*row) for row in rows])
+    record_bytes, records = measure(
+        lambda rows: [RuleRecord.from_front_matter(name, DIRECTORY, size, mtime, fm, lines)
+                      for name, size, mtime, fm, lines in rows])
+
+    print(f"기존 dict:   {legacy_bytes / 1e6:8.1f} MB ({legacy_bytes / RULE_COUNT:.0f} B/Rule)")
+    print(f"RuleRecord:  {record_bytes / 1e6:8.1f} MB ({record_bytes / RULE_COUNT:.0f} B/Rule)")
+    print(f"감소: {(1 - record_bytes / legacy_bytes) * 100:.0f}%")
+    print()
+
+    legacy_time, legacy_json = warm_time(
+        lambda i: json.dumps({"rules": legacy}, indent=2, ensure_ascii=False, default=str))
+    record_time, record_json = warm_time(
+        lambda i: json.dumps({"rules": records_to_dicts(records)}, indent=2, ensure_ascii=False, default=str))
+
+    print(f"JSON 내보내기 기존:      {legacy_time:6.2f}s ({len(legacy_json) / 1e6:.1f} MB)")
+    print(f"JSON 내보내기 RuleRecord: {record_time:6.2f}s ({len(record_json) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
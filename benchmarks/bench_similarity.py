@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+유사도 계산 마이크로 벤치마크
+
+- 기존 방식: 쌍마다 re.findall로 두 문자열을 다시 토큰화 후 set 비교
+- 현재 방식: 텍스트당 한 번 토큰화/인터닝 → frozenset[int] 간 Jaccard
+- 합성 코퍼스(benchmarks/corpus.py) 본문 줄 수별 쌍당 비용(µs)을 비교 출력
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.corpus import body_lines
+from benchmarks.timing import per_call, warm_time
+from rules_tokens import TokenInterner, jaccard
+
+
+def legacy_similarity(content1: str, content2: str) -> float:
+    """기존 _calculate_similarity / _similarity 구현"""
+    words1 = set(re.findall(r'\w+', content1.lower()))
+    words2 = set(re.findall(r'\w+', content2.lower()))
+    
+    if not words1 or not words2:
+        return 0.0
+    
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
+    
+    return intersection / union if union > 0 else 0.0
+
+
+def make_texts(count: int, line_count: int, seed: int = 42):
+    """합성 Rules 본문 (한/영 혼합, Rule마다 다른 주제 단어)"""
+    rng = random.Random(seed)
+    return ['\n'.join(body_lines(rng, line_count, 0.5, f"Rule {i}")) for i in range(count)]
+
+
+def bench(texts, pairs):
+    """기존/현재 방식 쌍당 비용 측정"""
+    legacy = per_call(lambda pair: legacy_similarity(texts[pair[0]], texts[pair[1]]), pairs, repeat=3)
+    
+    def prepare_sets(_):
+        interner = TokenInterner()
+        return [interner.intern_text(text) for text in texts]
+    prepare, token_sets = warm_time(prepare_sets)
+    
+    interned = per_call(lambda pair: jaccard(token_sets[pair[0]], token_sets[pair[1]]), pairs)
+    
+    return legacy, interned, prepare
+
+
+def main():
+    """메인 실행"""
+    print("=" * 70)
+    print("⏱️ 유사도 계산 마이크로 벤치마크 (쌍당 비용)")
+    print("=" * 70)
+    
+    rng = random.Random(0)
+    for count, lines in [(200, 3), (200, 30), (200, 200)]:
+        texts = make_texts(count, lines)
+        pairs = [(rng.randrange(count), rng.randrange(count)) for _ in range(5000)]
+        legacy, interned, prepare = bench(texts, pairs)
+        words = sum(len(text.split()) for text in texts) // count
+        print(f"텍스트 {count}개 x {lines}줄 (~{words}단어)")
+        print(f"  기존 (쌍마다 재토큰화): {legacy * 1e6:9.2f} µs/쌍")
+        print(f"  인터닝 집합:            {interned * 1e6:9.2f} µs/쌍 (사전 토큰화 {prepare * 1e3:.1f} ms 1회)")
+        print(f"  개선: {legacy / interned:.0f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
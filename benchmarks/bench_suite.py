@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 핫 패스 벤치마크 스위트 (회귀 감지용)
+
+- 규모별(기본 10 / 1k / 10k / 100k) 합성 코퍼스를 임시 워크스페이스에 생성
+  (도구는 워크스페이스 기준 경로를 쓰므로 저장소 *.py를 <워크스페이스>/tools 에 복사해 실행)
+- 케이스마다 별도 프로세스, 파생 캐시(.cursor의 코퍼스 DB/색인/번들 등) 삭제 후 실행
+  → 첫 실행 = cold(캐시 생성 포함), 이후 반복의 중앙값 = warm
+- 파일을 바꾸는 단계는 dry-run (중복 제거, 최적화 패스) → 반복 실행해도 코퍼스 동일
+- 결과는 JSON (커밋/환경/코퍼스 설정 포함), --compare 로 이전 결과와 비교해 회귀 시 종료 코드 1
+
+사용:
+    python benchmarks/bench_suite.py                       # 전체 규모
+    python benchmarks/bench_suite.py --sizes 10 1000 --cases search_rules_files
+    python benchmarks/bench_suite.py --sizes 1000 --compare benchmarks/results/이전.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource  # Unix 전용 (최대 RSS)
+except ImportError:
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from benchmarks.corpus import PROBLEMS, generate_corpus
+from benchmarks.timing import summarize, time_runs
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+RESULT_FORMAT = 1
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+REGRESSION_THRESHOLD = 1.2  # 이전 대비 이 배수 이상 느려지면 회귀
+NOISE_FLOOR_S = 0.005  # 이보다 작은 차이는 측정 잡음으로 간주
+
+
+# ----------------------------------------------------------------------
+# 케이스 (워커 프로세스에서 실행, tools 디렉토리가 sys.path에 있음)
+#   setup() → 측정 함수 run(i) - 반환값은 작업량 요약 (커밋 간 결과 동일성 확인용)
+# ----------------------------------------------------------------------
+
+def case_search_rules_files():
+    """역색인 검색 (데몬 미사용, 질의 순환)"""
+    from check_rules_before_solution import search_rules_files
+    rules_dir = Path(os.environ["BENCH_RULES_DIR"])
+
+    def run(i):
+        return len(search_rules_files(PROBLEMS[i % len(PROBLEMS)], rules_dir, top_k=10, use_daemon=False))
+    return run
+
+
+def case_rules_manager_scan():
+    """RulesManager 스캔 (코퍼스 캐시 헤더)"""
+    from rules_diagnostics import RulesManager
+
+    def run(i):
+        return len(RulesManager().rules)
+    return run
+
+
+def case_detect_conflicts():
+    """충돌/유사 이름 감지 (스캔은 측정 제외)"""
+    from rules_diagnostics import RulesManager
+    manager = RulesManager()
+
+    def run(i):
+        return len(manager.detect_conflicts()) + len(manager.similar_names)
+    return run
+
+
+def case_remove_duplicate_rules():
+    """중복 감지 (MinHash LSH + Jaccard, dry-run)"""
+    from rules_auto_cleanup import RulesAutoCleanup
+
+    def run(i):
+        return RulesAutoCleanup().remove_duplicate_rules(dry_run=True)
+    return run
+
+
+def case_generate_weekly_report():
+    """주간 리포트 (단일 패스 수집기)"""
+    from rules_auto_cleanup_scheduler import generate_weekly_report
+
+    def run(i):
+        return len(generate_weekly_report())
+    return run
+
+
+def case_optimizer_passes():
+    """Priority 0 → 1 + alwaysApply → intelligent 한 배치 (dry-run: 재작성까지, 쓰기 제외)"""
+    from rules_edit import FrontMatterBatch
+    from rules_optimizer import RULES_DIR, adjust_priority_0_to_1, apply_batch, change_always_apply_to_intelligent
+
+    def run(i):
+        batch = FrontMatterBatch(RULES_DIR)
+        adjust_priority_0_to_1(dry_run=True, batch=batch)
+        change_always_apply_to_intelligent(dry_run=True, batch=batch)
+        apply_batch(batch, dry_run=True)
+        return len(batch)
+    return run
+
+
+CASES = {
+    "search_rules_files": case_search_rules_files,
+    "rules_manager_scan": case_rules_manager_scan,
+    "detect_conflicts": case_detect_conflicts,
+    "remove_duplicate_rules": case_remove_duplicate_rules,
+    "generate_weekly_report": case_generate_weekly_report,
+    "optimizer_passes": case_optimizer_passes,
+}
+
+
+def max_rss_mb() -> Optional[float]:
+    """현재 프로세스 최대 RSS (MB, Linux는 KB 단위 / macOS는 바이트 단위)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def run_worker(case: str, tools_dir: Path, repeat: int):
+    """워커: 케이스 1개를 repeat회 실행 → 마지막 줄에 JSON 출력"""
+    sys.path[:0] = [str(tools_dir), str(tools_dir / "scripts")]
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        run = CASES[case]()
+        setup_s = time.perf_counter() - start
+        timings, results = time_runs(run, repeat)
+    print(json.dumps({"setup_s": setup_s, "timings": timings, "results": results, "max_rss_mb": max_rss_mb()}))
+
+
+# ----------------------------------------------------------------------
+# 러너
+# ----------------------------------------------------------------------
+
+def prepare_workspace(workspace: Path):
+    """저장소 도구를 <워크스페이스>/tools 로 복사 (도구의 WORKSPACE = tools의 상위)"""
+    tools_dir = workspace / "tools"
+    (tools_dir / "scripts").mkdir(parents=True, exist_ok=True)
+    for source in ROOT.glob("*.py"):
+        shutil.copy2(source, tools_dir / source.name)
+    for source in (ROOT / "scripts").glob("*.py"):
+        shutil.copy2(source, tools_dir / "scripts" / source.name)
+    return tools_dir
+
+
+def clear_derived(workspace: Path, rules_dir: Path):
+    """Rules 외 파생 파일(캐시 DB, 색인, 번들, 백업, 리포트) 삭제 → 케이스마다 cold 시작"""
+    cursor_dir = rules_dir.parent
+    for path in cursor_dir.iterdir():
+        if path == rules_dir:
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    shutil.rmtree(workspace / "daily", ignore_errors=True)
+
+
+def run_case(case: str, workspace: Path, tools_dir: Path, rules_dir: Path, repeat: int, timeout: float) -> Dict:
+    """케이스 1개를 별도 프로세스로 실행 → 결과 dict"""
+    clear_derived(workspace, rules_dir)
+    env = dict(os.environ, CURSOR_WORKSPACE=str(workspace), BENCH_RULES_DIR=str(rules_dir),
+               PYTHONIOENCODING="utf-8")
+    command = [sys.executable, str(Path(__file__).resolve()), "--worker", case,
+               "--tools", str(tools_dir), "--repeat", str(repeat)]
+    try:
+        completed = subprocess.run(command, env=env, capture_output=True, text=True,
+                                   encoding="utf-8", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"시간 초과 ({timeout:.0f}s)"}
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "실패"}
+    data = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings = data["timings"]
+    summary = summarize(timings)
+    return {
+        "cold_s": round(summary["cold_s"], 6),
+        "warm_s": round(summary["warm_s"], 6) if summary["warm_s"] is not None else None,
+        "setup_s": round(data["setup_s"], 6),
+        "timings_s": [round(t, 6) for t in timings],
+        "result": data["results"][-1],
+        "max_rss_mb": data["max_rss_mb"],
+    }
+
+
+def git_commit() -> Optional[str]:
+    """현재 커밋 (git이 없으면 None)"""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """이전 결과와 비교 출력 → 회귀 목록"""
+    regressions = []
+    print("\n" + "=" * 70)
+    print(f"📊 비교: {(baseline.get('commit') or '?')[:10]} → {(current.get('commit') or '?')[:10]}")
+    print("=" * 70)
+    for size, cases in current["results"].items():
+        for case, result in cases.items():
+            before = baseline.get("results", {}).get(size, {}).get(case)
+            if not before or "error" in before or "error" in result:
+                continue
+            for key in ("cold_s", "warm_s"):
+                old, new = before.get(key), result.get(key)
+                if not old or new is None:
+                    continue
+                ratio = new / old
+                regressed = ratio >= threshold and new - old > NOISE_FLOOR_S
+                mark = "❌" if regressed else ("✅" if ratio <= 1 / threshold else "  ")
+                print(f"{mark} {int(size):>7,} {case:<24} {key[:-2]:<4} {old * 1000:10.1f}ms → {new * 1000:10.1f}ms  x{ratio:.2f}")
+                if regressed:
+                    regressions.append(f"{size} {case} {key[:-2]} x{ratio:.2f}")
+            if before.get("result") != result.get("result"):
+                print(f"⚠️ {int(size):>7,} {case}: 결과 요약이 다릅니다 ({before.get('result')} → {result.get('result')})")
+    return regressions
+
+
+def main():
+    """메인 실행"""
+    parser = argparse.ArgumentParser(description="Rules 핫 패스 벤치마크 스위트")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="코퍼스 규모 (Rules 수)")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES), help="실행할 케이스")
+    parser.add_argument("--repeat", type=int, default=3, help="케이스당 실행 횟수 (첫 회 = cold)")
+    parser.add_argument("--timeout", type=float, default=1800, help="케이스당 제한 시간 (초)")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스 seed")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05, help="중복 사본 비율")
+    parser.add_argument("--korean-ratio", type=float, default=0.5, help="한국어 문장 비율")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON (기본: benchmarks/results/<시각>-<커밋>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="회귀 판정 배수")
+    parser.add_argument("--worker", choices=sorted(CASES), help=argparse.SUPPRESS)
+    parser.add_argument("--tools", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.tools, args.repeat)
+        return
+
+    commit = git_commit()
+    report = {
+        "format": RESULT_FORMAT,
+        "generated_at": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "corpus": {},
+        "results": {},
+    }
+
+    print("=" * 70)
+    print(f"⚡ Rules 핫 패스 벤치마크 (규모 {', '.join(f'{s:,}' for s in args.sizes)}, 반복 {args.repeat}회)")
+    print("=" * 70)
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="rules_bench_") as tmp:
+            workspace = Path(tmp)
+            rules_dir = workspace / ".cursor" / "rules"
+            tools_dir = prepare_workspace(workspace)
+            start = time.perf_counter()
+            spec = generate_corpus(rules_dir, size, seed=args.seed, korean_ratio=args.korean_ratio,
+                                   duplicate_ratio=args.duplicate_ratio)
+            print(f"\n📁 Rules {size:,}개 ({spec['stats']['bytes'] / 1e6:.1f}MB, 생성 {time.perf_counter() - start:.1f}s)")
+            report["corpus"][str(size)] = spec
+            results = report["results"].setdefault(str(size), {})
+
+            for case in args.cases:
+                result = run_case(case, workspace, tools_dir, rules_dir, args.repeat, args.timeout)
+                results[case] = result
+                if "error" in result:
+                    print(f"  ❌ {case:<24} {result['error']}")
+                    continue
+                warm = f"{result['warm_s'] * 1000:10.1f}ms" if result["warm_s"] is not None else f"{'-':>12}"
+                rss = f"{result['max_rss_mb']:8.1f}MB" if result["max_rss_mb"] is not None else ""
+                print(f"  {case:<24} cold {result['cold_s'] * 1000:10.1f}ms  warm {warm}  {rss}  (결과 {result['result']})")
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{(commit or 'nogit')[:10]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건 (x{args.threshold} 이상)")
+            sys.exit(1)
+        print("\n✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
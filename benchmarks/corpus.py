@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성 Rules 코퍼스 생성기
+
+- 파일 수, 본문 길이 분포(로그정규 + 소수의 1000줄+ 긴 룰), 한/영 비율, 중복 비율 조정
+- 프론트매터 변형: priority/alwaysApply/type/globs(인라인/블록/문자열)/tags, 주석, 따옴표,
+  누락 필드, 프론트매터 없는 파일, BOM, CRLF
+- globs: 확장자/디렉토리/중괄호 혼합 패턴, 변경 파일 경로 목록 (globs 판정 벤치마크와 공유)
+- 중복: 앞서 만든 Rule을 다른 이름으로 복사하고 한두 줄만 바꿈 (유사도 0.8 이상)
+- mtime을 최근 90일에 분산 (주간 리포트/아카이브 집계가 실제와 비슷하게 나뉘도록)
+- 같은 seed면 같은 코퍼스 (커밋 간 비교용)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ENGLISH_WORDS = [
+    "rule", "deploy", "security", "workflow", "daily", "priority", "environment", "agent",
+    "verify", "server", "token", "cache", "index", "search", "context", "memory", "review",
+    "commit", "branch", "release", "config", "database", "backup", "restore", "schedule",
+    "report", "error", "retry", "timeout", "session", "python", "script", "module", "test",
+]
+KOREAN_WORDS = [
+    "규칙", "배포", "보안", "워크플로우", "일일", "우선순위", "환경", "에이전트", "검증",
+    "서버", "토큰", "캐시", "색인", "검색", "컨텍스트", "메모리", "리뷰", "커밋", "브랜치",
+    "설정", "데이터베이스", "백업", "복원", "일정", "리포트", "오류", "재시도", "세션", "스크립트",
+]
+KOREAN_ENDINGS = ["합니다", "하세요", "해야 합니다", "금지", "필수", "확인", "적용"]
+KOREAN_PARTICLES = ["은", "는", "이", "가", "을", "를", "에서", "으로", "의"]
+ENGLISH_SYLLABLES = ["ka", "to", "ri", "mon", "sel", "ver", "da", "lin", "por", "qui", "zen", "tra", "bel", "nor"]
+HANGUL_SYLLABLES = list("가나다라마바사아자차카타파하강민수진영호철미선정")
+TOPIC_POOL_SIZE = 4000  # 언어별 주제 단어 수 (Rule마다 일부만 사용 → Rule 간 어휘 차이)
+TOPIC_WORDS = (24, 48)  # Rule당 주제 단어 수
+TOPIC_SHARE = 0.5  # 문장 단어 중 주제 단어 비율
+
+# Rule 이름 조각 (최적화 계획의 카테고리 패턴이 고르게 나오도록 포함)
+NAME_WORDS = [
+    "layer0", "autonomous", "critical", "auto-execution", "f-drive", "independence", "mcp",
+    "mandatory", "enforcement", "ssh", "key", "subprocess", "env", "verification", "date",
+    "validation", "memory", "workflow", "deploy", "security", "review", "auto-learned",
+] + ENGLISH_WORDS
+
+TYPES = ["", "always", "intelligent", "file-specific", "manual"]
+DIRECTORIES = ["src", "scripts", "docs", "tests", "tools", "app", "lib", "ssh", "config", "web"]
+EXTENSIONS = [".py", ".ts", ".tsx", ".js", ".md", ".sh", ".ps1", ".json", ".yaml", ".mdc"]
+CODE_LANGS = ["python", "bash", "powershell", "json"]
+
+MAX_LINES = 5000
+LONG_LINES = (1000, 3000)
+MTIME_SPREAD_DAYS = 90
+
+# 검색 질의 (코퍼스 어휘에서 뽑은 문제 설명 - 벤치마크 간 공유)
+PROBLEMS = [
+    "SSH 키 배포 문제", "deploy security review", "우선순위 규칙 충돌",
+    "환경 변수 설정 오류", "daily workflow 백업 복원", "token cache timeout retry",
+]
+
+
+def topic_pool(syllables: List[str], seed: int) -> List[str]:
+    """음절 조합 의사 단어 목록 (중복 없음, seed 고정)"""
+    rng = random.Random(seed)
+    words = {}
+    while len(words) < TOPIC_POOL_SIZE:
+        words["".join(rng.choices(syllables, k=rng.randint(2, 4)))] = None
+    return list(words)
+
+
+ENGLISH_TOPICS = topic_pool(ENGLISH_SYLLABLES, 1)
+KOREAN_TOPICS = topic_pool(HANGUL_SYLLABLES, 2)
+
+
+def pick_words(rng: random.Random, common: List[str], topic: List[str], k: int) -> List[str]:
+    """공통 단어 + Rule 주제 단어 혼합"""
+    return [rng.choice(topic) if topic and rng.random() < TOPIC_SHARE else rng.choice(common) for _ in range(k)]
+
+
+def english_sentence(rng: random.Random, topic: List[str] = ()) -> str:
+    """영문 문장"""
+    words = pick_words(rng, ENGLISH_WORDS, topic, rng.randint(6, 14))
+    return " ".join(words).capitalize() + "."
+
+
+def korean_sentence(rng: random.Random, topic: List[str] = ()) -> str:
+    """한국어 문장 (조사/어미 포함 → 형태 변형 토큰)"""
+    words = [
+        word + rng.choice(KOREAN_PARTICLES) if rng.random() < 0.6 else word
+        for word in pick_words(rng, KOREAN_WORDS, topic, rng.randint(4, 9))
+    ]
+    return " ".join(words) + " " + rng.choice(KOREAN_ENDINGS) + "."
+
+
+def body_lines(rng: random.Random, line_count: int, korean_ratio: float, title: str) -> List[str]:
+    """본문 줄 (## 섹션, 목록, 코드 펜스, 한/영 문단 혼합, Rule마다 다른 주제 단어)"""
+    english_topic = rng.sample(ENGLISH_TOPICS, rng.randint(*TOPIC_WORDS))
+    korean_topic = rng.sample(KOREAN_TOPICS, rng.randint(*TOPIC_WORDS))
+
+    def sentence():
+        if rng.random() < korean_ratio:
+            return korean_sentence(rng, korean_topic)
+        return english_sentence(rng, english_topic)
+
+    lines = [f"# {title}", ""]
+    section = 0
+    while len(lines) < line_count:
+        remaining = line_count - len(lines)
+        roll = rng.random()
+        if roll < 0.12 or section == 0:
+            section += 1
+            lines += [f"## {section}. {sentence()[:40].rstrip('.')}", ""]
+        elif roll < 0.2 and remaining > 6:
+            code = [f"{rng.choice(ENGLISH_WORDS)}_{i} = {rng.randrange(1000)}" for i in range(rng.randint(2, 8))]
+            lines += [f"```{rng.choice(CODE_LANGS)}", "# comment: " + rng.choice(ENGLISH_WORDS)] + code + ["```", ""]
+        elif roll < 0.45:
+            for _ in range(rng.randint(2, 6)):
+                lines.append(f"- {sentence()}")
+            lines.append("")
+        else:
+            lines += [" ".join(sentence() for _ in range(rng.randint(1, 3))), ""]
+    return lines[:line_count]
+
+
+def rule_globs(rng: random.Random) -> List[str]:
+    """Rule 하나의 globs (확장자/디렉토리/혼합/중괄호 패턴 1~4개)"""
+    globs = []
+    for _ in range(rng.randint(1, 4)):
+        kind = rng.random()
+        ext = rng.choice(EXTENSIONS)
+        directory = rng.choice(DIRECTORIES)
+        if kind < 0.4:
+            globs.append(f"**/*{ext}")
+        elif kind < 0.7:
+            globs.append(f"{directory}/**/*{ext}")
+        elif kind < 0.85:
+            globs.append(f"**/{directory}/**")
+        else:
+            globs.append(f"{directory}/*.{{{ext[1:]},{rng.choice(EXTENSIONS)[1:]}}}")
+    return globs
+
+
+def changed_paths(rng: random.Random, count: int) -> List[str]:
+    """변경 파일 경로 목록 (globs 판정 입력)"""
+    return [
+        "/".join(rng.choices(DIRECTORIES, k=rng.randint(0, 4)) + [f"file{i}{rng.choice(EXTENSIONS)}"])
+        for i in range(count)
+    ]
+
+
+def front_matter_lines(rng: random.Random, description: str) -> List[str]:
+    """프론트매터 줄 (필드 누락/순서/표기 변형)"""
+    priority = rng.choices(range(11), weights=[3, 8, 12, 14, 12, 14, 10, 9, 7, 6, 5])[0]
+    always_apply = rng.random() < 0.3
+    lines = []
+    if rng.random() < 0.1:
+        lines.append("# generated rule")
+    if rng.random() < 0.95:
+        if ":" in description or rng.random() < 0.3:
+            lines.append(f'description: "{description}"')
+        else:
+            lines.append(f"description: {description}")
+    if rng.random() < 0.9:
+        lines.append(f"priority: {priority}")
+    lines.append(f"alwaysApply: {'true' if always_apply else 'false'}")
+    rule_type = rng.choice(TYPES)
+    if rule_type:
+        lines.append(f"type: {rule_type}")
+    roll = rng.random()
+    if roll < 0.2:
+        lines.append("globs: [" + ", ".join(f'"{glob}"' for glob in rule_globs(rng)) + "]")
+    elif roll < 0.25:
+        lines.append(f'globs: "{rule_globs(rng)[0]}"')
+    elif roll < 0.3:
+        lines += ["globs:"] + [f'  - "{glob}"' for glob in rule_globs(rng)]
+    if rng.random() < 0.5:
+        tags = rng.sample(ENGLISH_WORDS + KOREAN_WORDS, rng.randint(1, 4))
+        lines.append("tags: [" + ", ".join(f'"{tag}"' for tag in tags) + "]")
+    if rng.random() < 0.2 and not any(line.startswith("  - ") for line in lines):
+        rng.shuffle(lines)  # 필드 순서 변형 (블록 리스트는 순서 유지 필요)
+    return lines
+
+
+def rule_name(rng: random.Random, index: int) -> str:
+    """고유 Rule 이름 (공통 조각 + 주제 단어 1개 - 이름 어휘가 코퍼스 규모와 함께 늘어나도록)"""
+    words = rng.sample(NAME_WORDS, rng.randint(1, 3))
+    words.insert(rng.randint(0, len(words)), rng.choice(ENGLISH_TOPICS))
+    name = "-".join(words)
+    if rng.random() < 0.05:
+        name = name.upper()
+    return f"{name}-{index:06d}.mdc"
+
+
+def line_count_for(rng: random.Random, median_lines: int, long_ratio: float) -> int:
+    """본문 줄 수 (로그정규, 일부는 1000줄+ 긴 룰)"""
+    if rng.random() < long_ratio:
+        return rng.randint(*LONG_LINES)
+    return max(3, min(MAX_LINES, int(rng.lognormvariate(math.log(median_lines), 0.8))))
+
+
+def mtime_for(rng: random.Random, now: float) -> float:
+    """수정 시각 (최근 MTIME_SPREAD_DAYS일에 분산)"""
+    return now - rng.random() * MTIME_SPREAD_DAYS * 86400
+
+
+def rule_text(header: Optional[List[str]], body: List[str], newline: str = "\n") -> str:
+    """프론트매터 줄 + 본문 줄 → Rule 파일 내용 (header가 None이면 프론트매터 없음)"""
+    lines = [] if header is None else ["---"] + header + ["---", ""]
+    return newline.join(lines + body) + newline
+
+
+def mutate(rng: random.Random, lines: List[str]) -> List[str]:
+    """중복 사본: 본문 한두 줄만 바꿈"""
+    lines = list(lines)
+    for _ in range(rng.randint(1, 2)):
+        if len(lines) > 4:
+            lines[rng.randrange(2, len(lines))] = english_sentence(rng)
+        else:
+            lines.append(english_sentence(rng))
+    return lines
+
+
+def generate_corpus(rules_dir: Path, count: int, seed: int = 42, median_lines: int = 30,
+                    long_ratio: float = 0.002, korean_ratio: float = 0.5,
+                    duplicate_ratio: float = 0.05) -> Dict:
+    """
+    합성 Rules 코퍼스 생성
+
+    Args:
+        rules_dir: 출력 디렉토리 (없으면 생성)
+        count: Rules 파일 수
+        seed: 난수 seed (같으면 같은 코퍼스)
+        median_lines: 본문 줄 수 중앙값 (로그정규 분포)
+        long_ratio: 1000줄 이상 긴 룰 비율
+        korean_ratio: 한국어 문장 비율
+        duplicate_ratio: 앞선 Rule의 거의 같은 사본 비율
+
+    Returns:
+        생성 설정 + 통계 (files, bytes, duplicates, long_rules, no_front_matter)
+    """
+    rng = random.Random(seed)
+    rules_dir = Path(rules_dir)
+    rules_dir.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    stats = {"files": 0, "bytes": 0, "duplicates": 0, "long_rules": 0, "no_front_matter": 0}
+    originals = []  # 중복 원본 후보 (front matter 줄, 본문 줄) - 메모리 상한을 위해 일부만 유지
+
+    for i in range(count):
+        if originals and rng.random() < duplicate_ratio:
+            header, body = rng.choice(originals)
+            body = mutate(rng, body)
+            stats["duplicates"] += 1
+        else:
+            description = korean_sentence(rng) if rng.random() < korean_ratio else english_sentence(rng)
+            header = None if rng.random() < 0.02 else front_matter_lines(rng, description[:80])
+            lines = line_count_for(rng, median_lines, long_ratio)
+            body = body_lines(rng, lines, korean_ratio, f"Rule {i}")
+            if lines >= LONG_LINES[0]:
+                stats["long_rules"] += 1
+            elif len(originals) < 1000:
+                originals.append((header, body))
+            elif rng.random() < 0.01:
+                originals[rng.randrange(len(originals))] = (header, body)
+
+        newline = "\r\n" if rng.random() < 0.01 else "\n"
+        stats["no_front_matter"] += header is None
+        data = rule_text(header, body, newline).encode("utf-8")
+        if rng.random() < 0.01:
+            data = b"\xef\xbb\xbf" + data
+
+        path = rules_dir / rule_name(rng, i)
+        path.write_bytes(data)
+        mtime = mtime_for(rng, now)
+        os.utime(path, (mtime, mtime))
+        stats["files"] += 1
+        stats["bytes"] += len(data)
+
+    return {
+        "count": count,
+        "seed": seed,
+        "median_lines": median_lines,
+        "long_ratio": long_ratio,
+        "korean_ratio": korean_ratio,
+        "duplicate_ratio": duplicate_ratio,
+        "stats": stats,
+    }
+
+
+def main():
+    """메인 실행"""
+    parser = argparse.ArgumentParser(description="합성 Rules 코퍼스 생성")
+    parser.add_argument("output", type=Path, help="출력 디렉토리 (예: /tmp/ws/.cursor/rules)")
+    parser.add_argument("--count", type=int, default=1000, help="Rules 파일 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 seed")
+    parser.add_argument("--median-lines", type=int, default=30, help="본문 줄 수 중앙값")
+    parser.add_argument("--long-ratio", type=float, default=0.002, help="1000줄+ 긴 룰 비율")
+    parser.add_argument("--korean-ratio", type=float, default=0.5, help="한국어 문장 비율")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05, help="중복 사본 비율")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    spec = generate_corpus(args.output, args.count, args.seed, args.median_lines,
+                           args.long_ratio, args.korean_ratio, args.duplicate_ratio)
+    print(json.dumps(spec, indent=2, ensure_ascii=False))
+    print(f"✅ {spec['stats']['files']:,}개 생성 ({spec['stats']['bytes'] / 1e6:.1f}MB, "
+          f"{time.perf_counter() - start:.1f}s): {args.output}")
+
+
+if __name__ == "__main__":
+    main()
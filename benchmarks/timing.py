@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 측정 도우미 (bench_suite와 개별 bench_*가 같은 방법론 사용)
+
+- 회차별로 perf_counter 측정, 첫 회 = cold, 나머지의 중앙값 = warm
+- per_call: 입력 목록 전체를 한 회차로 반복 → 호출당 warm 비용
+"""
+
+import statistics
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def time_runs(run: Callable[[int], Any], repeat: int) -> Tuple[List[float], List[Any]]:
+    """run(i)를 repeat회 실행 → (회차별 소요 시간(s), 회차별 반환값)"""
+    timings = []
+    results = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        results.append(run(i))
+        timings.append(time.perf_counter() - start)
+    return timings, results
+
+
+def summarize(timings: List[float]) -> Dict[str, Optional[float]]:
+    """회차별 소요 시간 → cold(첫 회) / warm(나머지 중앙값, 1회뿐이면 None)"""
+    return {
+        "cold_s": timings[0],
+        "warm_s": statistics.median(timings[1:]) if len(timings) > 1 else None,
+    }
+
+
+def warm_time(run: Callable[[int], Any], repeat: int = 3) -> Tuple[float, Any]:
+    """run(i) 반복 → (warm 소요 시간(s), 마지막 반환값) - 1회뿐이면 cold 시간"""
+    timings, results = time_runs(run, repeat)
+    summary = summarize(timings)
+    return summary["warm_s"] if summary["warm_s"] is not None else summary["cold_s"], results[-1]
+
+
+def per_call(func: Callable[[Any], Any], items: Iterable[Any], repeat: int = 5) -> float:
+    """items 전체에 func 적용을 한 회차로 repeat회 → 호출당 warm 소요 시간(s)"""
+    items = list(items)
+
+    def run(_):
+        for item in items:
+            func(item)
+
+    return warm_time(run, repeat)[0] / len(items)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬 후 q 분위수 (nearest-rank)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
@@ -15,7 +15,13 @@ import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any
-import re
+
+from rules_backup import BACKUP_ROOT, BackupStore
+from rules_corpus import RulesCorpus, extract_core_content
+from rules_frontmatter import FrontMatter, split_content
+from rules_tokens import TokenInterner, jaccard
+from rules_minhash import MinHashLSH, SignatureCache
+from rules_parallel import resolve_jobs
 
 WORKSPACE_ROOT = Path(__file__).parent.parent
 RULES_DIR = WORKSPACE_ROOT / ".cursor" / "rules"
@@ -32,7 +38,8 @@ MAX_AUTO_LEARNED_AGE_DAYS = 30  # 30일 이상 사용되지 않은 자동 학습
 class RulesAutoCleanup:
     """Rules 자동 정리 시스템"""
     
-    def __init__(self):
+    def __init__(self, jobs: int = 1):
+        self.jobs = jobs
         self.rules_dir = RULES_DIR
         self.archive_dir = ARCHIVE_DIR
         self.cleanup_stats = {
@@ -41,8 +48,12 @@ class RulesAutoCleanup:
             "total_rules_before": 0,
             "total_rules_after": 0,
             "removed_files": [],
-            "archived_files": []
+            "archived_files": [],
+            "backup_snapshot": None
         }
+        self._corpus_entries = {}
+        self._signatures = {}
+        self.interner = TokenInterner()
     
     def cleanup_all(self, dry_run: bool = False) -> Dict[str, Any]:
         """전체 정리 프로세스 실행"""
@@ -107,37 +118,35 @@ class RulesAutoCleanup:
     
     def remove_duplicate_rules(self, dry_run: bool = False) -> int:
         """중복 Rules 제거"""
-        all_rules = list(self.rules_dir.glob("*.mdc"))
         removed_count = 0
         
-        # 파일 내용 기반 유사도 검사
-        rule_contents = {}
-        for rule_file in all_rules:
-            try:
-                content = rule_file.read_text(encoding='utf-8')
-                # 메타데이터 제거 후 핵심 내용만 추출
-                core_content = self._extract_core_content(content)
-                rule_contents[rule_file] = core_content
-            except Exception as e:
-                print(f"   ⚠️ 파일 읽기 실패: {rule_file.name} - {e}")
+        # 파일 내용 기반 유사도 검사 (코퍼스 캐시의 핵심 내용 토큰 사용)
+        entries = self._load_corpus(with_signatures=True)
+        rule_tokens = {}
+        lsh = MinHashLSH()
+        for entry in entries.values():
+            if "error" in entry:
+                print(f"   ⚠️ 파일 읽기 실패: {entry['name']} - {entry['error']}")
                 continue
+            rule_tokens[entry["path"]] = self.interner.intern(entry["tokens"])
+            lsh.add(entry["path"], self._signatures[entry["name"]])
         
-        # 유사도 기반 중복 감지
+        # 유사도 기반 중복 감지 (LSH 후보 쌍만 정확한 Jaccard로 검증)
         processed = set()
         duplicate_groups = []
         
-        for rule1, content1 in rule_contents.items():
+        for rule1, tokens1 in rule_tokens.items():
             if rule1 in processed:
                 continue
             
             group = [rule1]
             
-            for rule2, content2 in rule_contents.items():
-                if rule1 == rule2 or rule2 in processed:
+            for rule2 in lsh.neighbors(rule1):
+                if rule2 in processed:
                     continue
                 
                 # 유사도 계산 (간단한 Jaccard 유사도)
-                similarity = self._calculate_similarity(content1, content2)
+                similarity = jaccard(tokens1, rule_tokens[rule2])
                 
                 if similarity > 0.8:  # 80% 이상 유사하면 중복으로 간주
                     group.append(rule2)
@@ -147,6 +156,12 @@ class RulesAutoCleanup:
                 duplicate_groups.append(group)
                 processed.add(rule1)
         
+        # 제거 전 스냅샷 1회 (내용 주소 기반 - 바뀐 파일만 저장)
+        if duplicate_groups and not dry_run:
+            snapshot = BackupStore(BACKUP_ROOT).snapshot(self.rules_dir, label="duplicate-cleanup")
+            self.cleanup_stats["backup_snapshot"] = snapshot["id"]
+            print(f"   💾 백업 스냅샷: {snapshot['id']}")
+        
         # 중복 그룹에서 품질이 높은 것만 남기고 나머지 제거
         for group in duplicate_groups:
             # 우선순위: priority 낮을수록, 파일 크기 적절한 것, 최근 수정된 것
@@ -155,9 +170,7 @@ class RulesAutoCleanup:
             
             for rule_file in others:
                 if not dry_run:
-                    # 백업 후 제거
-                    backup_path = self.archive_dir / f"duplicate_{rule_file.name}"
-                    shutil.copy2(rule_file, backup_path)
+                    # 스냅샷에 백업되어 있으므로 제거 (복원: rules_backup.py restore <스냅샷> <이름>)
                     rule_file.unlink()
                     self.cleanup_stats["removed_files"].append(str(rule_file.relative_to(WORKSPACE_ROOT)))
                 
@@ -205,70 +218,60 @@ class RulesAutoCleanup:
         
         return True
     
+    def _load_corpus(self, with_signatures: bool = False) -> Dict[str, Dict]:
+        """코퍼스 캐시 동기화 후 엔트리 반환 (변경된 파일만 재파싱, 필요 시 MinHash 서명 포함)"""
+        corpus = RulesCorpus(self.rules_dir, jobs=self.jobs)
+        try:
+            self._corpus_entries = corpus.refresh()
+            if with_signatures:
+                self._signatures = SignatureCache(corpus.conn, jobs=self.jobs).signatures(self._corpus_entries)
+        finally:
+            corpus.close()
+        return self._corpus_entries
+    
     def _extract_core_content(self, content: str) -> str:
         """Rules 파일에서 핵심 내용만 추출"""
-        # 프론트매터 제거
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                content = parts[2]
-        
-        # 주석 제거
-        lines = content.split('\n')
-        core_lines = []
-        for line in lines:
-            # 주석 제거 (단, 중요한 섹션은 유지)
-            if line.strip().startswith('#') and '핵심' not in line and '원칙' not in line:
-                continue
-            core_lines.append(line)
-        
-        return '\n'.join(core_lines)
+        _, body = split_content(content)
+        return extract_core_content(body)
     
     def _calculate_similarity(self, content1: str, content2: str) -> float:
         """유사도 계산 (Jaccard 유사도)"""
-        # 단어 집합으로 변환
-        words1 = set(re.findall(r'\w+', content1.lower()))
-        words2 = set(re.findall(r'\w+', content2.lower()))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
+        return jaccard(self.interner.intern_text(content1), self.interner.intern_text(content2))
     
     def _select_best_rule(self, rule_files: List[Path]) -> Path:
         """중복 그룹에서 가장 좋은 Rules 선택"""
         best_rule = None
         best_score = -1
         
+        entries = self._corpus_entries or self._load_corpus()
+        
         for rule_file in rule_files:
             try:
-                content = rule_file.read_text(encoding='utf-8')
+                entry = entries.get(rule_file.name)
+                if entry is None or "error" in entry:
+                    raise FileNotFoundError(entry["error"] if entry else "코퍼스에 없음")
+                front_matter = FrontMatter(entry["front_matter"])
                 
                 # 점수 계산
                 score = 0
                 
                 # 1. Priority 낮을수록 좋음 (0이 최고)
-                priority_match = re.search(r'priority:\s*(\d+)', content)
-                if priority_match:
-                    priority = int(priority_match.group(1))
-                    score += (10 - priority) * 10  # priority 0 = 100점, 1 = 90점, ...
+                if front_matter.priority is not None:
+                    score += (10 - front_matter.priority) * 10  # priority 0 = 100점, 1 = 90점, ...
                 
                 # 2. alwaysApply 있으면 가점
-                if 'alwaysApply: true' in content:
+                if front_matter.always_apply:
                     score += 20
                 
                 # 3. 파일 크기 적절 (500-2000 바이트)
-                file_size = rule_file.stat().st_size
+                file_size = entry["size"]
                 if 500 <= file_size <= 2000:
                     score += 10
                 elif file_size > 5000:  # 너무 크면 감점
                     score -= 10
                 
                 # 4. 최근 수정된 것 가점
-                mtime = datetime.fromtimestamp(rule_file.stat().st_mtime)
+                mtime = datetime.fromtimestamp(entry["mtime"])
                 days_old = (datetime.now() - mtime).days
                 if days_old < 7:
                     score += 5
@@ -291,10 +294,11 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="시뮬레이션 모드 (실제 변경 없음)")
     parser.add_argument("--archive-only", action="store_true", help="아카이브만 실행")
     parser.add_argument("--duplicates-only", action="store_true", help="중복 제거만 실행")
+    parser.add_argument("--jobs", type=int, default=1, help="콜드 스캔 병렬 작업 수 (0 = CPU 코어 수)")
     
     args = parser.parse_args()
     
-    cleanup = RulesAutoCleanup()
+    cleanup = RulesAutoCleanup(jobs=resolve_jobs(args.jobs))
     
     if args.archive_only:
         result = cleanup.archive_old_auto_learned(dry_run=args.dry_run)
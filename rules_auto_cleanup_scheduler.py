@@ -6,15 +6,21 @@ Rules 자동 최적화 스케줄러
 - 30일 미사용 룰 자동 아카이브
 - 1000줄 이상 룰 경고 알림
 - 주간 리포트 자동 생성
+- 모든 검사는 수집기(collector)로 등록되어 파일당 한 번의 I/O로 처리
 """
 
 import json
 import shutil
+from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime, timedelta
-import re
 from collections import defaultdict
 
+from rules_body import RuleBody
+from rules_corpus import RulesCorpus
+from rules_frontmatter import FrontMatter
+from rules_parallel import resolve_jobs
+
 WORKSPACE = Path(__file__).parent.parent
 RULES_DIR = WORKSPACE / ".cursor" / "rules"
 ARCHIVE_DIR = WORKSPACE / ".cursor" / "rules_archive"
@@ -25,103 +31,219 @@ def ensure_dirs():
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
     DAILY_DIR.mkdir(parents=True, exist_ok=True)
 
-def archive_unused_rules(days_threshold=30, dry_run=False):
-    """30일 미사용 룰 자동 아카이브"""
-    ensure_dirs()
+def load_corpus_entries(jobs=1):
+    """코퍼스 캐시 동기화 후 엔트리 반환 (변경된 파일만 재파싱, 본문 제외)"""
+    corpus = RulesCorpus(RULES_DIR, jobs=jobs)
+    try:
+        return corpus.refresh(headers_only=True)
+    finally:
+        corpus.close()
+
+# ----------------------------------------------------------------------
+# 수집기: 파일 하나(코퍼스 엔트리)를 한 번씩 받아 결과를 누적
+# ----------------------------------------------------------------------
+
+class RuleCollector(ABC):
+    """단일 패스 수집기 기본 클래스 (두 메서드를 모두 구현해야 생성 가능)"""
+    
+    @abstractmethod
+    def collect(self, entry) -> bool:
+        """엔트리 처리. True를 반환하면 파일이 이동되어 이후 수집기에서 제외"""
     
-    cutoff_date = datetime.now() - timedelta(days=days_threshold)
-    archived = []
+    @abstractmethod
+    def result(self):
+        """수집 결과"""
+
+class ArchiveCollector(RuleCollector):
+    """N일 미사용 룰 아카이브"""
+    
+    def __init__(self, days_threshold=30, dry_run=False):
+        self.days_threshold = days_threshold
+        self.dry_run = dry_run
+        self.cutoff_date = datetime.now() - timedelta(days=days_threshold)
+        self.archived = []
     
-    for rule_file in RULES_DIR.glob("*.mdc"):
+    def collect(self, entry):
+        mtime = datetime.fromtimestamp(entry["mtime"])
+        if mtime >= self.cutoff_date:
+            return False
+        
+        # 아카이브 대상
         try:
-            # 마지막 수정 시간 확인
-            mtime = datetime.fromtimestamp(rule_file.stat().st_mtime)
-            
-            if mtime < cutoff_date:
-                # 아카이브 대상
-                archive_path = ARCHIVE_DIR / rule_file.name
-                
-                if not dry_run:
-                    shutil.move(str(rule_file), str(archive_path))
-                
-                archived.append({
-                    "name": rule_file.name,
-                    "last_modified": mtime.strftime("%Y-%m-%d"),
-                    "days_unused": (datetime.now() - mtime).days
-                })
-                print(f"  {'[DRY RUN] ' if dry_run else ''}📦 {rule_file.name} → 아카이브 ({mtime.strftime('%Y-%m-%d')}, {days_threshold}일+ 미사용)")
+            if not self.dry_run:
+                shutil.move(str(entry["path"]), str(ARCHIVE_DIR / entry["name"]))
         except Exception as e:
-            print(f"  ⚠️ {rule_file.name}: {e}")
+            print(f"  ⚠️ {entry['name']}: {e}")
+            return False
+        
+        self.archived.append({
+            "name": entry["name"],
+            "last_modified": mtime.strftime("%Y-%m-%d"),
+            "days_unused": (datetime.now() - mtime).days
+        })
+        print(f"  {'[DRY RUN] ' if self.dry_run else ''}📦 {entry['name']} → 아카이브 ({mtime.strftime('%Y-%m-%d')}, {self.days_threshold}일+ 미사용)")
+        return not self.dry_run
     
-    return archived
+    def result(self):
+        return self.archived
 
-def check_long_rules(line_threshold=1000):
-    """1000줄 이상 룰 경고 알림"""
-    warnings = []
+class LongRuleCollector(RuleCollector):
+    """N줄 이상 룰 경고 (경고 대상만 mmap으로 열어 분할 후보 섹션 제시)"""
     
-    for rule_file in RULES_DIR.glob("*.mdc"):
+    def __init__(self, line_threshold=1000, verbose=True, top_sections=3):
+        self.line_threshold = line_threshold
+        self.verbose = verbose
+        self.top_sections = top_sections
+        self.warnings = []
+    
+    def collect(self, entry):
+        lines = entry["content_lines"]
+        if lines > self.line_threshold:
+            size_kb = entry["size"] / 1024
+            sections = self._largest_sections(entry["path"])
+            self.warnings.append({
+                "name": entry["name"],
+                "lines": lines,
+                "size_kb": size_kb,
+                "sections": sections
+            })
+            if self.verbose:
+                print(f"  ⚠️ {entry['name']}: {lines}줄 ({size_kb:.1f}KB) - 너무 김!")
+                for section in sections:
+                    print(f"      ↳ {section['title']}: {section['lines']}줄")
+        return False
+    
+    def _largest_sections(self, path):
+        """분할 단위 섹션 중 긴 순서로 top_sections개 [{'title', 'lines'}] (본문 줄 목록 미생성)"""
         try:
-            content = rule_file.read_text(encoding='utf-8')
-            lines = len(content.split('\n'))
-            
-            if lines > line_threshold:
-                warnings.append({
-                    "name": rule_file.name,
-                    "lines": lines,
-                    "size_kb": rule_file.stat().st_size / 1024
-                })
-                print(f"  ⚠️ {rule_file.name}: {lines}줄 ({rule_file.stat().st_size / 1024:.1f}KB) - 너무 김!")
-        except Exception as e:
-            print(f"  ⚠️ {rule_file.name}: {e}")
+            with RuleBody.open(path) as body:
+                sections = [
+                    {"title": section.title, "lines": body.section_lines(section)}
+                    for section in body.split_sections()
+                ]
+        except OSError:
+            return []
+        sections.sort(key=lambda s: -s["lines"])
+        return sections[:self.top_sections]
+    
+    def result(self):
+        return self.warnings
+
+class PriorityHistogramCollector(RuleCollector):
+    """Priority 분포"""
+    
+    def __init__(self):
+        self.distribution = defaultdict(int)
+    
+    def collect(self, entry):
+        priority = FrontMatter(entry["front_matter"]).priority
+        if priority is not None:
+            self.distribution[priority] += 1
+        return False
+    
+    def result(self):
+        return self.distribution
+
+class AlwaysApplyCollector(RuleCollector):
+    """alwaysApply: true 개수"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def collect(self, entry):
+        if FrontMatter(entry["front_matter"]).always_apply:
+            self.count += 1
+        return False
+    
+    def result(self):
+        return self.count
+
+class RecencyCollector(RuleCollector):
+    """최근 수정(7일) / 미사용(30일+) 개수"""
+    
+    def __init__(self, recent_days=7, unused_days=30):
+        self.week_ago = datetime.now() - timedelta(days=recent_days)
+        self.unused_cutoff = datetime.now() - timedelta(days=unused_days)
+        self.total = 0
+        self.recently_modified = 0
+        self.unused = 0
     
-    return warnings
+    def collect(self, entry):
+        self.total += 1
+        mtime = datetime.fromtimestamp(entry["mtime"])
+        if mtime > self.week_ago:
+            self.recently_modified += 1
+        if mtime < self.unused_cutoff:
+            self.unused += 1
+        return False
+    
+    def result(self):
+        return {
+            "total_rules": self.total,
+            "recently_modified": self.recently_modified,
+            "unused_rules": self.unused
+        }
+
+def run_collectors(collectors, jobs=1):
+    """
+    단일 패스 파이프라인
+    
+    모든 Rules 파일을 한 번만 stat/읽기(코퍼스 캐시)하고,
+    각 엔트리를 등록된 수집기에 순서대로 전달한다.
+    아카이브로 이동된 파일은 이후 수집기에 전달하지 않는다.
+    """
+    for entry in load_corpus_entries(jobs).values():
+        if "error" in entry:
+            print(f"  ⚠️ {entry['name']}: {entry['error']}")
+            continue
+        for collector in collectors:
+            if collector.collect(entry):
+                break
+    return collectors
+
+def weekly_collectors():
+    """주간 리포트용 수집기 묶음"""
+    return {
+        "always_apply": AlwaysApplyCollector(),
+        "priority": PriorityHistogramCollector(),
+        "recency": RecencyCollector(),
+        "long_rules": LongRuleCollector(line_threshold=1000, verbose=False),
+    }
+
+def archive_unused_rules(days_threshold=30, dry_run=False, jobs=1):
+    """30일 미사용 룰 자동 아카이브"""
+    ensure_dirs()
+    collector = ArchiveCollector(days_threshold=days_threshold, dry_run=dry_run)
+    run_collectors([collector], jobs)
+    return collector.result()
+
+def check_long_rules(line_threshold=1000, jobs=1):
+    """1000줄 이상 룰 경고 알림"""
+    collector = LongRuleCollector(line_threshold=line_threshold)
+    run_collectors([collector], jobs)
+    return collector.result()
 
-def generate_weekly_report():
-    """주간 리포트 자동 생성"""
+def generate_weekly_report(jobs=1, collectors=None):
+    """주간 리포트 자동 생성 (collectors가 주어지면 이미 수집된 결과 사용)"""
     ensure_dirs()
     
+    if collectors is None:
+        collectors = weekly_collectors()
+        run_collectors(list(collectors.values()), jobs)
+    
     # 최근 7일 통계
-    week_ago = datetime.now() - timedelta(days=7)
+    week_ago = collectors["recency"].week_ago
+    recency = collectors["recency"].result()
     
     stats = {
-        "total_rules": len(list(RULES_DIR.glob("*.mdc"))),
-        "always_apply": 0,
-        "priority_distribution": defaultdict(int),
-        "recently_modified": 0,
-        "unused_rules": 0,
-        "long_rules": 0
+        "total_rules": recency["total_rules"],
+        "always_apply": collectors["always_apply"].result(),
+        "priority_distribution": collectors["priority"].result(),
+        "recently_modified": recency["recently_modified"],
+        "unused_rules": recency["unused_rules"],
+        "long_rules": len(collectors["long_rules"].result())
     }
     
-    for rule_file in RULES_DIR.glob("*.mdc"):
-        try:
-            content = rule_file.read_text(encoding='utf-8')
-            
-            # alwaysApply 확인
-            if re.search(r'alwaysApply:\s*true', content, re.IGNORECASE):
-                stats["always_apply"] += 1
-            
-            # Priority 확인
-            priority_match = re.search(r'priority:\s*(\d+)', content)
-            if priority_match:
-                priority = int(priority_match.group(1))
-                stats["priority_distribution"][priority] += 1
-            
-            # 최근 수정 확인
-            mtime = datetime.fromtimestamp(rule_file.stat().st_mtime)
-            if mtime > week_ago:
-                stats["recently_modified"] += 1
-            
-            # 미사용 확인 (30일+)
-            if mtime < datetime.now() - timedelta(days=30):
-                stats["unused_rules"] += 1
-            
-            # 긴 룰 확인 (1000줄+)
-            if len(content.split('\n')) > 1000:
-                stats["long_rules"] += 1
-                
-        except Exception as e:
-            print(f"  ⚠️ {rule_file.name}: {e}")
-    
     # 리포트 생성
     report = []
     report.append("=" * 70)
@@ -144,6 +266,14 @@ def generate_weekly_report():
         report.append(f"Priority {priority}: {stats['priority_distribution'][priority]}개")
     report.append("")
     
+    if collectors["long_rules"].result():
+        report.append("## 📏 긴 룰 (분할 후보 섹션)")
+        for warning in collectors["long_rules"].result():
+            report.append(f"{warning['name']}: {warning['lines']}줄 ({warning['size_kb']:.1f}KB)")
+            for section in warning.get("sections", []):
+                report.append(f"  - {section['title']}: {section['lines']}줄")
+        report.append("")
+    
     report.append("## 💡 권장 사항")
     recommendations = []
     
@@ -184,8 +314,8 @@ def generate_weekly_report():
     
     return report_text
 
-def main(dry_run=False, archive_unused=True, check_long=True, generate_report=True):
-    """메인 실행"""
+def main(dry_run=False, archive_unused=True, check_long=True, generate_report=True, jobs=1):
+    """메인 실행 (모든 검사를 단일 I/O 패스로 수행)"""
     print("=" * 70)
     print("🔄 Rules 자동 최적화 스케줄러")
     print("=" * 70)
@@ -193,35 +323,48 @@ def main(dry_run=False, archive_unused=True, check_long=True, generate_report=Tr
     print(f"실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    ensure_dirs()
+    
     results = {
         "archived": [],
         "warnings": [],
         "report": None
     }
     
+    # 활성화된 검사의 수집기를 순서대로 등록 (아카이브가 먼저 → 이동된 파일은 이후 통계에서 제외)
+    archive = ArchiveCollector(days_threshold=30, dry_run=dry_run) if archive_unused else None
+    long_rules = LongRuleCollector(line_threshold=1000) if check_long else None
+    report_collectors = weekly_collectors() if generate_report else None
+    if report_collectors and long_rules:
+        report_collectors["long_rules"] = long_rules
+    
+    collectors = [c for c in (archive, long_rules) if c]
+    if report_collectors:
+        collectors += [c for c in report_collectors.values() if c is not long_rules]
+    
+    print("🔍 Rules 단일 패스 스캔 (아카이브 30일+ / 긴 룰 1000줄+ / 통계)...")
+    run_collectors(collectors, jobs)
+    print()
+    
     # 1. 미사용 룰 아카이브
-    if archive_unused:
-        print("1️⃣ 미사용 룰 아카이브 (30일+)...")
-        results["archived"] = archive_unused_rules(days_threshold=30, dry_run=dry_run)
-        print(f"  ✅ {len(results['archived'])}개 Rules 아카이브")
-        print()
+    if archive:
+        results["archived"] = archive.result()
+        print(f"1️⃣ 미사용 룰 아카이브: ✅ {len(results['archived'])}개 Rules 아카이브")
     
     # 2. 긴 룰 경고
-    if check_long:
-        print("2️⃣ 긴 룰 확인 (1000줄+)...")
-        results["warnings"] = check_long_rules(line_threshold=1000)
+    if long_rules:
+        results["warnings"] = long_rules.result()
         if results["warnings"]:
-            print(f"  ⚠️ {len(results['warnings'])}개 Rules 경고")
+            print(f"2️⃣ 긴 룰 확인: ⚠️ {len(results['warnings'])}개 Rules 경고")
         else:
-            print("  ✅ 긴 룰 없음")
-        print()
+            print("2️⃣ 긴 룰 확인: ✅ 긴 룰 없음")
     
     # 3. 주간 리포트 생성
-    if generate_report:
+    if report_collectors:
         print("3️⃣ 주간 리포트 생성...")
-        results["report"] = generate_weekly_report()
+        results["report"] = generate_weekly_report(collectors=report_collectors)
         print("  ✅ 리포트 생성 완료")
-        print()
+    print()
     
     # 요약
     print("=" * 70)
@@ -240,8 +383,12 @@ def main(dry_run=False, archive_unused=True, check_long=True, generate_report=Tr
     return results
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Rules 자동 최적화 스케줄러")
+    parser.add_argument("--dry-run", action="store_true", help="시뮬레이션 모드")
+    parser.add_argument("--jobs", type=int, default=1, help="콜드 스캔 병렬 작업 수 (0 = CPU 코어 수)")
+    args = parser.parse_args()
     
-    dry_run = "--dry-run" in sys.argv
-    main(dry_run=dry_run)
+    main(dry_run=args.dry_run, jobs=resolve_jobs(args.jobs))
 
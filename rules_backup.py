@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 백업 저장소 (내용 주소 기반, 중복 제거)
+
+- .cursor/rules_backup/objects/ab/cdef... : 파일 내용 SHA-256 이름의 blob (같은 내용은 한 번만 저장)
+- .cursor/rules_backup/snapshots/<id>.json : 스냅샷 매니페스트 {name: hash, size, mtime_ns}
+- 스냅샷: 직전 스냅샷과 지문(mtime_ns, size)이 같은 파일은 해시를 재사용 → 바뀐 파일만 읽고 저장
+- 복원: 매니페스트에서 blob을 바로 찾아 임시 파일 → 교체 (reflink 가능하면 블록 공유, mtime 복원)
+  - 복원 전 현재 상태를 자동 스냅샷 (복원도 되돌릴 수 있음)
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+WORKSPACE = Path(__file__).parent.parent
+RULES_DIR = WORKSPACE / ".cursor" / "rules"
+BACKUP_ROOT = WORKSPACE / ".cursor" / "rules_backup"
+
+MANIFEST_FORMAT = 1
+SNAPSHOT_ID_FORMAT = "%Y%m%d_%H%M%S"
+LATEST = "latest"
+SOURCE_TIME_RE = re.compile(r'(\d{8}_\d{6})')  # 폴더 백업 이름의 타임스탬프 (rules_backup_20251123_051530)
+FICLONE = 0x40049409  # Linux ioctl: 파일 reflink (btrfs/xfs 등, 지원 안 하면 복사)
+
+
+def _clone_or_copy(src: Path, dst: Path):
+    """reflink 가능하면 블록 공유 복제, 아니면 내용 복사"""
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def _source_time(source_dir: Path) -> datetime:
+    """가져올 폴더 백업의 생성 시각 (폴더 이름 타임스탬프 → 가장 최근 파일 mtime → 폴더 mtime)"""
+    match = SOURCE_TIME_RE.search(source_dir.name)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), SNAPSHOT_ID_FORMAT)
+        except ValueError:
+            pass
+    mtimes = [path.stat().st_mtime for path in source_dir.glob("*.mdc")]
+    return datetime.fromtimestamp(max(mtimes) if mtimes else source_dir.stat().st_mtime)
+
+
+def _write_atomic(path: Path, data: bytes):
+    """임시 파일 → 교체"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class BackupStore:
+    """내용 주소 기반 Rules 백업 저장소"""
+
+    def __init__(self, root: Path = BACKUP_ROOT):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+
+    def blob_path(self, digest: str) -> Path:
+        """해시 → blob 경로"""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _put(self, data: bytes) -> Dict:
+        """내용 저장 (이미 있으면 생략) → {'hash', 'stored'}"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if path.exists():
+            return {"hash": digest, "stored": False}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, data)
+        return {"hash": digest, "stored": True}
+
+    def snapshot_ids(self) -> List[str]:
+        """
+        스냅샷 ID 목록 (매니페스트의 created_at 순)
+
+        가져온 폴더 백업은 원본 폴더 시각이 created_at이므로, 나중에 가져와도 'latest'가 되지 않음
+        """
+        if not self.snapshots_dir.exists():
+            return []
+        keys = []
+        for path in self.snapshots_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    created_at = json.load(f).get("created_at", "")
+            except (OSError, ValueError):
+                continue
+            keys.append((created_at, path.stem))
+        return [snapshot_id for _, snapshot_id in sorted(keys)]
+
+    def manifest(self, snapshot_id: str = LATEST) -> Dict:
+        """스냅샷 매니페스트 ('latest' = 가장 최근)"""
+        if snapshot_id == LATEST:
+            ids = self.snapshot_ids()
+            if not ids:
+                raise FileNotFoundError("스냅샷이 없습니다")
+            snapshot_id = ids[-1]
+        path = self.snapshots_dir / f"{snapshot_id}.json"
+        if not path.exists():
+            raise FileNotFoundError(f"스냅샷이 없습니다: {snapshot_id}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _latest_rules(self, source: Path) -> Dict[str, Dict]:
+        """같은 디렉토리 전체를 찍은 가장 최근 스냅샷의 Rules (지문 재사용용, 없으면 빈 dict)"""
+        for snapshot_id in reversed(self.snapshot_ids()):
+            try:
+                manifest = self.manifest(snapshot_id)
+            except (OSError, ValueError):
+                continue
+            if manifest.get("source") == str(Path(source).resolve()) and not manifest.get("partial"):
+                return manifest["rules"]
+        return {}
+
+    def _new_id(self) -> str:
+        """현재 시각 기반 스냅샷 ID (같은 초에 여러 번이면 _1, _2...)"""
+        base = datetime.now().strftime(SNAPSHOT_ID_FORMAT)
+        snapshot_id = base
+        suffix = 0
+        while (self.snapshots_dir / f"{snapshot_id}.json").exists():
+            suffix += 1
+            snapshot_id = f"{base}_{suffix}"
+        return snapshot_id
+
+    def _scan(self, rules_dir: Path, known: Dict[str, Dict], store: bool,
+              names: Optional[Iterable[str]] = None) -> Dict:
+        """
+        디렉토리 → {'rules': {name: {hash, size, mtime_ns}}, 'new_blobs', 'new_bytes', 'read'}
+
+        known과 지문이 같고 blob이 있는 파일은 읽지 않음. store=False면 해시만 계산(diff용).
+        names가 주어지면 해당 파일만 (디렉토리 전체 stat 없음).
+        """
+        rules = {}
+        new_blobs = new_bytes = read = 0
+        if names is None:
+            rule_files = sorted(Path(rules_dir).glob("*.mdc"))
+        else:
+            rule_files = [Path(rules_dir) / name for name in sorted(set(names))]
+        for rule_file in rule_files:
+            try:
+                st = rule_file.stat()
+            except OSError:
+                continue
+            previous = known.get(rule_file.name)
+            if (previous and (previous["mtime_ns"], previous["size"]) == (st.st_mtime_ns, st.st_size)
+                    and self.blob_path(previous["hash"]).exists()):
+                rules[rule_file.name] = previous
+                continue
+            try:
+                data = rule_file.read_bytes()
+            except OSError as e:
+                print(f"  ⚠️ {rule_file.name}: {e}")
+                continue
+            read += 1
+            if store:
+                put = self._put(data)
+                digest = put["hash"]
+                if put["stored"]:
+                    new_blobs += 1
+                    new_bytes += len(data)
+            else:
+                digest = hashlib.sha256(data).hexdigest()
+            rules[rule_file.name] = {"hash": digest, "size": len(data), "mtime_ns": st.st_mtime_ns}
+        return {"rules": rules, "new_blobs": new_blobs, "new_bytes": new_bytes, "read": read}
+
+    def snapshot(self, rules_dir: Path = RULES_DIR, label: str = "",
+                 snapshot_id: Optional[str] = None, names: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Rules 디렉토리 스냅샷 (바뀐 파일만 읽고, 새 내용만 저장)
+
+        names가 주어지면 해당 Rules만 담은 부분 스냅샷 (복원 시 --delete 불가)
+
+        Returns:
+            {'id', 'rules', 'new_blobs', 'new_bytes', 'read'}
+        """
+        scan = self._scan(rules_dir, self._latest_rules(rules_dir), store=True, names=names)
+        return self._save_manifest(snapshot_id or self._new_id(), label, rules_dir, scan,
+                                   partial=names is not None)
+
+    def import_dir(self, source_dir: Path, snapshot_id: Optional[str] = None) -> Dict:
+        """기존 폴더 백업(타임스탬프 폴더의 *.mdc)을 스냅샷으로 가져오기 (ID 기본값: 폴더 이름)"""
+        source_dir = Path(source_dir)
+        snapshot_id = snapshot_id or source_dir.name
+        if (self.snapshots_dir / f"{snapshot_id}.json").exists():
+            raise FileExistsError(f"이미 있는 스냅샷: {snapshot_id}")
+        scan = self._scan(source_dir, {}, store=True)
+        return self._save_manifest(snapshot_id, "import", source_dir, scan, created_at=_source_time(source_dir))
+
+    def _save_manifest(self, snapshot_id: str, label: str, source: Path, scan: Dict,
+                       partial: bool = False, created_at: Optional[datetime] = None) -> Dict:
+        """매니페스트 저장 → 스냅샷 요약 (created_at 기본값: 현재 시각)"""
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "id": snapshot_id,
+            "created_at": (created_at or datetime.now()).isoformat(timespec="microseconds"),
+            "label": label,
+            "source": str(Path(source).resolve()),
+            "partial": partial,
+            "rules": scan["rules"],
+        }
+        _write_atomic(self.snapshots_dir / f"{snapshot_id}.json",
+                      json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+        return {
+            "id": snapshot_id,
+            "rules": len(scan["rules"]),
+            "new_blobs": scan["new_blobs"],
+            "new_bytes": scan["new_bytes"],
+            "read": scan["read"],
+        }
+
+    def list(self) -> List[Dict]:
+        """스냅샷 요약 목록 [{'id', 'created_at', 'label', 'rules', 'bytes'}] (오래된 순)"""
+        summaries = []
+        for snapshot_id in self.snapshot_ids():
+            try:
+                manifest = self.manifest(snapshot_id)
+            except (OSError, ValueError):
+                continue
+            summaries.append({
+                "id": snapshot_id,
+                "created_at": manifest.get("created_at", ""),
+                "label": manifest.get("label", ""),
+                "rules": len(manifest["rules"]),
+                "bytes": sum(rule["size"] for rule in manifest["rules"].values()),
+            })
+        return summaries
+
+    def diff(self, old_id: str, new_id: Optional[str] = None, rules_dir: Path = RULES_DIR) -> Dict[str, List[str]]:
+        """
+        스냅샷 비교 (new_id가 None이면 현재 Rules 디렉토리와 비교, 바뀐 파일만 해시)
+
+        Returns:
+            {'added': [...], 'removed': [...], 'changed': [...]}
+        """
+        old = self.manifest(old_id)["rules"]
+        if new_id is None:
+            new = self._scan(rules_dir, old, store=False)["rules"]
+        else:
+            new = self.manifest(new_id)["rules"]
+        return {
+            "added": sorted(name for name in new if name not in old),
+            "removed": sorted(name for name in old if name not in new),
+            "changed": sorted(name for name in new if name in old and new[name]["hash"] != old[name]["hash"]),
+        }
+
+    def restore(self, snapshot_id: str, rules_dir: Path = RULES_DIR, names: Optional[Iterable[str]] = None,
+                delete: bool = False, dry_run: bool = False) -> Dict:
+        """
+        스냅샷 → Rules 디렉토리 복원
+
+        Args:
+            names: 복원할 Rules (None이면 스냅샷 전체)
+            delete: 전체 복원 시 스냅샷에 없는 Rules 삭제
+            dry_run: 변경 없이 대상만 계산
+
+        Returns:
+            {'id', 'restored': [...], 'deleted': [...], 'unchanged': [...], 'pre_restore': 스냅샷 ID}
+        """
+        rules_dir = Path(rules_dir)
+        manifest = self.manifest(snapshot_id)
+        rules = manifest["rules"]
+        if names is None:
+            targets = sorted(rules)
+        else:
+            targets = sorted(set(names))
+            missing = [name for name in targets if name not in rules]
+            if missing:
+                raise KeyError(f"스냅샷 {manifest['id']}에 없는 Rules: {', '.join(missing)}")
+
+        current = self._scan(rules_dir, rules, store=False, names=None if names is None else targets)["rules"]
+        restored = [name for name in targets if current.get(name, {}).get("hash") != rules[name]["hash"]]
+        unchanged = [name for name in targets if name not in restored]
+        if delete and manifest.get("partial"):
+            raise KeyError(f"부분 스냅샷 {manifest['id']}은 --delete로 복원할 수 없습니다")
+        deleted = sorted(name for name in current if name not in rules) if delete and names is None else []
+
+        result = {"id": manifest["id"], "restored": restored, "deleted": deleted,
+                  "unchanged": unchanged, "pre_restore": None}
+        if dry_run or not (restored or deleted):
+            return result
+
+        # 복원 전 현재 상태 스냅샷 (바뀐 파일만 저장되므로 저렴)
+        result["pre_restore"] = self.snapshot(rules_dir, label=f"pre-restore {manifest['id']}",
+                                              names=None if names is None else restored)["id"]
+
+        rules_dir.mkdir(parents=True, exist_ok=True)
+        for name in restored:
+            rule = rules[name]
+            target = rules_dir / name
+            tmp_path = target.with_name(target.name + ".restore.tmp")
+            _clone_or_copy(self.blob_path(rule["hash"]), tmp_path)
+            os.utime(tmp_path, ns=(rule["mtime_ns"], rule["mtime_ns"]))
+            os.replace(tmp_path, target)
+        for name in deleted:
+            (rules_dir / name).unlink()
+        return result
+
+
+def _format_bytes(size: int) -> str:
+    """바이트 → 읽기 쉬운 크기"""
+    return f"{size / 1024:.1f}KB" if size >= 1024 else f"{size}B"
+
+
+def main():
+    """메인 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rules 백업 (내용 주소 기반 스냅샷)")
+    parser.add_argument("--rules-dir", type=Path, default=RULES_DIR, help="Rules 디렉토리")
+    parser.add_argument("--store", type=Path, default=BACKUP_ROOT, help="백업 저장소 경로")
+    commands = parser.add_subparsers(dest="command")
+
+    snapshot_parser = commands.add_parser("snapshot", help="현재 Rules 스냅샷")
+    snapshot_parser.add_argument("--label", default="", help="스냅샷 설명")
+    commands.add_parser("list", help="스냅샷 목록")
+    diff_parser = commands.add_parser("diff", help="스냅샷 비교 (NEW 생략 시 현재 디렉토리와 비교)")
+    diff_parser.add_argument("old", help="기준 스냅샷 ID (latest 가능)")
+    diff_parser.add_argument("new", nargs="?", default=None, help="비교 스냅샷 ID")
+    restore_parser = commands.add_parser("restore", help="스냅샷 복원 (Rules 이름 지정 시 해당 파일만)")
+    restore_parser.add_argument("snapshot", help="스냅샷 ID (latest 가능)")
+    restore_parser.add_argument("names", nargs="*", help="복원할 Rules 파일 이름")
+    restore_parser.add_argument("--delete", action="store_true", help="스냅샷에 없는 Rules 삭제 (전체 복원 시)")
+    restore_parser.add_argument("--dry-run", action="store_true", help="시뮬레이션 모드")
+    import_parser = commands.add_parser("import", help="기존 폴더 백업을 스냅샷으로 가져오기")
+    import_parser.add_argument("source", type=Path, help="*.mdc가 든 백업 폴더")
+    import_parser.add_argument("--id", default=None, help="스냅샷 ID (기본: 폴더 이름)")
+    args = parser.parse_args()
+
+    store = BackupStore(args.store)
+    try:
+        run_command(store, args)
+    except (FileNotFoundError, FileExistsError, KeyError) as e:
+        print(f"❌ {e.args[0] if e.args else e}")
+        raise SystemExit(1)
+
+
+def run_command(store: BackupStore, args):
+    """CLI 하위 명령 실행"""
+    command = args.command or "snapshot"
+
+    if command == "snapshot":
+        result = store.snapshot(args.rules_dir, label=getattr(args, "label", ""))
+        print(f"✅ 스냅샷 {result['id']}: Rules {result['rules']}개 "
+              f"(읽음 {result['read']}개, 새 blob {result['new_blobs']}개 {_format_bytes(result['new_bytes'])})")
+    elif command == "import":
+        result = store.import_dir(args.source, args.id)
+        print(f"✅ 가져오기 {result['id']}: Rules {result['rules']}개 "
+              f"(새 blob {result['new_blobs']}개 {_format_bytes(result['new_bytes'])})")
+    elif command == "list":
+        summaries = store.list()
+        if not summaries:
+            print("📭 스냅샷이 없습니다.")
+        for summary in summaries:
+            label = f"  {summary['label']}" if summary["label"] else ""
+            print(f"📸 {summary['id']}  Rules {summary['rules']:>4}개  {_format_bytes(summary['bytes']):>9}{label}")
+    elif command == "diff":
+        changes = store.diff(args.old, args.new, args.rules_dir)
+        target = args.new or "현재"
+        print(f"🔍 {args.old} → {target}")
+        for marker, key in (("➕", "added"), ("➖", "removed"), ("✏️", "changed")):
+            for name in changes[key]:
+                print(f"  {marker} {name}")
+        if not any(changes.values()):
+            print("  ✅ 차이 없음")
+    elif command == "restore":
+        result = store.restore(args.snapshot, args.rules_dir, args.names or None,
+                               delete=args.delete, dry_run=args.dry_run)
+        prefix = "[DRY RUN] " if args.dry_run else ""
+        for name in result["restored"]:
+            print(f"  {prefix}♻️ {name}")
+        for name in result["deleted"]:
+            print(f"  {prefix}🗑️ {name}")
+        print(f"✅ {prefix}복원 {result['id']}: {len(result['restored'])}개 복원, "
+              f"{len(result['deleted'])}개 삭제, {len(result['unchanged'])}개 동일")
+        if result["pre_restore"]:
+            print(f"💾 복원 전 상태: {result['pre_restore']} (되돌리기: python rules_backup.py restore {result['pre_restore']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 본문 지연 접근 (mmap)
+
+- 파일(또는 번들 본문 영역)을 mmap으로 열고 필요한 부분만 디코딩
+- 줄 수: 고정 크기 조각 단위 바이트 스캔 (`content.count('\\n') + 1`과 동일, 줄 목록 미생성)
+- 헤딩 오프셋: 바이트 정규식으로 한 번 훑어 (코드 펜스 안 `#` 주석 제외) 섹션 경계 계산
+- 섹션 본문은 요청한 범위만 잘라 디코딩
+"""
+
+import mmap
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from rules_frontmatter import MAX_HEADER_BYTES
+
+COUNT_CHUNK_BYTES = 1 << 20  # 줄 수 스캔 조각 크기 (메모리 사용 상한)
+
+_BOM = b"\xef\xbb\xbf"
+_LINE = rb'(?:(```|~~~)|(#{1,6})[ \t]+([^\r\n]*))'
+_HEADING_RE = re.compile(rb'(?m)^' + _LINE)
+_FIRST_LINE_RE = re.compile(_LINE)  # 범위 시작이 줄 시작인데 앞 바이트가 개행이 아닐 때 (번들 본문)
+_DELIMITER_RE = re.compile(rb'(?m)^---[ \t\r]*$')
+
+
+class Section:
+    """헤딩 하나가 여는 섹션 (다음 같은/상위 레벨 헤딩 전까지, 바이트 오프셋)"""
+
+    __slots__ = ("level", "title", "start", "end")
+
+    def __init__(self, level: int, title: str, start: int, end: int):
+        self.level = level
+        self.title = title
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"Section({'#' * self.level} {self.title!r}, {self.start}:{self.end})"
+
+
+class RuleBody:
+    """
+    Rule 본문 지연 접근자
+
+    buffer[start:end]가 Rule 하나의 내용 (파일 전체 또는 번들 본문 영역),
+    body_start는 프론트매터 다음 위치 (헤딩 스캔 시작점)
+    """
+
+    def __init__(self, buffer, start: int = 0, end: Optional[int] = None,
+                 body_start: Optional[int] = None, owner=None):
+        self._buffer = buffer
+        self._owner = owner  # close() 대상 (open()으로 연 mmap)
+        self.start = start
+        self.end = len(buffer) if end is None else end
+        self.body_start = self._find_body_start() if body_start is None else body_start
+        self._sections = None
+
+    @classmethod
+    def open(cls, path: Path) -> "RuleBody":
+        """파일 → 접근자 (빈 파일은 mmap 불가 → 빈 버퍼)"""
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return cls(b"")
+        return cls(mapped, owner=mapped)
+
+    def close(self):
+        """mmap 닫기"""
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self) -> "RuleBody":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _find_body_start(self) -> int:
+        """프론트매터(첫 줄 '---' ~ 닫는 '---' 줄) 다음 위치, 없으면 범위 시작"""
+        pos = self.start
+        if self._buffer[pos:pos + 3] == _BOM:
+            pos += 3
+        first_end = self._buffer.find(b"\n", pos, self.end)
+        if first_end < 0 or self._buffer[pos:first_end].rstrip() != b"---":
+            return self.start
+        match = _DELIMITER_RE.search(self._buffer, first_end + 1, min(self.end, pos + MAX_HEADER_BYTES))
+        if match is None:
+            return self.start
+        return min(match.end() + 1, self.end)
+
+    @property
+    def size(self) -> int:
+        """바이트 크기"""
+        return self.end - self.start
+
+    def line_count(self, start: Optional[int] = None, end: Optional[int] = None) -> int:
+        """범위의 줄 수 (개행 수 + 1, 기본은 전체 내용)"""
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        count = 1
+        for pos in range(start, end, COUNT_CHUNK_BYTES):
+            count += self._buffer[pos:min(pos + COUNT_CHUNK_BYTES, end)].count(b"\n")
+        return count
+
+    def text(self, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """범위 디코딩 (기본은 프론트매터 제외 본문)"""
+        start = self.body_start if start is None else start
+        end = self.end if end is None else end
+        return self._buffer[start:end].decode('utf-8', errors='replace')
+
+    def _headings(self):
+        """(레벨, 제목, 오프셋) - 코드 펜스 안 줄은 제외"""
+        matches = []
+        start = self.body_start
+        if start > 0 and self._buffer[start - 1:start] != b"\n":
+            first = _FIRST_LINE_RE.match(self._buffer, start, self.end)
+            if first is not None:
+                matches.append(first)
+        matches.extend(_HEADING_RE.finditer(self._buffer, start, self.end))
+
+        in_fence = False
+        for match in matches:
+            fence, hashes, title = match.groups()
+            if fence:
+                in_fence = not in_fence
+            elif not in_fence:
+                title = title.decode('utf-8', errors='replace').rstrip().rstrip('#').rstrip()
+                yield len(hashes), title, match.start()
+
+    def sections(self) -> List[Section]:
+        """헤딩별 섹션 (문서 순서)"""
+        if self._sections is None:
+            sections = []
+            open_sections = []  # 아직 끝나지 않은 섹션 스택 (레벨 오름차순)
+            for level, title, offset in self._headings():
+                while open_sections and open_sections[-1].level >= level:
+                    open_sections.pop().end = offset
+                section = Section(level, title, offset, self.end)
+                sections.append(section)
+                open_sections.append(section)
+            self._sections = sections
+        return self._sections
+
+    def section(self, title: str) -> Optional[str]:
+        """제목이 같은 첫 섹션 본문 (헤딩 줄 포함), 없으면 None"""
+        for section in self.sections():
+            if section.title == title:
+                return self.text(section.start, section.end)
+        return None
+
+    def section_lines(self, section: Section) -> int:
+        """섹션 줄 수 (마지막 개행 뒤 빈 줄은 세지 않음)"""
+        end = section.end
+        if end > section.start and self._buffer[end - 1:end] == b"\n":
+            end -= 1
+        return self.line_count(section.start, end)
+
+    def split_sections(self) -> List[Section]:
+        """
+        분할 단위 섹션: 섹션이 2개 이상인 가장 얕은 헤딩 레벨
+        (문서 제목 H1 하나 아래에 ## 섹션들이 있으면 ## 단위)
+        """
+        by_level = {}
+        for section in self.sections():
+            by_level.setdefault(section.level, []).append(section)
+        for level in sorted(by_level):
+            if len(by_level[level]) >= 2:
+                return by_level[level]
+        return []
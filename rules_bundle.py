@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사전 컴파일된 Rules 번들 (.cursor/rules.bundle)
+
+- 빌드: .cursor/rules/*.mdc → 파일 하나 (고정 헤더 + 헤더 색인 JSON + 본문 영역)
+  - 헤더 색인: Rule별 파일 지문(mtime_ns, size), 프론트매터 원문, 줄 수, 본문 오프셋/길이
+  - 본문 영역: UTF-8 본문을 이어 붙인 바이트 (오프셋은 본문 영역 시작 기준)
+- 로드: 고정 헤더 + 헤더 색인만 읽음 → 시작 비용이 전체 본문 크기와 무관
+  - 본문은 요청 시 mmap에서 잘라 디코딩 (처음 요청할 때 매핑), body_view()는 복사 없는 RuleBody
+- 디렉토리 지문과 다르면(추가/수정/삭제) 번들을 쓰지 않고 코퍼스 캐시로 대체
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rules_body import RuleBody
+from rules_corpus import RulesCorpus
+from rules_parallel import resolve_jobs
+
+BUNDLE_NAME = "rules.bundle"
+BUNDLE_MAGIC = b"RULEBNDL"
+BUNDLE_FORMAT = 1
+
+# 고정 헤더: 매직(8) + 포맷 버전(u32) + 헤더 색인 길이(u32)
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def bundle_path(rules_dir: Path) -> Path:
+    """Rules 디렉토리 → 기본 번들 경로 (.cursor/rules.bundle)"""
+    return Path(rules_dir).parent / BUNDLE_NAME
+
+
+def directory_fingerprints(rules_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """디렉토리의 현재 파일 지문 {name: (mtime_ns, size)} (stat만, 내용 미로드)"""
+    current = {}
+    rules_dir = Path(rules_dir)
+    if rules_dir.exists():
+        for rule_file in rules_dir.glob("*.mdc"):
+            try:
+                st = rule_file.stat()
+            except OSError:
+                continue
+            current[rule_file.name] = (st.st_mtime_ns, st.st_size)
+    return current
+
+
+def build_bundle(rules_dir: Path, path: Optional[Path] = None, jobs: int = 1) -> Dict:
+    """
+    Rules 디렉토리 → 번들 파일 (코퍼스 캐시 재사용, 바뀐 파일만 재파싱)
+
+    Returns:
+        {'path', 'rules', 'errors', 'header_bytes', 'body_bytes', 'built_at'}
+    """
+    rules_dir = Path(rules_dir)
+    path = Path(path) if path else bundle_path(rules_dir)
+
+    corpus = RulesCorpus(rules_dir, jobs=jobs)
+    try:
+        entries = corpus.refresh()
+    finally:
+        corpus.close()
+
+    rules = []
+    bodies = []
+    offset = 0
+    errors = 0
+    for name, entry in sorted(entries.items()):  # 헤더는 이름순 (names()/entries() 순서)
+        if "error" in entry:
+            errors += 1
+            continue
+        body = entry["body"].encode('utf-8')
+        rules.append([
+            name, entry["mtime_ns"], entry["size"],
+            entry["front_matter"], entry["content_lines"], offset, len(body),
+        ])
+        bodies.append(body)
+        offset += len(body)
+
+    built_at = time.time_ns()
+    header = json.dumps(
+        {"built_at": built_at, "rules": rules}, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+    # 임시 파일 → 교체 (읽는 쪽은 항상 완성된 번들만 봄)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT, len(header)))
+        f.write(header)
+        for body in bodies:
+            f.write(body)
+    os.replace(tmp_path, path)
+
+    return {
+        "path": str(path),
+        "rules": len(rules),
+        "errors": errors,
+        "header_bytes": _PREAMBLE.size + len(header),
+        "body_bytes": offset,
+        "built_at": built_at,
+    }
+
+
+class RuleBundle:
+    """번들 리더 (헤더 색인만 메모리에, 본문은 mmap에서 지연 로드)"""
+
+    def __init__(self, path: Path, rules_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.rules_dir = Path(rules_dir) if rules_dir else self.path.parent / "rules"
+        self._file = open(self.path, 'rb')
+        self._mmap = None
+        try:
+            magic, version, header_length = _PREAMBLE.unpack(self._file.read(_PREAMBLE.size))
+            if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT:
+                raise ValueError(f"지원하지 않는 번들 형식: {magic!r} v{version}")
+            header = json.loads(self._file.read(header_length).decode('utf-8'))
+        except (struct.error, ValueError):
+            self._file.close()
+            raise
+        self.built_at = header["built_at"]
+        self._body_start = _PREAMBLE.size + header_length
+        self._rules = {rule[0]: rule for rule in header["rules"]}
+
+    def close(self):
+        """mmap/파일 닫기"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "RuleBundle":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rules
+
+    def names(self) -> List[str]:
+        """번들에 든 Rules 이름 (이름순 - build_bundle이 이름순으로 기록)"""
+        return list(self._rules)
+
+    def fingerprints(self) -> Dict[str, Tuple[int, int]]:
+        """빌드 시점 파일 지문 {name: (mtime_ns, size)}"""
+        return {name: (rule[1], rule[2]) for name, rule in self._rules.items()}
+
+    def is_fresh(self) -> bool:
+        """디렉토리 현재 상태와 빌드 시점 지문이 같은지 (stat만)"""
+        return directory_fingerprints(self.rules_dir) == self.fingerprints()
+
+    def entries(self) -> Dict[str, Dict]:
+        """
+        헤더 엔트리 (RulesCorpus.load(headers_only=True)와 같은 형식, 본문 미로드)
+
+        Returns:
+            {'rule.mdc': {'name', 'path', 'size', 'mtime', 'mtime_ns', 'front_matter', 'content_lines'}}
+        """
+        entries = {}
+        for name, mtime_ns, size, front_matter, content_lines, _, _ in self._rules.values():
+            entries[name] = {
+                "name": name,
+                "path": self.rules_dir / name,
+                "size": size,
+                "mtime": mtime_ns // 10**9 + (mtime_ns % 10**9) * 1e-9,  # os.stat().st_mtime과 동일
+                "mtime_ns": mtime_ns,
+                "front_matter": front_matter,
+                "content_lines": content_lines,
+            }
+        return entries
+
+    def body_bytes(self, name: str) -> bytes:
+        """본문 원본 바이트 (mmap 슬라이스)"""
+        _, _, _, _, _, offset, length = self._rules[name]
+        if length == 0:
+            return b""
+        start = self._body_start + offset
+        return self._map()[start:start + length]
+
+    def _map(self) -> mmap.mmap:
+        """번들 파일 mmap (처음 본문을 요청할 때 매핑)"""
+        if self._mmap is None:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def body(self, name: str) -> str:
+        """본문 (프론트매터 제외)"""
+        return self.body_bytes(name).decode('utf-8')
+
+    def body_view(self, name: str) -> RuleBody:
+        """본문 지연 접근자 (번들 mmap 위의 범위, 복사 없음 - 번들을 닫으면 무효)"""
+        _, _, _, _, _, offset, length = self._rules[name]
+        if length == 0:
+            return RuleBody(b"")
+        start = self._body_start + offset
+        return RuleBody(self._map(), start, start + length, body_start=start)
+
+
+def open_bundle(rules_dir: Path, path: Optional[Path] = None) -> Optional[RuleBundle]:
+    """
+    최신 번들 열기
+
+    번들이 없거나, 형식이 다르거나, 디렉토리와 지문이 다르면 None (호출 측은 코퍼스 캐시 사용)
+    """
+    path = Path(path) if path else bundle_path(rules_dir)
+    try:
+        bundle = RuleBundle(path, rules_dir)
+    except (OSError, ValueError, KeyError):
+        return None
+    if not bundle.is_fresh():
+        bundle.close()
+        return None
+    return bundle
+
+
+def main():
+    """메인 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rules 번들 빌드/확인")
+    parser.add_argument("--rules-dir", type=Path, default=Path(__file__).parent.parent / ".cursor" / "rules",
+                        help="Rules 디렉토리")
+    parser.add_argument("--output", type=Path, default=None, help="번들 경로 (기본: .cursor/rules.bundle)")
+    parser.add_argument("--check", action="store_true", help="빌드하지 않고 번들이 최신인지만 확인")
+    parser.add_argument("--jobs", type=int, default=1, help="변경 파일 병렬 파싱 (0 = CPU 코어 수)")
+    args = parser.parse_args()
+
+    path = args.output or bundle_path(args.rules_dir)
+    if args.check:
+        bundle = open_bundle(args.rules_dir, path)
+        if bundle is None:
+            print(f"⚠️ 번들이 없거나 오래되었습니다: {path}")
+            raise SystemExit(1)
+        with bundle:
+            print(f"✅ 번들 최신: {path} (Rules {len(bundle)}개)")
+        return
+
+    start = time.perf_counter()
+    result = build_bundle(args.rules_dir, path, jobs=resolve_jobs(args.jobs))
+    print(f"📦 번들 생성: {result['path']}")
+    print(f"   Rules {result['rules']}개, 헤더 {result['header_bytes']:,} bytes, "
+          f"본문 {result['body_bytes']:,} bytes ({time.perf_counter() - start:.2f}s)")
+    if result["errors"]:
+        print(f"⚠️ 읽기 실패로 제외된 Rules {result['errors']}개 (번들은 최신으로 인정되지 않음)")
+
+
+if __name__ == "__main__":
+    main()
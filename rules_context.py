@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컨텍스트 예산 패커
+
+- Rules별 토큰 비용 추정 (코퍼스 DB에 파일 지문별 캐시, 바뀐 파일만 다시 읽음)
+- 질의 관련도(BM25F + priority 보정)를 가치로, 토큰 비용을 무게로 하는 0/1 배낭 문제
+  - alwaysApply Rules는 필수로 먼저 담고 남은 예산을 채움
+  - 가치 밀도 탐욕 해 / 최고 가치 단일 항목 / 비용을 양자화한 DP 중 가장 좋은 해 선택
+- 실제로 로드될 Rules와 총 토큰 수를 보고 (전체 alwaysApply 로드와 비교)
+"""
+
+import json
+import math
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rules_frontmatter import FrontMatter
+from rules_index import RulesIndex, index_tokens
+
+WORKSPACE = Path(__file__).parent.parent
+RULES_DIR = WORKSPACE / ".cursor" / "rules"
+
+DEFAULT_BUDGET = 8000  # 토큰
+MAX_CANDIDATES = 200  # 랭킹 후보 수
+DP_RESOLUTION = 2000  # DP 비용 단위 수 (예산을 이만큼으로 나눠 양자화)
+
+# 토큰 추정 (토크나이저 의존성 없이 보수적으로: ASCII 4자당 1토큰, 한글 등 비ASCII 1자당 1토큰)
+ASCII_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트 → 추정 토큰 수"""
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return math.ceil(ascii_chars / ASCII_CHARS_PER_TOKEN) + (len(text) - ascii_chars)
+
+
+class TokenCostCache:
+    """코퍼스 DB에 파일 지문별 토큰 비용 캐시"""
+
+    def __init__(self, conn: sqlite3.Connection, rules_dir: Path):
+        self._conn = conn
+        self.rules_dir = Path(rules_dir)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_costs (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                tokens INTEGER NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+    def costs(self, fingerprints: Dict[str, Tuple[int, int]]) -> Dict[str, int]:
+        """{name: (mtime_ns, size)} → {name: 토큰 수} (지문이 바뀐 파일만 다시 읽어 추정)"""
+        cached = {
+            name: (mtime_ns, size, tokens)
+            for name, mtime_ns, size, tokens in self._conn.execute("SELECT * FROM token_costs")
+        }
+        result = {}
+        fresh = []
+        for name, fingerprint in fingerprints.items():
+            hit = cached.get(name)
+            if hit and hit[:2] == fingerprint:
+                result[name] = hit[2]
+                continue
+            try:
+                tokens = estimate_tokens((self.rules_dir / name).read_text(encoding='utf-8'))
+            except (OSError, UnicodeDecodeError):
+                continue
+            result[name] = tokens
+            fresh.append((name, fingerprint[0], fingerprint[1], tokens))
+
+        stale = [(name,) for name in cached if name not in fingerprints]
+        self._conn.executemany("DELETE FROM token_costs WHERE name = ?", stale)
+        self._conn.executemany("INSERT OR REPLACE INTO token_costs VALUES (?, ?, ?, ?)", fresh)
+        self._conn.commit()
+        return result
+
+
+def knapsack(items: List[Tuple[str, float, int]], budget: int) -> List[str]:
+    """
+    0/1 배낭 근사 해 (items: [(이름, 가치, 비용)])
+
+    1. 가치 밀도(가치/비용) 탐욕 해
+    2. 예산에 들어가는 최고 가치 단일 항목
+    3. 비용을 ceil(비용/단위)로 양자화한 DP (양자화해도 예산 초과 없음)
+    중 총 가치가 가장 큰 해를 반환한다.
+    """
+    items = [item for item in items if item[1] > 0 and item[2] <= budget]
+    if not items or budget <= 0:
+        return []
+
+    values = {name: value for name, value, _ in items}
+
+    def total(names):
+        return sum(values[name] for name in names)
+
+    greedy = []
+    remaining = budget
+    for name, value, cost in sorted(items, key=lambda item: (-item[1] / max(item[2], 1), item[0])):
+        if cost <= remaining:
+            greedy.append(name)
+            remaining -= cost
+    single = [max(items, key=lambda item: (item[1], -item[2]))[0]]
+
+    unit = max(1, math.ceil(budget / DP_RESOLUTION))
+    capacity = budget // unit
+    best = [0.0] * (capacity + 1)
+    choice = []  # 항목별로 best를 갱신한 용량 (역추적용)
+    for _, value, cost in items:
+        weight = math.ceil(cost / unit)
+        taken = set()
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                taken.add(c)
+        choice.append((weight, taken))
+    dp = []
+    c = max(range(capacity + 1), key=lambda i: best[i])
+    for (name, _, _), (weight, taken) in zip(reversed(items), reversed(choice)):
+        if c in taken:
+            dp.append(name)
+            c -= weight
+
+    return max((greedy, single, dp), key=total)
+
+
+def pack_context(query: str, budget: int = DEFAULT_BUDGET, rules_dir: Optional[Path] = None,
+                 always_required: bool = True) -> Dict:
+    """
+    예산 안에서 로드할 Rules 선택
+
+    Args:
+        query: 작업/문제 설명 (관련도 계산용)
+        budget: 토큰 예산
+        rules_dir: Rules 디렉토리 (None이면 .cursor/rules)
+        always_required: True면 alwaysApply Rules를 먼저 담음 (Cursor 로드 방식)
+
+    Returns:
+        {
+            'budget', 'total_tokens', 'selected': [{'name', 'tokens', 'score', 'priority', 'always_apply'}],
+            'overflow': [예산 밖으로 밀린 alwaysApply], 'always_apply_tokens', 'skipped'
+        }
+    """
+    index = RulesIndex(rules_dir or RULES_DIR)
+    try:
+        index.update()
+        costs = TokenCostCache(index.corpus.conn, index.rules_dir).costs(index.corpus.fingerprints())
+        docs = index.documents(index.ids())
+        ranked = index.rank(index_tokens(query), MAX_CANDIDATES)
+    finally:
+        index.close()
+
+    scores = {docs[doc_id]["name"]: score for score, doc_id in ranked if doc_id in docs}
+    rules = {}
+    for doc in docs.values():
+        name = doc["name"]
+        if name not in costs:
+            continue
+        front_matter = FrontMatter(doc["front_matter"])
+        rules[name] = {
+            "name": name,
+            "tokens": costs[name],
+            "score": round(scores.get(name, 0.0), 4),
+            "priority": front_matter.priority,
+            "always_apply": bool(front_matter.always_apply),
+        }
+
+    # 필수(alwaysApply): priority 높은(숫자 작은) 것부터 예산 안에서
+    selected, overflow = [], []
+    remaining = budget
+    always = [r for r in rules.values() if r["always_apply"]] if always_required else []
+    for rule in sorted(always, key=lambda r: (r["priority"] if r["priority"] is not None else 10, r["name"])):
+        if rule["tokens"] <= remaining:
+            selected.append(rule["name"])
+            remaining -= rule["tokens"]
+        else:
+            overflow.append(rule["name"])
+
+    # 선택: 관련도 있는 나머지 Rules로 남은 예산 채우기
+    taken = set(selected) | set(overflow)
+    items = [(name, score, rules[name]["tokens"]) for name, score in scores.items()
+             if name in rules and name not in taken]
+    packed = knapsack(items, remaining)
+    selected += sorted(packed, key=lambda name: -rules[name]["score"])
+
+    chosen = [rules[name] for name in selected]
+    return {
+        "budget": budget,
+        "total_tokens": sum(rule["tokens"] for rule in chosen),
+        "selected": chosen,
+        "overflow": overflow,
+        "always_apply_tokens": sum(r["tokens"] for r in rules.values() if r["always_apply"]),
+        "skipped": len(items) - len(packed),
+    }
+
+
+def main():
+    """메인 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="토큰 예산 안에서 로드할 Rules 선택")
+    parser.add_argument("query", nargs="*", help="작업/문제 설명")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="토큰 예산")
+    parser.add_argument("--optional-always", action="store_true", help="alwaysApply Rules도 관련도로만 선택")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    query = ' '.join(args.query)
+    result = pack_context(query, args.budget, always_required=not args.optional_always)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    print(f"📦 컨텍스트 예산: {result['total_tokens']:,} / {result['budget']:,} 토큰 "
+          f"(Rules {len(result['selected'])}개, 전체 alwaysApply 로드 시 {result['always_apply_tokens']:,} 토큰)")
+    for rule in result["selected"]:
+        marker = "✅ Always" if rule["always_apply"] else f"🔎 {rule['score']:.2f}"
+        print(f"  {rule['tokens']:>7,}  {marker:<10} {rule['name']}")
+    if result["overflow"]:
+        print(f"\n⚠️ 예산 초과로 빠진 alwaysApply Rules {len(result['overflow'])}개: {', '.join(result['overflow'])}")
+    if result["skipped"]:
+        print(f"⚪ 관련 있지만 예산 밖: {result['skipped']}개")
+
+
+if __name__ == "__main__":
+    main()
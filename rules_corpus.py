@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 코퍼스 캐시 (공유)
+
+- 모든 도구가 같은 파싱 결과를 재사용
+- (파일명, mtime, size) 지문으로 파일별 무효화
+- SQLite 한 파일(.cursor/rules_corpus.sqlite)에 영구 저장
+- 변경된 파일만 다시 읽고 파싱
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rules_frontmatter import split_content
+from rules_parallel import map_cpu, map_io
+from rules_tokens import text_tokens
+
+CORPUS_DB_NAME = "rules_corpus.sqlite"
+SCHEMA_VERSION = 3  # 2: 공유 프론트매터 파서(rules_frontmatter), 3: 한국어 인식 토큰
+
+
+def extract_core_content(body: str) -> str:
+    """본문에서 핵심 내용만 추출 (주석/헤딩 제거, 단 '핵심'/'원칙' 섹션은 유지)"""
+    core_lines = []
+    for line in body.split('\n'):
+        if line.strip().startswith('#') and '핵심' not in line and '원칙' not in line:
+            continue
+        core_lines.append(line)
+    return '\n'.join(core_lines)
+
+
+def tokenize(text: str) -> List[str]:
+    """유사도 계산용 단어 토큰 (소문자 + 한글 어간/바이그램, 중복 제거, 정렬)"""
+    return sorted(set(text_tokens(text)))
+
+
+def parse_rule_content(content: str) -> Dict:
+    """파일 내용 → 코퍼스 엔트리 (파일 시스템 정보 제외)"""
+    front_matter, body = split_content(content)
+    return {
+        "front_matter": front_matter,
+        "body": body,
+        "tokens": tokenize(extract_core_content(body)),
+        "content_lines": content.count('\n') + 1,
+    }
+
+
+def _read_rule(rule_file: Path) -> Tuple[Optional[str], Optional[str]]:
+    """파일 읽기 → (내용, 오류 메시지)"""
+    try:
+        return rule_file.read_text(encoding='utf-8'), None
+    except Exception as e:
+        return None, str(e)
+
+
+class RulesCorpus:
+    """파싱된 Rules 코퍼스 (디스크 캐시 포함)"""
+
+    def __init__(self, rules_dir: Path, db_path: Optional[Path] = None, jobs: int = 1):
+        self.rules_dir = Path(rules_dir)
+        self.db_path = Path(db_path) if db_path else self.rules_dir.parent / CORPUS_DB_NAME
+        self.jobs = jobs  # >1 이면 변경 파일 읽기(스레드)/파싱(프로세스) 병렬화
+        self.stats = {"parsed": 0, "reused": 0, "removed": 0, "errors": 0}
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """캐시 DB 연결 (실패 시 메모리 DB로 대체)"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path))
+            self._init_schema(conn)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ 코퍼스 캐시를 열 수 없습니다 ({self.db_path}): {e} - 메모리 캐시 사용")
+            conn = sqlite3.connect(":memory:")
+            self._init_schema(conn)
+        return conn
+
+    @staticmethod
+    def _init_schema(conn: sqlite3.Connection):
+        """스키마 생성 (버전이 다르면 초기화)"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS rules")
+            conn.execute("DROP TABLE IF EXISTS minhash")  # 토큰에서 계산한 파생 캐시(rules_minhash)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rules (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                front_matter TEXT NOT NULL,
+                body TEXT NOT NULL,
+                tokens TEXT NOT NULL,
+                content_lines INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+    def close(self):
+        """DB 연결 종료"""
+        self._conn.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """캐시 DB 연결 (인덱스 등 파생 테이블 공유용)"""
+        return self._conn
+
+    def sync(self) -> Dict[str, Dict]:
+        """
+        디렉토리 → 캐시 동기화 (변경/삭제된 파일만 처리, 본문 로드 없음)
+
+        Returns:
+            새로 파싱했거나 읽기에 실패한 엔트리 {name: entry}
+        """
+        _, fresh = self._sync()
+        return fresh
+
+    def _sync(self) -> Tuple[Dict[str, Tuple[Path, os.stat_result]], Dict[str, Dict]]:
+        """stat 비교 후 변경된 파일만 재파싱하여 DB 갱신"""
+        self.stats = {"parsed": 0, "reused": 0, "removed": 0, "errors": 0}
+
+        cached = {
+            name: (mtime_ns, size)
+            for name, mtime_ns, size in self._conn.execute("SELECT name, mtime_ns, size FROM rules")
+        }
+
+        current = {}
+        if self.rules_dir.exists():
+            for rule_file in self.rules_dir.glob("*.mdc"):
+                try:
+                    st = rule_file.stat()
+                except OSError:
+                    continue
+                current[rule_file.name] = (rule_file, st)
+
+        # 삭제된 파일
+        removed = [name for name in cached if name not in current]
+        if removed:
+            self._conn.executemany("DELETE FROM rules WHERE name = ?", [(n,) for n in removed])
+            self.stats["removed"] = len(removed)
+
+        # 변경된 파일만 읽기 → 파싱 (이름순, jobs > 1 이면 병렬)
+        stale = sorted(
+            name for name, (_, st) in current.items()
+            if cached.get(name) != (st.st_mtime_ns, st.st_size)
+        )
+        contents = map_io(_read_rule, [current[name][0] for name in stale], self.jobs)
+
+        entries = {}
+        readable = []
+        failed = []
+        for name, (content, error) in zip(stale, contents):
+            if error is not None:
+                self.stats["errors"] += 1
+                entries[name] = {"name": name, "path": current[name][0], "error": error}
+                failed.append(name)
+            else:
+                readable.append((name, content))
+        if failed:
+            # 이전 내용 행 제거 → 색인/번들/진단에서 빠지고, 다시 읽힐 때까지 매번 재시도
+            self._conn.executemany("DELETE FROM rules WHERE name = ?", [(n,) for n in failed])
+        parsed = map_cpu(parse_rule_content, [content for _, content in readable], self.jobs)
+
+        fresh = []
+        for (name, _), entry in zip(readable, parsed):
+            rule_file, st = current[name]
+            entries[name] = self._with_stat(entry, rule_file, st)
+            fresh.append((
+                name, st.st_mtime_ns, st.st_size,
+                json.dumps(entry["front_matter"], ensure_ascii=False),
+                entry["body"], ' '.join(entry["tokens"]), entry["content_lines"],
+            ))
+        if fresh:
+            self._conn.executemany("INSERT OR REPLACE INTO rules VALUES (?, ?, ?, ?, ?, ?, ?)", fresh)
+            self.stats["parsed"] = len(fresh)
+        self._conn.commit()
+
+        return current, entries
+
+    def refresh(self, headers_only: bool = False) -> Dict[str, Dict]:
+        """
+        디렉토리와 캐시 동기화 후 전체 엔트리 로드
+
+        Args:
+            headers_only: True면 변경 없는 파일의 body/tokens를 DB에서 읽지 않음
+                          (프론트매터·줄 수·파일 정보만 필요한 통계용)
+
+        Returns:
+            {
+                'rule.mdc': {
+                    'name', 'path', 'size', 'mtime', 'mtime_ns',
+                    'front_matter', 'body', 'tokens', 'content_lines'
+                },  # 읽기 실패 시 {'name', 'path', 'error'}
+                ...
+            }
+        """
+        current, entries = self._sync()
+
+        # 변경 없는 파일은 캐시에서 로드
+        columns = "name, front_matter, content_lines" if headers_only else "name, front_matter, content_lines, body, tokens"
+        for name, front_matter, content_lines, *rest in self._conn.execute(f"SELECT {columns} FROM rules"):
+            if name in entries or name not in current:
+                continue
+            rule_file, st = current[name]
+            entry = {
+                "front_matter": json.loads(front_matter),
+                "content_lines": content_lines,
+            }
+            if rest:
+                body, tokens = rest
+                entry["body"] = body
+                entry["tokens"] = tokens.split(' ') if tokens else []
+            entries[name] = self._with_stat(entry, rule_file, st)
+            self.stats["reused"] += 1
+
+        return dict(sorted(entries.items()))
+
+    def fingerprints(self) -> Dict[str, Tuple[int, int]]:
+        """캐시된 파일 지문 {name: (mtime_ns, size)} (sync 이후 호출)"""
+        return {
+            name: (mtime_ns, size)
+            for name, mtime_ns, size in self._conn.execute("SELECT name, mtime_ns, size FROM rules")
+        }
+
+    def load(self, names: Iterable[str], headers_only: bool = False) -> Dict[str, Dict]:
+        """지정한 파일의 엔트리만 캐시에서 로드 (sync 이후 호출, 이름순)"""
+        columns = "name, mtime_ns, size, front_matter, content_lines"
+        if not headers_only:
+            columns += ", body, tokens"
+        names = list(names)
+        entries = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._conn.execute(f"SELECT {columns} FROM rules WHERE name IN ({placeholders})", chunk)
+            for name, mtime_ns, size, front_matter, content_lines, *rest in rows:
+                entry = {
+                    "name": name,
+                    "path": self.rules_dir / name,
+                    "size": size,
+                    "mtime": mtime_ns // 10**9 + (mtime_ns % 10**9) * 1e-9,  # os.stat().st_mtime과 동일
+                    "mtime_ns": mtime_ns,
+                    "front_matter": json.loads(front_matter),
+                    "content_lines": content_lines,
+                }
+                if rest:
+                    body, tokens = rest
+                    entry["body"] = body
+                    entry["tokens"] = tokens.split(' ') if tokens else []
+                entries[name] = entry
+        return dict(sorted(entries.items()))
+
+    def entries(self) -> List[Dict]:
+        """정상적으로 파싱된 엔트리 목록 (이름순)"""
+        return [e for e in self.refresh().values() if "error" not in e]
+
+    @staticmethod
+    def _with_stat(entry: Dict, rule_file: Path, st: os.stat_result) -> Dict:
+        """파일 시스템 정보 추가"""
+        entry["name"] = rule_file.name
+        entry["path"] = rule_file
+        entry["size"] = st.st_size
+        entry["mtime"] = st.st_mtime
+        entry["mtime_ns"] = st.st_mtime_ns
+        return entry
@@ -9,112 +9,127 @@ Cursor Rules 진단 및 관리 시스템
 - 우선순위 분석
 """
 
+import bisect
 import os
+import time
 from pathlib import Path
 from datetime import datetime
 import json
-import re
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from rules_bundle import open_bundle
+from rules_corpus import RulesCorpus, parse_rule_content
+from rules_parallel import resolve_jobs
+from rules_record import RuleRecord, load_rule_records, records_to_dicts
+from rules_tokens import TokenInterner, jaccard, similar_pairs, similar_to, word_tokens
 
 WORKSPACE = Path(__file__).parent.parent
 RULES_DIR = WORKSPACE / ".cursor" / "rules"
+JOURNAL_FILE = WORKSPACE / ".cursor" / "rules_diagnostics_journal.json"
+JOURNAL_VERSION = 3  # 3: 이름 유사도는 \w+ 단어 토큰 (한국어 어간/바이그램 미사용, 기존 결과와 동일)
+SIMILAR_NAME_THRESHOLD = 0.8
 
 class RulesManager:
     """Rules 종합 관리"""
     
-    def __init__(self):
-        self.rules = self.scan_all_rules()
+    def __init__(self, jobs: int = 1, scan: bool = True):
+        self.jobs = jobs
+        self.interner = TokenInterner()
+        self.fingerprints = {}  # {name: (mtime_ns, size)} - 증분 진단 저널용
+        self.similar_names = []  # [(name_a, name_b, similarity)], name_a < name_b
+        self.changes = {"added": [], "changed": [], "removed": []}
+        self.rules = self.scan_all_rules() if scan else []
         self.conflicts = []
         self.usage_stats = {}
         self.priority_map = {}
     
-    def scan_all_rules(self) -> List[Dict]:
-        """모든 Rules 스캔"""
+    def scan_all_rules(self) -> List[RuleRecord]:
+        """모든 Rules 스캔 (번들 또는 코퍼스 캐시 사용, 변경된 파일만 재파싱)"""
         rules = []
         
         if not RULES_DIR.exists():
             print("⚠️ Rules 디렉토리가 없습니다")
             return rules
         
-        for rule_file in RULES_DIR.glob("*.mdc"):
-            rule_info = self.parse_rule_file(rule_file)
-            rules.append(rule_info)
+        # 최신 번들이 있으면 헤더 색인만 읽음 (코퍼스 DB/본문 미로드)
+        bundle = open_bundle(RULES_DIR)
+        if bundle is not None:
+            with bundle:
+                entries = bundle.entries()
+        else:
+            corpus = RulesCorpus(RULES_DIR, jobs=self.jobs)
+            try:
+                entries = corpus.refresh(headers_only=True)
+            finally:
+                corpus.close()
+        
+        for entry in entries.values():
+            if "error" in entry:
+                rules.append(RuleRecord.failed(entry["name"], entry["error"]))
+                continue
+            rules.append(self._build_rule_info(
+                entry["path"], entry["size"], entry["mtime"],
+                entry["front_matter"], entry["content_lines"]
+            ))
+            self.fingerprints[entry["name"]] = (entry["mtime_ns"], entry["size"])
         
         return rules
     
-    def parse_rule_file(self, rule_path: Path) -> Dict:
+    def parse_rule_file(self, rule_path: Path) -> RuleRecord:
         """Rule 파일 파싱"""
         try:
             content = rule_path.read_text(encoding='utf-8')
-            
-            # 메타데이터 추출
-            metadata = {}
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    front_matter = parts[1]
-                    # YAML 파싱 (간단 버전)
-                    for line in front_matter.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            metadata[key.strip()] = value.strip().strip('"').strip("'")
-            
-            # Priority 추출 (숫자로 변환)
-            priority = 5  # 기본값
-            if 'priority' in metadata:
-                try:
-                    priority = int(metadata['priority'])
-                except (ValueError, TypeError):
-                    priority = 5
-            
-            # alwaysApply 추출
-            always_apply = False
-            if 'alwaysApply' in metadata:
-                always_apply = metadata['alwaysApply'].lower() == "true"
-            
-            return {
-                "name": rule_path.name,
-                "path": str(rule_path.relative_to(WORKSPACE)),
-                "size": rule_path.stat().st_size,
-                "modified": datetime.fromtimestamp(rule_path.stat().st_mtime),
-                "priority": priority,
-                "always_apply": always_apply,
-                "description": metadata.get("description", ""),
-                "globs": metadata.get("globs", ""),
-                "type": metadata.get("type", ""),
-                "tags": metadata.get("tags", ""),
-                "content_lines": len(content.split('\n')),
-                "metadata": metadata
-            }
+            parsed = parse_rule_content(content)
+            st = rule_path.stat()
+            return self._build_rule_info(
+                rule_path, st.st_size, st.st_mtime,
+                parsed["front_matter"], parsed["content_lines"]
+            )
         except Exception as e:
-            return {
-                "name": rule_path.name,
-                "error": str(e),
-                "priority": 5,
-                "always_apply": False
-            }
+            return RuleRecord.failed(rule_path.name, str(e))
+    
+    def _build_rule_info(self, rule_path: Path, size: int, mtime: float,
+                         metadata: Dict, content_lines: int) -> RuleRecord:
+        """프론트매터 → Rule 레코드"""
+        return RuleRecord.from_front_matter(
+            rule_path.name, str(rule_path.parent.relative_to(WORKSPACE)),
+            size, mtime, metadata, content_lines
+        )
     
     def detect_conflicts(self):
         """Rules 충돌 감지"""
+        # 같은 priority의 Rules
+        priority_groups = defaultdict(list)
+        for rule in self.rules:
+            priority_groups[rule.priority].append(rule.name)
+        
+        # 유사한 이름 (중복 가능성) - 이름당 한 번만 토큰화, prefix filtering으로 후보 쌍만 비교
+        names = [r.name for r in self.rules]
+        name_tokens = [self._name_tokens(name) for name in names]
+        self.similar_names = [
+            (names[i], names[j], similarity)
+            for i, j, similarity in similar_pairs(name_tokens, SIMILAR_NAME_THRESHOLD)
+        ]
+        
+        self.conflicts = self._build_conflicts(
+            [r.name for r in self.rules if r.always_apply], priority_groups
+        )
+        return self.conflicts
+    
+    def _build_conflicts(self, always_apply: List[str], priority_groups: Dict[int, List[str]]) -> List[Dict]:
+        """충돌 목록 구성 (priority_groups는 이름순 첫 등장 순서)"""
         conflicts = []
         
         # Priority 0-2 (항상 적용)는 충돌 가능성 높음
-        always_apply = [r for r in self.rules if r.get("always_apply")]
-        
         if len(always_apply) > 10:
             conflicts.append({
                 "type": "too_many_always_apply",
                 "severity": "high",
                 "message": f"{len(always_apply)}개 Rules가 항상 적용됩니다. 컨텍스트 오버로드 위험",
-                "rules": [r["name"] for r in always_apply]
+                "rules": always_apply
             })
         
-        # 같은 priority의 Rules
-        priority_groups = defaultdict(list)
-        for rule in self.rules:
-            priority_groups[rule.get("priority", 5)].append(rule["name"])
-        
         for priority, rules in priority_groups.items():
             if len(rules) > 15:
                 conflicts.append({
@@ -125,84 +140,83 @@ class RulesManager:
                     "rules": rules
                 })
         
-        # 유사한 이름 (중복 가능성)
-        names = [r["name"] for r in self.rules]
-        for i, name1 in enumerate(names):
-            for name2 in names[i+1:]:
-                similarity = self._similarity(name1, name2)
-                if similarity > 0.8:
-                    conflicts.append({
-                        "type": "similar_names",
-                        "severity": "low",
-                        "message": f"유사한 이름: {name1} ↔ {name2}",
-                        "similarity": f"{similarity*100:.0f}%"
-                    })
+        for name_a, name_b, similarity in self.similar_names:
+            conflicts.append({
+                "type": "similar_names",
+                "severity": "low",
+                "message": f"유사한 이름: {name_a} ↔ {name_b}",
+                "similarity": f"{similarity*100:.0f}%"
+            })
         
         # Priority 0이 너무 많으면 경고
-        priority_0_count = len([r for r in self.rules if r.get("priority") == 0])
-        if priority_0_count > 10:
+        priority_0 = priority_groups.get(0, [])
+        if len(priority_0) > 10:
             conflicts.append({
                 "type": "too_many_priority_0",
                 "severity": "high",
-                "message": f"Priority 0 Rules가 {priority_0_count}개입니다. 최우선 규칙이 너무 많아 효과가 떨어질 수 있습니다.",
-                "rules": [r["name"] for r in self.rules if r.get("priority") == 0]
+                "message": f"Priority 0 Rules가 {len(priority_0)}개입니다. 최우선 규칙이 너무 많아 효과가 떨어질 수 있습니다.",
+                "rules": priority_0
             })
         
-        self.conflicts = conflicts
         return conflicts
     
+    def _name_tokens(self, name: str):
+        """이름 → \\w+ 단어 토큰 집합 (이름 유사도는 본문용 한국어 어간/바이그램을 쓰지 않음)"""
+        return self.interner.intern(word_tokens(name))
+    
     def _similarity(self, s1: str, s2: str) -> float:
         """문자열 유사도 (Jaccard)"""
-        words1 = set(re.findall(r'\w+', s1.lower()))
-        words2 = set(re.findall(r'\w+', s2.lower()))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
+        return jaccard(self._name_tokens(s1), self._name_tokens(s2))
     
     def analyze_usage(self):
         """Rules 사용 분석 (추정)"""
         usage = {}
+        now = time.time()
         
         for rule in self.rules:
-            # 마지막 수정 시간 기반 추정
-            days_old = (datetime.now() - rule["modified"]).days
-            
-            if days_old < 7:
-                estimated_usage = "high"
-            elif days_old < 30:
-                estimated_usage = "medium"
-            else:
-                estimated_usage = "low"
-            
-            usage[rule["name"]] = {
-                "estimated": estimated_usage,
-                "days_old": days_old,
-                "last_modified": rule["modified"].strftime("%Y-%m-%d")
-            }
+            if rule.error is None:
+                usage[rule.name] = self._usage_entry(rule, now)
         
         self.usage_stats = usage
         return usage
     
+    @staticmethod
+    def _estimate_usage(days_old: int) -> str:
+        """마지막 수정 시간 기반 사용 빈도 추정"""
+        if days_old < 7:
+            return "high"
+        elif days_old < 30:
+            return "medium"
+        return "low"
+    
+    def _usage_entry(self, rule: RuleRecord, now: float) -> Dict:
+        """Rule 한 개의 사용 분석 항목"""
+        days_old = rule.days_old(now)
+        return {
+            "estimated": self._estimate_usage(days_old),
+            "days_old": days_old,
+            "last_modified": time.strftime("%Y-%m-%d", time.localtime(rule.mtime))
+        }
+    
     def generate_priority_map(self):
         """우선순위 맵 생성"""
         priority_map = defaultdict(list)
         
         for rule in self.rules:
-            priority = rule.get("priority", 5)
-            priority_map[priority].append({
-                "name": rule["name"],
-                "always_apply": rule.get("always_apply"),
-                "description": rule.get("description", "")[:50]
-            })
+            priority_map[rule.priority].append(self._priority_entry(rule))
         
         self.priority_map = dict(sorted(priority_map.items()))
         return self.priority_map
     
+    @staticmethod
+    def _priority_entry(rule: RuleRecord) -> Dict:
+        """우선순위 맵 항목"""
+        return {
+            "name": rule.name,
+            "always_apply": rule.always_apply,
+            "description": rule.description[:50]
+        }
+    
     def generate_report(self) -> str:
         """종합 리포트 생성"""
         report = []
@@ -217,9 +231,9 @@ class RulesManager:
         # 기본 통계
         report.append("## 📈 기본 통계")
         report.append(f"총 Rules 수: {len(self.rules)}")
-        report.append(f"항상 적용 (alwaysApply): {sum(1 for r in self.rules if r.get('always_apply'))}")
+        report.append(f"항상 적용 (alwaysApply): {sum(1 for r in self.rules if r.always_apply)}")
         if self.rules:
-            avg_size = sum(r.get('size', 0) for r in self.rules) / len(self.rules)
+            avg_size = sum(r.size for r in self.rules) / len(self.rules)
             report.append(f"평균 파일 크기: {avg_size:.0f} bytes ({avg_size/1024:.1f} KB)")
         report.append("")
         
@@ -282,7 +296,7 @@ class RulesManager:
         if len(self.rules) > 50:
             recommendations.append(f"🔸 Rules가 {len(self.rules)}개로 많습니다. 40개 이하로 줄이는 것을 권장합니다.")
         
-        always_apply_count = sum(1 for r in self.rules if r.get('always_apply'))
+        always_apply_count = sum(1 for r in self.rules if r.always_apply)
         if always_apply_count > 10:
             recommendations.append(f"🔸 'alwaysApply' Rules가 {always_apply_count}개입니다. 7개 이하로 줄이세요.")
         
@@ -309,7 +323,7 @@ class RulesManager:
         data = {
             "generated_at": datetime.now().isoformat(),
             "total_rules": len(self.rules),
-            "rules": self.rules,
+            "rules": records_to_dicts(self.rules),
             "conflicts": self.conflicts,
             "usage_stats": self.usage_stats,
             "priority_map": self.priority_map
@@ -318,27 +332,226 @@ class RulesManager:
         output_file = Path(output_path)
         output_file.write_text(json.dumps(data, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
         return str(output_file)
+    
+    # ------------------------------------------------------------------
+    # 증분 진단 (이전 rules_analysis.json + 파일 지문 저널)
+    # ------------------------------------------------------------------
+    
+    def save_journal(self, analysis_path: str):
+        """다음 증분 진단용 지문 저널 저장"""
+        journal = {
+            "version": JOURNAL_VERSION,
+            "analysis": str(Path(analysis_path).resolve()),
+            "fingerprints": {name: list(fp) for name, fp in self.fingerprints.items()},
+            "similar_names": [list(pair) for pair in self.similar_names]
+        }
+        JOURNAL_FILE.parent.mkdir(parents=True, exist_ok=True)
+        JOURNAL_FILE.write_text(json.dumps(journal, ensure_ascii=False), encoding='utf-8')
+    
+    @staticmethod
+    def _load_journal() -> Optional[Dict]:
+        """지문 저널 로드 (없거나 버전이 다르면 None)"""
+        try:
+            journal = json.loads(JOURNAL_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if journal.get("version") != JOURNAL_VERSION:
+            return None
+        return journal
+    
+    @classmethod
+    def from_journal(cls, jobs: int = 1) -> Optional["RulesManager"]:
+        """
+        증분 진단: 이전 결과에 추가/변경/삭제된 Rules만 반영
+        
+        Returns:
+            충돌/사용/우선순위까지 갱신된 RulesManager
+            (저널이나 이전 rules_analysis.json이 없으면 None → 전체 진단 필요)
+        """
+        journal = cls._load_journal()
+        if journal is None or not RULES_DIR.exists():
+            return None
+        try:
+            analysis = json.loads(Path(journal["analysis"]).read_text(encoding='utf-8'))
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        manager = cls(jobs=jobs, scan=False)
+        manager.rules = load_rule_records(analysis)
+        manager.usage_stats = analysis.get("usage_stats", {})
+        manager.priority_map = {int(p): rules for p, rules in analysis.get("priority_map", {}).items()}
+        manager.similar_names = [tuple(pair) for pair in journal.get("similar_names", [])]
+        previous = {name: tuple(fp) for name, fp in journal.get("fingerprints", {}).items()}
+        
+        # 코퍼스 동기화 후 저널과 지문 비교 → 바뀐 Rules만 캐시에서 로드
+        corpus = RulesCorpus(RULES_DIR, jobs=jobs)
+        try:
+            errors = {name: e["error"] for name, e in corpus.sync().items() if "error" in e}
+            manager.fingerprints = corpus.fingerprints()
+            for name in errors:
+                manager.fingerprints.pop(name, None)
+            known = {rule.name for rule in manager.rules}
+            current = set(manager.fingerprints) | set(errors)
+            removed = sorted(known - current)
+            touched = sorted(
+                name for name in current
+                if name in errors or name not in known or previous.get(name) != manager.fingerprints[name]
+            )
+            entries = corpus.load([name for name in touched if name not in errors], headers_only=True)
+        finally:
+            corpus.close()
+        
+        updated = {}
+        for name in touched:
+            if name in errors:
+                updated[name] = RuleRecord.failed(name, errors[name])
+            else:
+                entry = entries[name]
+                updated[name] = manager._build_rule_info(
+                    entry["path"], entry["size"], entry["mtime"],
+                    entry["front_matter"], entry["content_lines"]
+                )
+        
+        manager.changes = {
+            "added": [name for name in touched if name not in known],
+            "changed": [name for name in touched if name in known],
+            "removed": removed
+        }
+        manager._apply_changes(updated, removed)
+        return manager
+    
+    def _apply_changes(self, updated: Dict[str, RuleRecord], removed: List[str]):
+        """바뀐 Rules만 목록/우선순위 버킷/유사 이름/사용 분석/충돌에 반영"""
+        by_name = {rule.name: rule for rule in self.rules}
+        previous = [by_name[name] for name in list(updated) + removed if name in by_name]
+        added = [name for name in updated if name not in by_name]
+        
+        # Rules 목록 (이름순 유지 - 추가가 있을 때만 재정렬)
+        for name in removed:
+            del by_name[name]
+        by_name.update(updated)
+        self.rules = list(by_name.values())
+        if added:
+            self.rules.sort(key=lambda rule: rule.name)
+        
+        # 우선순위 버킷: 바뀐 Rules만 이동
+        for rule in previous:
+            self._unbucket(rule)
+        for rule in updated.values():
+            self._bucket(rule)
+        
+        # 유사 이름: 이름이 추가/삭제된 경우만 (내용 변경은 영향 없음)
+        if added or removed:
+            self._update_similar_names(added, set(removed))
+        
+        self._update_usage(updated, removed)
+        
+        # 충돌: 갱신된 버킷에서 재구성
+        always_apply = sorted(
+            entry["name"] for bucket in self.priority_map.values() for entry in bucket if entry["always_apply"]
+        )
+        priority_groups = {
+            priority: [entry["name"] for entry in bucket]
+            for priority, bucket in sorted(self.priority_map.items(), key=lambda item: item[1][0]["name"])
+        }
+        self.conflicts = self._build_conflicts(always_apply, priority_groups)
+    
+    def _bucket(self, rule: RuleRecord):
+        """우선순위 맵에 Rule 추가 (버킷 내 이름순)"""
+        bucket = self.priority_map.get(rule.priority)
+        if bucket is None:
+            self.priority_map[rule.priority] = [self._priority_entry(rule)]
+            self.priority_map = dict(sorted(self.priority_map.items()))
+            return
+        names = [entry["name"] for entry in bucket]
+        bucket.insert(bisect.bisect_left(names, rule.name), self._priority_entry(rule))
+    
+    def _unbucket(self, rule: RuleRecord):
+        """우선순위 맵에서 Rule 제거 (빈 버킷은 삭제)"""
+        bucket = self.priority_map.get(rule.priority, [])
+        bucket[:] = [entry for entry in bucket if entry["name"] != rule.name]
+        if not bucket:
+            self.priority_map.pop(rule.priority, None)
+    
+    def _update_similar_names(self, added: List[str], removed: set):
+        """삭제된 이름의 쌍 제거, 추가된 이름만 전체 이름과 비교"""
+        pairs = [pair for pair in self.similar_names if pair[0] not in removed and pair[1] not in removed]
+        if added:
+            names = [rule.name for rule in self.rules]
+            index = {name: i for i, name in enumerate(names)}
+            name_tokens = [self._name_tokens(name) for name in names]
+            for i, j, similarity in similar_to(name_tokens, [index[name] for name in added], SIMILAR_NAME_THRESHOLD):
+                pairs.append((names[i], names[j], similarity))
+            pairs.sort()
+        self.similar_names = pairs
+    
+    def _update_usage(self, updated: Dict[str, RuleRecord], removed: List[str]):
+        """바뀐 Rules의 사용 항목만 재계산 (나머지는 저장된 mtime으로 경과 일수만 갱신)"""
+        now = time.time()
+        fresh = set()
+        for name in removed:
+            self.usage_stats.pop(name, None)
+        
+        reorder = False
+        for name, rule in updated.items():
+            if rule.error is not None:
+                self.usage_stats.pop(name, None)
+                continue
+            reorder = reorder or name not in self.usage_stats
+            self.usage_stats[name] = self._usage_entry(rule, now)
+            fresh.add(name)
+        
+        # 경과 일수는 시간이 지나면 바뀌므로 파일 I/O 없이 산술로만 갱신
+        for rule in self.rules:
+            entry = self.usage_stats.get(rule.name)
+            if entry is None or rule.name in fresh:
+                continue
+            days_old = rule.days_old(now)
+            entry["days_old"] = days_old
+            entry["estimated"] = self._estimate_usage(days_old)
+        
+        if reorder:
+            self.usage_stats = dict(sorted(self.usage_stats.items()))
 
 def main():
     """메인 실행"""
-    print("🔍 Cursor Rules 진단 시작...\n")
-    
-    manager = RulesManager()
+    import argparse
     
-    print(f"📁 Rules 디렉토리: {RULES_DIR}")
-    print(f"📊 발견된 Rules: {len(manager.rules)}개\n")
+    parser = argparse.ArgumentParser(description="Cursor Rules 진단")
+    parser.add_argument("--jobs", type=int, default=1, help="콜드 스캔 병렬 작업 수 (0 = CPU 코어 수)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="이전 진단 결과 + 지문 저널로 추가/변경/삭제된 Rules만 반영")
+    args = parser.parse_args()
     
-    # 충돌 감지
-    print("⚙️  충돌 감지 중...")
-    manager.detect_conflicts()
+    print("🔍 Cursor Rules 진단 시작...\n")
     
-    # 사용 분석
-    print("📊 사용 분석 중...")
-    manager.analyze_usage()
+    manager = RulesManager.from_journal(jobs=resolve_jobs(args.jobs)) if args.incremental else None
     
-    # Priority 맵
-    print("🎯 우선순위 분석 중...\n")
-    manager.generate_priority_map()
+    if manager is not None:
+        changes = manager.changes
+        print(f"📁 Rules 디렉토리: {RULES_DIR}")
+        print(f"📊 발견된 Rules: {len(manager.rules)}개")
+        print(f"🔁 증분 진단: 추가 {len(changes['added'])}개, 변경 {len(changes['changed'])}개, "
+              f"삭제 {len(changes['removed'])}개\n")
+    else:
+        if args.incremental:
+            print("ℹ️ 이전 진단 상태가 없어 전체 진단을 실행합니다.\n")
+        manager = RulesManager(jobs=resolve_jobs(args.jobs))
+        
+        print(f"📁 Rules 디렉토리: {RULES_DIR}")
+        print(f"📊 발견된 Rules: {len(manager.rules)}개\n")
+        
+        # 충돌 감지
+        print("⚙️  충돌 감지 중...")
+        manager.detect_conflicts()
+        
+        # 사용 분석
+        print("📊 사용 분석 중...")
+        manager.analyze_usage()
+        
+        # Priority 맵
+        print("🎯 우선순위 분석 중...\n")
+        manager.generate_priority_map()
     
     # 리포트 생성
     report = manager.generate_report()
@@ -352,6 +565,7 @@ def main():
     
     # JSON 저장
     json_path = manager.export_to_json(str(report_path.parent / "rules_analysis.json"))
+    manager.save_journal(json_path)
     
     print(f"\n💾 리포트 저장: {report_path}")
     print(f"💾 JSON 저장: {json_path}")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 프론트매터 일괄 편집 (트랜잭션)
+
+- 파일별로 계획된 변경(key 설정/삭제)을 모아 두었다가 파일당 한 번 읽고 한 번 씀
+- 변경은 프론트매터 줄에만 적용 (본문의 같은 문자열은 건드리지 않음, 나머지 줄/순서/주석/개행 방식 유지)
+- 적용 단계
+  1. 준비: 읽기 → 재작성 → 같은 디렉토리 임시 파일에 쓰기 (파일별 독립, jobs > 1 이면 병렬)
+  2. 검증: 읽은 뒤 다른 곳에서 바뀐 파일이 있으면(지문 비교) 전체 취소
+     (expect_hash로 계획 시점 내용 해시도 확인 가능)
+  3. 커밋: 임시 파일 → 원자적 교체, 도중 실패 시 이미 교체한 파일을 원본으로 되돌림
+- 하나라도 실패하면 아무 파일도 바뀌지 않음 (전부 커밋 또는 전부 롤백)
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rules_frontmatter import DELIMITER, split_header_lines
+from rules_parallel import map_io
+
+TMP_SUFFIX = ".edit.tmp"
+
+_BOM = "\ufeff"
+_KEY_RE = re.compile(r'^([^\s#:-][^:]*):(.*)$')
+
+# 삭제 표시 (set 값으로 None은 허용하지 않음)
+DELETE = object()
+
+
+def format_value(value) -> str:
+    """Python 값 → 프론트매터 원문 (bool/int/list/str)"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(format_value(str(item)) for item in value) + "]"
+    value = str(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return value
+
+
+def _segments(lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+    """프론트매터 줄 → [(key 또는 None, 줄 목록)] (블록 리스트/들여쓴 줄은 앞 key에 속함)"""
+    segments = []
+    for line in lines:
+        stripped = line.strip()
+        belongs = segments and segments[-1][0] is not None and (
+            line[:1] in (' ', '\t') or stripped == '-' or stripped.startswith('- ')
+        )
+        if belongs:
+            segments[-1][1].append(line)
+            continue
+        match = _KEY_RE.match(line) if stripped and not stripped.startswith('#') else None
+        segments.append((match.group(1).strip() if match else None, [line]))
+    return segments
+
+
+def rewrite_front_matter(content: str, changes: Dict[str, Tuple[object, Optional[str]]]) -> str:
+    """
+    프론트매터만 재작성
+
+    Args:
+        content: 파일 내용
+        changes: {key: (값 또는 DELETE, 새 key를 넣을 위치 - 이 key 다음 줄, None이면 끝)}
+
+    Returns:
+        새 파일 내용 (변경이 없으면 content 그대로)
+    """
+    bom = _BOM if content.startswith(_BOM) else ""
+    text = content[len(bom):]
+    lines, body = split_header_lines(text)
+    newline = "\r\n" if text[:text.find("\n") + 1].endswith("\r\n") else "\n"
+    if lines is None:
+        lines, body = [], text
+    lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+
+    segments = _segments(lines)
+    pending = dict(changes)
+    result = []
+    for key, segment_lines in segments:
+        if key in changes:
+            value, _ = changes[key]
+            if key in pending and value is not DELETE:
+                result.append((key, [f"{key}: {format_value(value)}"]))
+            pending.pop(key, None)  # 중복 key는 첫 줄만 남기고 제거
+            continue
+        result.append((key, segment_lines))
+
+    # 새 key: 지정한 key 다음 (없으면 끝)
+    for key, (value, after) in pending.items():
+        if value is DELETE:
+            continue
+        position = len(result)
+        for i, (existing, _) in enumerate(result):
+            if after is not None and existing == after:
+                position = i + 1
+        result.insert(position, (key, [f"{key}: {format_value(value)}"]))
+
+    new_lines = [line for _, segment_lines in result for line in segment_lines]
+    if new_lines == lines:
+        return content
+    header = newline.join([DELIMITER] + new_lines + [DELIMITER]) + newline
+    return bom + header + body
+
+
+class FrontMatterBatch:
+    """파일별 프론트매터 변경 계획 + 트랜잭션 적용"""
+
+    def __init__(self, rules_dir: Path):
+        self.rules_dir = Path(rules_dir)
+        self._changes = {}  # {name: {key: (값, after)}}
+        self._expected = {}  # {name: 읽은 내용의 SHA-256} - 계획 이후 바뀐 파일 감지
+
+    def set(self, name: str, key: str, value, after: Optional[str] = None):
+        """key 설정 (없으면 after 다음 줄에 추가)"""
+        self._changes.setdefault(name, {})[key] = (value, after)
+
+    def delete(self, name: str, key: str):
+        """key 삭제"""
+        self._changes.setdefault(name, {})[key] = (DELETE, None)
+
+    def expect_hash(self, name: str, digest: str):
+        """읽은 파일 내용의 SHA-256이 digest와 다르면 적용 실패 (배치 전체 롤백)"""
+        self._expected[name] = digest
+
+    def names(self) -> List[str]:
+        """변경 예정 파일 (이름순)"""
+        return sorted(self._changes)
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def _prepare(self, name: str, write: bool) -> Dict:
+        """읽기 → 재작성 → 임시 파일 (파일별 독립이므로 병렬 실행 가능)"""
+        path = self.rules_dir / name
+        item = {"name": name, "path": path, "tmp": None, "error": None, "changed": False}
+        try:
+            st = path.stat()
+            original = path.read_bytes()
+            item["fingerprint"] = (st.st_mtime_ns, st.st_size)
+            item["original"] = original
+            item["atime_ns"] = st.st_atime_ns
+            expected = self._expected.get(name)
+            if expected is not None and hashlib.sha256(original).hexdigest() != expected:
+                item["error"] = "계획 이후 내용이 바뀌었습니다 (해시 불일치)"
+                return item
+            content = original.decode('utf-8')
+            new_content = rewrite_front_matter(content, self._changes[name])
+            if new_content == content:
+                return item
+            item["changed"] = True
+            if write:
+                tmp_path = path.with_name(name + TMP_SUFFIX)
+                with open(tmp_path, 'wb') as f:
+                    f.write(new_content.encode('utf-8'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                item["tmp"] = tmp_path
+        except (OSError, UnicodeDecodeError) as e:
+            item["error"] = str(e)
+        return item
+
+    def apply(self, dry_run: bool = False, jobs: int = 1) -> Dict:
+        """
+        모든 변경 적용 (전부 커밋 또는 전부 롤백)
+
+        Returns:
+            {'committed': bool, 'changed': [...], 'unchanged': [...], 'failed': {name: 오류}}
+        """
+        items = map_io(lambda name: self._prepare(name, not dry_run), self.names(), jobs)
+        result = {
+            "committed": False,
+            "changed": [item["name"] for item in items if item["changed"]],
+            "unchanged": [item["name"] for item in items if not item["changed"] and not item["error"]],
+            "failed": {item["name"]: item["error"] for item in items if item["error"]},
+        }
+        if dry_run:
+            return result
+
+        pending = [item for item in items if item["tmp"] is not None]
+        if not result["failed"]:
+            # 읽은 뒤 다른 곳에서 수정된 파일이 있으면 전체 취소
+            for item in pending:
+                try:
+                    st = item["path"].stat()
+                    current = (st.st_mtime_ns, st.st_size)
+                except OSError as e:
+                    current = str(e)
+                if current != item["fingerprint"]:
+                    result["failed"][item["name"]] = "읽은 뒤 파일이 변경되었습니다"
+        if result["failed"]:
+            self._discard(pending)
+            return result
+
+        committed = []
+        try:
+            for item in pending:
+                os.replace(item["tmp"], item["path"])
+                committed.append(item)
+        except OSError as e:
+            result["failed"][item["name"]] = str(e)
+            self._discard(pending)
+            self._rollback(committed)
+            return result
+
+        result["committed"] = True
+        return result
+
+    @staticmethod
+    def _discard(items: List[Dict]):
+        """남은 임시 파일 삭제"""
+        for item in items:
+            try:
+                item["tmp"].unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _rollback(items: List[Dict]):
+        """이미 교체한 파일을 원본 내용/mtime으로 되돌림"""
+        for item in items:
+            tmp_path = item["path"].with_name(item["name"] + TMP_SUFFIX)
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(item["original"])
+                mtime_ns = item["fingerprint"][0]
+                os.utime(tmp_path, ns=(item["atime_ns"], mtime_ns))
+                os.replace(tmp_path, item["path"])
+            except OSError as e:
+                print(f"  ⚠️ 롤백 실패: {item['name']} - {e}")
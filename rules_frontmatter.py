@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 프론트매터 파서 (공유)
+
+- 파일에서 헤더 바이트만 읽음 (닫는 '---' 줄에서 중단, 본문 미로드)
+- YAML 부분집합: 최상위 `key: value`, 따옴표 문자열, 주석,
+  인라인 리스트 `[a, "b"]`, 블록 리스트 (`- item`)
+- 원문 값(raw) + 타입이 지정된 __slots__ 레코드(FrontMatter)
+"""
+
+import codecs
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DELIMITER = "---"
+MAX_HEADER_BYTES = 1 << 20  # 닫는 구분자 없이 이보다 길면 프론트매터 없음으로 간주
+HEADER_CHUNK_BYTES = 4096  # 첫 읽기 크기 (헤더가 더 길면 두 배씩 추가로 읽음)
+
+TRUE_VALUES = ("true", "1", "yes")
+FALSE_VALUES = ("false", "0", "no")
+
+_BOM = "\ufeff"
+_FLOW_ITEM_RE = re.compile(r'\s*("[^"]*"|\'[^\']*\'|[^,]+)')
+
+_NO_FRONT_MATTER = -1
+_UNTERMINATED = -2
+
+
+def _scalar(value: str) -> str:
+    """스칼라 값 원문 (따옴표 제거, 따옴표 없는 값은 ' #' 이후 주석 제거)"""
+    value = value.strip()
+    if value[:1] in ('"', "'"):
+        end = value.rfind(value[0])
+        if end > 0:
+            return value[1:end]
+    elif ' #' in value:
+        value = value.split(' #', 1)[0].rstrip()
+    return value.strip('"').strip("'")
+
+
+def parse_header_lines(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    프론트매터 줄 목록 → {key: 원문 값}
+
+    블록 리스트(`key:` 다음 `- item` 줄들)는 JSON 리스트 문자열로 정규화한다.
+    """
+    raw = {}
+    list_key = None
+    items = []
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        if list_key is not None and (stripped == '-' or stripped.startswith('- ')):
+            items.append(_scalar(stripped[1:]))
+            continue
+        if list_key is not None:
+            if items:
+                raw[list_key] = json.dumps(items, ensure_ascii=False)
+            list_key, items = None, []
+
+        # 들여쓴 줄(중첩 매핑)과 ':' 없는 줄은 무시
+        if line[:1] in (' ', '\t') or ':' not in line:
+            continue
+
+        key, value = line.split(':', 1)
+        key = key.strip()
+        raw[key] = _scalar(value)
+        if raw[key] == '':
+            list_key = key
+
+    if list_key is not None and items:
+        raw[list_key] = json.dumps(items, ensure_ascii=False)
+    return raw
+
+
+def parse_list(value: Optional[str]) -> List[str]:
+    """tags/globs 원문 값 → 리스트 ('[...]' 흐름 리스트 또는 단일 값)"""
+    if value is None:
+        return []
+    value = value.strip()
+    if not value:
+        return []
+    if not value.startswith('['):
+        return [value]
+    # 흐름 리스트: ["a", 'b', c] (따옴표 안의 ',' 유지)
+    inner = value[1:-1] if value.endswith(']') else value[1:]
+    return [_scalar(item) for item in _FLOW_ITEM_RE.findall(inner) if item.strip()]
+
+
+def parse_priority(value: Optional[str]) -> Optional[int]:
+    """priority 원문 값 → 0 이상 정수 (없거나 숫자가 아니면 None)"""
+    if value is None:
+        return None
+    value = value.strip()
+    return int(value) if value.isdigit() else None
+
+
+def parse_bool(value: Optional[str]) -> Optional[bool]:
+    """불리언 원문 값 → True/False (없거나 인식 불가면 None)"""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    return None
+
+
+class FrontMatter:
+    """타입이 지정된 프론트매터 레코드
+
+    priority / always_apply 가 None이면 미지정(또는 해석 불가)이며,
+    기본값은 각 도구가 정한다.
+    """
+
+    __slots__ = ("raw", "description", "priority", "always_apply", "type", "tags", "globs")
+
+    def __init__(self, raw: Optional[Dict[str, str]] = None):
+        raw = raw or {}
+        self.raw = raw
+        self.description = raw.get("description", "")
+        self.priority = parse_priority(raw.get("priority"))
+        self.always_apply = parse_bool(raw.get("alwaysApply"))
+        self.type = raw.get("type") or None
+        self.tags = parse_list(raw.get("tags"))
+        self.globs = parse_list(raw.get("globs"))
+
+    def get(self, key: str, default=None):
+        """원문 값 조회"""
+        return self.raw.get(key, default)
+
+    def __repr__(self) -> str:
+        return (f"FrontMatter(priority={self.priority!r}, always_apply={self.always_apply!r}, "
+                f"type={self.type!r}, tags={self.tags!r}, globs={self.globs!r})")
+
+
+def _scan_header(text: str, complete: bool = True) -> Tuple[Optional[List[str]], int]:
+    """
+    프론트매터 줄 목록과 본문 시작 위치
+
+    Returns:
+        (줄 목록, 본문 시작 인덱스) - 프론트매터가 없으면 (None, _NO_FRONT_MATTER),
+        complete=False이고 닫는 구분자를 아직 못 찾았으면 (None, _UNTERMINATED)
+    """
+    if not text.startswith(DELIMITER):
+        return None, _NO_FRONT_MATTER
+
+    lines = []
+    pos = 0
+    while pos <= MAX_HEADER_BYTES:
+        end = text.find('\n', pos)
+        if end < 0 and not complete:
+            return None, _UNTERMINATED
+        line = text[pos:end] if end >= 0 else text[pos:]
+        if pos == 0:
+            if line.rstrip() != DELIMITER:
+                return None, _NO_FRONT_MATTER
+        elif line.rstrip() == DELIMITER:
+            return lines, (end + 1 if end >= 0 else len(text))
+        else:
+            lines.append(line)
+        if end < 0:
+            break
+        pos = end + 1
+    return None, _NO_FRONT_MATTER
+
+
+def split_content(content: str) -> Tuple[Dict[str, str], str]:
+    """파일 내용 → ({key: 원문 값}, 본문)"""
+    text = content[1:] if content.startswith(_BOM) else content
+    lines, body_start = _scan_header(text)
+    if lines is None:
+        return {}, content
+    return parse_header_lines(lines), text[body_start:]
+
+
+def split_header_lines(content: str) -> Tuple[Optional[List[str]], str]:
+    """파일 내용(BOM 제외) → (프론트매터 원문 줄 목록, 본문) - 프론트매터가 없으면 (None, 내용)"""
+    lines, body_start = _scan_header(content)
+    if lines is None:
+        return None, content
+    return lines, content[body_start:]
+
+
+def read_header(rule_file: Path) -> Dict[str, str]:
+    """파일에서 프론트매터 바이트만 읽어 {key: 원문 값} 반환"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    text = ""
+    size = HEADER_CHUNK_BYTES
+    with open(rule_file, 'rb') as f:
+        while True:
+            chunk = f.read(size)
+            text += decoder.decode(chunk, final=not chunk)
+            lines, status = _scan_header(text, complete=not chunk)
+            if lines is not None:
+                return parse_header_lines(lines)
+            if status != _UNTERMINATED or len(text) > MAX_HEADER_BYTES:
+                return {}
+            size *= 2
+
+
+def read_front_matter(rule_file: Path) -> FrontMatter:
+    """파일 프론트매터 → FrontMatter (헤더만 읽음)"""
+    return FrontMatter(read_header(rule_file))
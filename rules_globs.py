@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules globs 적용 판정 엔진
+
+- 프론트매터 globs를 한 번만 컴파일 (중괄호 확장 → 정규식, 같은 glob은 Rules 간 공유)
+- 경로마다 모든 glob을 fnmatch로 돌리는 대신 색인으로 후보 glob만 추림
+  - 리터럴 디렉토리 접두사 트라이 ('scripts/**', 'src/components/*.tsx')
+  - 확장자 색인 ('**/*.py', '*.{ts,tsx}')
+  - 리터럴 디렉토리 세그먼트 색인 ('**/ssh/**')
+  - 정확한 경로 ('docs/README.md')
+- 후보 glob만 정규식으로 최종 확인
+
+glob 규칙: '**'는 0개 이상의 디렉토리, '*'/'?'/'[...]'는 한 세그먼트 안에서만 일치,
+'/'가 없는 패턴('*.py')은 어느 깊이에서나 파일 이름과 비교한다.
+"""
+
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rules_bundle import open_bundle
+from rules_corpus import RulesCorpus
+from rules_frontmatter import FrontMatter
+
+WORKSPACE = Path(__file__).parent.parent
+RULES_DIR = WORKSPACE / ".cursor" / "rules"
+
+_WILDCARD_RE = re.compile(r'[*?\[]')
+_BRACE_RE = re.compile(r'\{([^{}]*)\}')
+
+
+def split_globs(values: Iterable[str]) -> List[str]:
+    """globs 값 목록 → 개별 패턴 ('a, b' 쉼표 구분도 허용, 중괄호 안 쉼표는 유지)"""
+    patterns = []
+    for value in values:
+        depth = 0
+        start = 0
+        for i, ch in enumerate(value):
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth = max(0, depth - 1)
+            elif ch == ',' and depth == 0:
+                patterns.append(value[start:i])
+                start = i + 1
+        patterns.append(value[start:])
+    return [p.strip().strip('"\'').strip() for p in patterns if p.strip().strip('"\'').strip()]
+
+
+def expand_braces(pattern: str) -> List[str]:
+    """'*.{ts,tsx}' → ['*.ts', '*.tsx'] (중첩은 안쪽부터 확장)"""
+    match = _BRACE_RE.search(pattern)
+    if match is None:
+        return [pattern]
+    head, tail = pattern[:match.start()], pattern[match.end():]
+    result = []
+    for option in match.group(1).split(','):
+        result.extend(expand_braces(head + option + tail))
+    return result
+
+
+def normalize_path(path: str) -> str:
+    """경로 → 워크스페이스 상대 POSIX 형태 ('\\\\' → '/', 앞의 './' '/' 제거)"""
+    path = path.replace('\\', '/')
+    while path.startswith('./'):
+        path = path[2:]
+    return path.lstrip('/')
+
+
+def _segment_regex(segment: str) -> str:
+    """세그먼트 하나 → 정규식 ('/'를 넘지 않음)"""
+    out = []
+    i = 0
+    while i < len(segment):
+        ch = segment[i]
+        if ch == '*':
+            out.append('[^/]*')
+        elif ch == '?':
+            out.append('[^/]')
+        elif ch == '[':
+            end = segment.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = segment[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return ''.join(out)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """중괄호 없는 glob → 전체 일치 정규식"""
+    pattern = normalize_path(pattern)
+    if '/' not in pattern:
+        pattern = '**/' + pattern  # 어느 깊이의 파일 이름과도 비교
+    segments = pattern.split('/')
+    parts = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            parts.append('.*' if last else '(?:[^/]+/)*')
+        else:
+            parts.append(_segment_regex(segment) + ('' if last else '/'))
+    return ''.join(parts)
+
+
+def _glob_keys(pattern: str) -> Tuple[str, Tuple]:
+    """
+    후보 색인 키 (가장 선택적인 것 하나)
+
+    Returns:
+        ('exact', (경로,)) / ('name', (파일 이름,)) / ('prefix', (세그먼트...)) /
+        ('ext', ('.py',)) / ('segment', (세그먼트,)) / ('any', ())
+    """
+    pattern = normalize_path(pattern)
+    if not _WILDCARD_RE.search(pattern):
+        return ('exact', (pattern,)) if '/' in pattern else ('name', (pattern,))
+    segments = pattern.split('/')
+    if not _WILDCARD_RE.search(segments[-1]):
+        return 'name', (segments[-1],)  # '**/Makefile' 처럼 파일 이름이 고정
+    prefix = []
+    for segment in segments[:-1]:
+        if _WILDCARD_RE.search(segment):
+            break
+        prefix.append(segment)
+    if prefix and '/' in pattern:
+        return 'prefix', tuple(prefix)
+    name = segments[-1]
+    star = name.rfind('*')
+    if star != -1 and '.' in name[star:] and not _WILDCARD_RE.search(name[star + 1:]):
+        return 'ext', (name[name.rfind('.'):],)
+    for segment in segments[:-1]:
+        if segment != '**' and not _WILDCARD_RE.search(segment):
+            return 'segment', (segment,)
+    return 'any', ()
+
+
+def _extension(name: str) -> str:
+    """파일 이름의 마지막 확장자 ('.py', '.env' 같은 점 파일은 이름 전체, 없으면 '')"""
+    dot = name.rfind('.')
+    return name[dot:] if dot >= 0 else ''
+
+
+class GlobMatcher:
+    """Rules globs 일괄 매처 (컴파일 1회, 경로당 후보 glob만 확인)"""
+
+    def __init__(self, rule_globs: Dict[str, Iterable[str]]):
+        """
+        Args:
+            rule_globs: {rule 이름: [glob, ...]}
+        """
+        self._patterns: List[re.Pattern] = []
+        self._rules: List[List[str]] = []  # glob id → Rules
+        self._trie = {}  # 세그먼트 → (glob id 목록, 자식)
+        self._exact = defaultdict(list)  # 경로 → glob id
+        self._names = defaultdict(list)  # 파일 이름 → glob id (마지막 세그먼트가 리터럴)
+        self._ext = defaultdict(list)  # 확장자 → glob id
+        self._segment = defaultdict(list)  # 디렉토리 세그먼트 → glob id
+        self._any = []
+        self.rule_count = 0
+
+        ids = {}
+        for name, globs in rule_globs.items():
+            patterns = [p for glob in split_globs(globs) for p in expand_braces(glob)]
+            if patterns:
+                self.rule_count += 1
+            for pattern in patterns:
+                pattern = normalize_path(pattern)
+                if pattern not in ids:
+                    ids[pattern] = len(self._patterns)
+                    self._patterns.append(re.compile(glob_to_regex(pattern)))
+                    self._rules.append([])
+                    self._index(ids[pattern], pattern)
+                if name not in self._rules[ids[pattern]]:
+                    self._rules[ids[pattern]].append(name)
+        self.glob_count = len(self._patterns)
+
+    def _index(self, glob_id: int, pattern: str):
+        """glob을 후보 색인 하나에 등록"""
+        kind, key = _glob_keys(pattern)
+        if kind == 'exact':
+            self._exact[key[0]].append(glob_id)
+        elif kind == 'name':
+            self._names[key[0]].append(glob_id)
+        elif kind == 'prefix':
+            node = self._trie
+            for segment in key[:-1]:
+                node = node.setdefault(segment, ([], {}))[1]
+            node.setdefault(key[-1], ([], {}))[0].append(glob_id)
+        elif kind == 'ext':
+            self._ext[key[0]].append(glob_id)
+        elif kind == 'segment':
+            self._segment[key[0]].append(glob_id)
+        else:
+            self._any.append(glob_id)
+
+    def _candidates(self, path: str) -> Set[int]:
+        """경로에 일치할 수 있는 glob id (상위 집합)"""
+        segments = path.split('/')
+        name = segments[-1]
+        found = set(self._any)
+        found.update(self._exact.get(path, ()))
+        found.update(self._names.get(name, ()))
+        found.update(self._ext.get(_extension(name), ()))
+        node = self._trie
+        for segment in segments[:-1]:
+            entry = node.get(segment)
+            if entry is None:
+                break
+            found.update(entry[0])
+            node = entry[1]
+        for segment in set(segments[:-1]):
+            found.update(self._segment.get(segment, ()))
+        return found
+
+    def match(self, path: str) -> List[str]:
+        """경로에 적용되는 Rules (이름순)"""
+        path = normalize_path(path)
+        rules = set()
+        for glob_id in self._candidates(path):
+            if self._patterns[glob_id].fullmatch(path):
+                rules.update(self._rules[glob_id])
+        return sorted(rules)
+
+    def match_many(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """경로 목록 → {경로: 적용 Rules} (같은 디렉토리/확장자 반복이 많아도 경로당 후보만 확인)"""
+        return {path: self.match(path) for path in paths}
+
+
+def load_rule_globs(rules_dir: Path) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Rules 디렉토리 → (globs 있는 Rules {이름: globs}, alwaysApply Rules 이름 목록)
+
+    프론트매터는 최신 번들 또는 공유 코퍼스 캐시에서 읽음 (본문 미로드)
+    """
+    bundle = open_bundle(rules_dir)
+    if bundle is not None:
+        with bundle:
+            entries = bundle.entries()
+    else:
+        corpus = RulesCorpus(rules_dir)
+        try:
+            entries = corpus.refresh(headers_only=True)
+        finally:
+            corpus.close()
+    rule_globs = {}
+    always = []
+    for name, entry in entries.items():
+        if "error" in entry:
+            continue
+        front_matter = FrontMatter(entry["front_matter"])
+        if front_matter.always_apply:
+            always.append(name)
+        if front_matter.globs:
+            rule_globs[name] = front_matter.globs
+    return rule_globs, always
+
+
+def applicable_rules(paths: Iterable[str], rules_dir: Optional[Path] = None,
+                     include_always: bool = True) -> Dict[str, List[str]]:
+    """
+    파일 경로별 적용 Rules
+
+    Args:
+        paths: 워크스페이스 상대 경로 목록 (예: 변경 파일 목록)
+        rules_dir: Rules 디렉토리 (None이면 .cursor/rules)
+        include_always: alwaysApply Rules도 모든 경로에 포함
+
+    Returns:
+        {경로: [rule 이름, ...]} (이름순)
+    """
+    rule_globs, always = load_rule_globs(rules_dir or RULES_DIR)
+    result = GlobMatcher(rule_globs).match_many(paths)
+    return _with_always(result, always) if include_always else result
+
+
+def _with_always(result: Dict[str, List[str]], always: List[str]) -> Dict[str, List[str]]:
+    """경로별 결과에 alwaysApply Rules 합치기"""
+    if always:
+        for path, rules in result.items():
+            result[path] = sorted(set(rules).union(always))
+    return result
+
+
+def main():
+    """메인 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="파일 경로별 적용 Rules (globs 판정)")
+    parser.add_argument("paths", nargs="*", help="워크스페이스 상대 경로")
+    parser.add_argument("--from-file", help="경로 목록 파일 (한 줄에 하나, '-'면 표준 입력)")
+    parser.add_argument("--no-always", action="store_true", help="alwaysApply Rules 제외 (globs 일치만)")
+    parser.add_argument("--summary", action="store_true", help="경로별 목록 대신 Rules별 일치 파일 수만 출력")
+    args = parser.parse_args()
+
+    paths = list(args.paths)
+    if args.from_file:
+        source = sys.stdin if args.from_file == '-' else open(args.from_file, 'r', encoding='utf-8')
+        with source:
+            paths.extend(line.strip() for line in source if line.strip())
+    if not paths:
+        parser.error("경로를 지정하세요 (인자 또는 --from-file)")
+
+    rule_globs, always = load_rule_globs(RULES_DIR)
+    matcher = GlobMatcher(rule_globs)
+    result = matcher.match_many(paths)
+    if not args.no_always:
+        result = _with_always(result, always)
+
+    print(f"📐 globs {matcher.glob_count}개 (Rules {matcher.rule_count}개), "
+          f"alwaysApply {len(always)}개{' 제외' if args.no_always else ''}, 경로 {len(paths):,}개")
+    if args.summary:
+        counts = defaultdict(int)
+        for rules in result.values():
+            for rule in rules:
+                counts[rule] += 1
+        for rule, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  {count:>8,}  {rule}")
+        return
+    for path, rules in result.items():
+        print(f"{path}: {', '.join(rules) if rules else '-'}")
+
+
+if __name__ == "__main__":
+    main()
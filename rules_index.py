@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 역색인 (검색용)
+
+- (필드, 토큰) → Rules id 포스팅 (filename / description / tags / body 필드 분리)
+- 포스팅은 토큰당 한 행 (id/tf 배열을 BLOB으로 압축 저장)
+- 코퍼스 캐시와 같은 SQLite 파일에 저장
+- 코퍼스 지문과 비교해 변경된 Rules만 증분 재색인
+- BM25F 랭킹 (필드 가중치 + priority 보정, top-k 힙 선택)
+"""
+
+import heapq
+import json
+import math
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rules_corpus import RulesCorpus
+from rules_frontmatter import parse_priority as _parse_priority
+from rules_tokens import text_tokens, word_tokens
+
+INDEX_VERSION = 4  # 4: 한국어 인식 토큰 (어간 + 음절 바이그램)
+META_FIELDS = ("filename", "description", "tags")
+INDEX_FIELDS = META_FIELDS + ("body",)
+
+# BM25F 파라미터
+FIELD_BOOSTS = {"filename": 3.0, "tags": 2.5, "description": 2.0, "body": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+PRIORITY_WEIGHT = 0.5  # priority 0 → 점수 x1.5, priority 10 → x1.0
+DEFAULT_PRIORITY = 10
+
+def index_tokens(text: str) -> List[str]:
+    """색인용 토큰 (소문자 \\w+ 단위 + 한글 어간/음절 바이그램, 중복 포함)"""
+    return text_tokens(text)
+
+
+def field_texts(name: str, front_matter: Dict[str, str], body: str) -> Dict[str, str]:
+    """Rule → 필드별 텍스트"""
+    return {
+        "filename": Path(name).stem,
+        "description": front_matter.get("description", ""),
+        "tags": front_matter.get("tags", ""),
+        "body": body,
+    }
+
+
+def parse_priority(value: str) -> int:
+    """프론트매터 priority 원문 → 정수 (숫자가 아니면 기본값)"""
+    priority = _parse_priority(value)
+    return DEFAULT_PRIORITY if priority is None else priority
+
+
+class _Posting:
+    """포스팅 목록 편집 버퍼 (id/tf 배열 + 삭제 예정 id)"""
+
+    __slots__ = ("ids", "tfs", "removed")
+
+    def __init__(self, ids: array, tfs: array):
+        self.ids = ids
+        self.tfs = tfs
+        self.removed = set()
+
+    def pack(self) -> Tuple[bytes, bytes]:
+        """삭제 반영 후 BLOB으로 직렬화"""
+        if self.removed:
+            kept = [(i, tf) for i, tf in zip(self.ids, self.tfs) if i not in self.removed]
+            self.ids = array('I', (i for i, _ in kept))
+            self.tfs = array('I', (tf for _, tf in kept))
+            self.removed = set()
+        return self.ids.tobytes(), self.tfs.tobytes()
+
+
+class RulesIndex:
+    """코퍼스 캐시 기반 영구 역색인"""
+
+    def __init__(self, rules_dir: Path, db_path: Optional[Path] = None, resident: bool = False):
+        self.rules_dir = Path(rules_dir)
+        self.corpus = RulesCorpus(self.rules_dir, db_path)
+        self._conn = self.corpus.conn
+        self.stats = {"indexed": 0, "removed": 0}
+        # 연결을 오래 유지하는 경우(데몬)를 위한 메모리 캐시 - 재색인 시 무효화
+        self.resident = resident  # True면 문서 테이블(이름/프론트매터/길이)을 메모리에 상주
+        self._vocabulary = {}
+        self._collection = None
+        self._docs = None
+        self._version = None
+        self._init_schema()
+
+    def _init_schema(self):
+        """색인 테이블 생성 (버전이 다르면 재색인)"""
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(INDEX_VERSION):
+            conn.execute("DROP TABLE IF EXISTS index_docs")
+            conn.execute("DROP TABLE IF EXISTS postings")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS index_docs (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                front_matter TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                len_filename INTEGER NOT NULL,
+                len_description INTEGER NOT NULL,
+                len_tags INTEGER NOT NULL,
+                len_body INTEGER NOT NULL,
+                priority INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                field TEXT NOT NULL,
+                token TEXT NOT NULL,
+                ids BLOB NOT NULL,
+                tfs BLOB NOT NULL,
+                PRIMARY KEY (field, token)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("INSERT OR REPLACE INTO index_meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+        conn.commit()
+
+    def close(self):
+        """DB 연결 종료"""
+        self.corpus.close()
+
+    def update(self) -> Dict[str, int]:
+        """코퍼스 동기화 후 변경된 Rules만 재색인 (읽기 실패한 Rules는 경고 후 색인에서 제외)"""
+        for entry in self.corpus.sync().values():
+            if "error" in entry:
+                print(f"⚠️ 파일 읽기 실패: {entry['path']} - {entry['error']}")
+        conn = self._conn
+        self.stats = {"indexed": 0, "removed": 0}
+
+        removed = conn.execute(
+            "SELECT id, terms FROM index_docs WHERE name NOT IN (SELECT name FROM rules)"
+        ).fetchall()
+        stale = conn.execute(
+            """
+            SELECT r.name, r.mtime_ns, r.size, r.front_matter, r.body, d.id, d.terms
+            FROM rules r LEFT JOIN index_docs d ON d.name = r.name
+            WHERE d.name IS NULL OR d.mtime_ns != r.mtime_ns OR d.size != r.size
+            """
+        ).fetchall()
+        if not removed and not stale:
+            return self.stats
+        self._vocabulary.clear()
+        self._collection = None
+        self._docs = None
+
+        postings = {}
+
+        def posting(field: str, token: str) -> _Posting:
+            key = (field, token)
+            if key not in postings:
+                row = conn.execute(
+                    "SELECT ids, tfs FROM postings WHERE field = ? AND token = ?", key
+                ).fetchone()
+                ids, tfs = array('I'), array('I')
+                if row:
+                    ids.frombytes(row[0])
+                    tfs.frombytes(row[1])
+                postings[key] = _Posting(ids, tfs)
+            return postings[key]
+
+        # 기존 포스팅에서 제거
+        old_docs = [(doc_id, terms) for doc_id, terms in removed]
+        old_docs += [(row[5], row[6]) for row in stale if row[5] is not None]
+        for doc_id, terms in old_docs:
+            for field, tokens in json.loads(terms).items():
+                for token in tokens:
+                    posting(field, token).removed.add(doc_id)
+        conn.executemany("DELETE FROM index_docs WHERE id = ?", [(doc_id,) for doc_id, _ in removed])
+
+        # 변경/추가된 Rules 색인
+        for name, mtime_ns, size, front_matter, body, doc_id, _ in stale:
+            front_matter = json.loads(front_matter)
+            counts = {
+                field: Counter(index_tokens(text))
+                for field, text in field_texts(name, front_matter, body).items()
+            }
+            row = (
+                name, mtime_ns, size, json.dumps(front_matter, ensure_ascii=False),
+                json.dumps({field: list(c) for field, c in counts.items()}, ensure_ascii=False),
+                *(sum(counts[field].values()) for field in INDEX_FIELDS),
+                parse_priority(front_matter.get("priority", "")),
+            )
+            if doc_id is None:
+                doc_id = conn.execute(
+                    "INSERT INTO index_docs (name, mtime_ns, size, front_matter, terms, "
+                    "len_filename, len_description, len_tags, len_body, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row
+                ).lastrowid
+            else:
+                conn.execute(
+                    "UPDATE index_docs SET name = ?, mtime_ns = ?, size = ?, front_matter = ?, terms = ?, "
+                    "len_filename = ?, len_description = ?, len_tags = ?, len_body = ?, priority = ? WHERE id = ?",
+                    row + (doc_id,)
+                )
+            for field, c in counts.items():
+                for token, tf in c.items():
+                    p = posting(field, token)
+                    if doc_id in p.removed:
+                        p.pack()
+                    p.ids.append(doc_id)
+                    p.tfs.append(tf)
+
+        # 포스팅 기록
+        upserts, deletes = [], []
+        for (field, token), p in postings.items():
+            ids, tfs = p.pack()
+            if ids:
+                upserts.append((field, token, ids, tfs))
+            else:
+                deletes.append((field, token))
+        conn.executemany("DELETE FROM postings WHERE field = ? AND token = ?", deletes)
+        conn.executemany("INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?)", upserts)
+        version = time.time_ns()
+        conn.execute("INSERT OR REPLACE INTO index_meta VALUES ('corpus_version', ?)", (str(version),))
+        conn.commit()
+        self._version = version
+
+        self.stats["indexed"] = len(stale)
+        self.stats["removed"] = len(removed)
+        return self.stats
+
+    @property
+    def version(self) -> int:
+        """
+        코퍼스 버전 스탬프 (Rules가 바뀌어 재색인할 때마다 갱신, DB에 영구 저장)
+
+        재색인 시각(ns)을 쓰므로 같은 DB를 여는 다른 프로세스/인스턴스 사이에서도,
+        메모리 DB로 대체된 경우에도 이전 버전과 겹치지 않는다.
+        """
+        if self._version is None:
+            row = self._conn.execute("SELECT value FROM index_meta WHERE key = 'corpus_version'").fetchone()
+            self._version = int(row[0]) if row else 0
+        return self._version
+
+    def postings(self, field: str, tokens: Iterable[str]) -> Dict[str, Dict[int, int]]:
+        """필드의 토큰별 포스팅 {token: {id: tf}}"""
+        result = {}
+        tokens = list(tokens)
+        for i in range(0, len(tokens), 500):
+            chunk = tokens[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for token, ids_blob, tfs_blob in self._conn.execute(
+                f"SELECT token, ids, tfs FROM postings WHERE field = ? AND token IN ({placeholders})",
+                [field] + chunk
+            ):
+                ids, tfs = array('I'), array('I')
+                ids.frombytes(ids_blob)
+                tfs.frombytes(tfs_blob)
+                result[token] = dict(zip(ids, tfs))
+        return result
+
+    def vocabulary(self, fields: Iterable[str] = META_FIELDS) -> List[str]:
+        """필드 어휘 (중복 제거, 재색인 전까지 캐시)"""
+        fields = tuple(fields)
+        if fields not in self._vocabulary:
+            placeholders = ','.join('?' * len(fields))
+            self._vocabulary[fields] = [
+                token for (token,) in self._conn.execute(
+                    f"SELECT DISTINCT token FROM postings WHERE field IN ({placeholders})", fields
+                )
+            ]
+        return self._vocabulary[fields]
+
+    def candidates(self, keywords: Iterable[str]) -> Set[int]:
+        """
+        메타 필드에 키워드가 부분 문자열로 포함될 수 있는 Rules id (상위 집합)
+
+        키워드의 각 \\w+ 조각은 반드시 어떤 색인 토큰의 부분 문자열이므로,
+        어휘만 훑어 후보를 좁히고 최종 판정은 호출 측에서 원문으로 검증한다.
+        """
+        vocabulary = None
+        result = set()
+        for keyword in keywords:
+            pieces = word_tokens(keyword)  # 원형 조각만 (색인에 원형 토큰이 항상 포함됨)
+            if not pieces:
+                return set(self.ids())
+
+            if vocabulary is None:
+                vocabulary = self.vocabulary()
+
+            matched = None
+            for piece in pieces:
+                terms = [token for token in vocabulary if piece in token]
+                ids = set()
+                for field in META_FIELDS:
+                    for docs in self.postings(field, terms).values():
+                        ids.update(docs)
+                matched = ids if matched is None else matched & ids
+                if not matched:
+                    break
+            result |= matched
+        return result
+
+    def ids(self) -> List[int]:
+        """색인된 Rules id"""
+        return [doc_id for (doc_id,) in self._conn.execute("SELECT id FROM index_docs")]
+
+    def documents(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        """Rules id → {'name', 'path', 'front_matter'} (이름순)"""
+        if self.resident:
+            table = self._doc_table()
+            docs = {doc_id: table[doc_id][0] for doc_id in ids if doc_id in table}
+            return dict(sorted(docs.items(), key=lambda item: item[1]["name"]))
+        docs = {}
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for doc_id, name, front_matter in self._conn.execute(
+                f"SELECT id, name, front_matter FROM index_docs WHERE id IN ({placeholders})", chunk
+            ):
+                docs[doc_id] = {
+                    "name": name,
+                    "path": self.rules_dir / name,
+                    "front_matter": json.loads(front_matter),
+                }
+        return dict(sorted(docs.items(), key=lambda item: item[1]["name"]))
+
+    def rank(self, query_tokens: Iterable[str], top_k: int,
+             boosts: Optional[Dict[str, float]] = None,
+             priority_weight: float = PRIORITY_WEIGHT) -> List[Tuple[float, int]]:
+        """
+        BM25F 점수 상위 k개 Rules
+
+        필드별 tf를 길이 정규화 후 가중합하여 포화시키고(BM25F),
+        priority가 낮을수록(중요할수록) 점수를 보정한다.
+        전체 후보를 정렬하지 않고 크기 k의 힙으로 선택한다.
+
+        Returns:
+            [(score, id), ...] 점수 내림차순
+        """
+        boosts = boosts or FIELD_BOOSTS
+        query_tokens = list(dict.fromkeys(query_tokens))
+        if not query_tokens or top_k <= 0:
+            return []
+
+        total, avg_lengths = self._collection_stats()
+        if not total:
+            return []
+
+        # 토큰별 필드 포스팅
+        field_postings = {
+            field: self.postings(field, query_tokens)
+            for field in INDEX_FIELDS if boosts.get(field)
+        }
+        doc_freq = {}
+        candidates = set()
+        for token in query_tokens:
+            ids = set()
+            for postings in field_postings.values():
+                ids.update(postings.get(token, ()))
+            if ids:
+                doc_freq[token] = len(ids)
+                candidates |= ids
+        if not candidates:
+            return []
+
+        idf = {
+            token: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for token, df in doc_freq.items()
+        }
+
+        # 토큰 단위 누적 (term-at-a-time): 후보 x 토큰 x 필드 조회 대신 포스팅만 순회
+        lengths = dict(self._doc_lengths(candidates))
+        scores = dict.fromkeys(candidates, 0.0)
+        for token, token_idf in idf.items():
+            weighted = {}
+            for field, postings in field_postings.items():
+                boost, avg_length = boosts[field], avg_lengths[field]
+                i = INDEX_FIELDS.index(field)
+                for doc_id, tf in postings.get(token, {}).items():
+                    if tf:
+                        norm = 1 - BM25_B + BM25_B * lengths[doc_id][0][i] / avg_length
+                        weighted[doc_id] = weighted.get(doc_id, 0.0) + boost * tf / norm
+            for doc_id, weighted_tf in weighted.items():
+                scores[doc_id] += token_idf * weighted_tf / (BM25_K1 + weighted_tf)
+
+        def boosted():
+            for doc_id, score in scores.items():
+                priority = lengths[doc_id][1]
+                score *= 1 + priority_weight * (DEFAULT_PRIORITY - min(priority, DEFAULT_PRIORITY)) / DEFAULT_PRIORITY
+                yield score, doc_id
+
+        return heapq.nlargest(top_k, boosted())
+
+    def _collection_stats(self) -> Tuple[int, Dict[str, float]]:
+        """(문서 수, 필드별 평균 길이) - 재색인 전까지 캐시"""
+        if self._collection is None:
+            row = self._conn.execute(
+                "SELECT COUNT(*), AVG(len_filename), AVG(len_description), AVG(len_tags), AVG(len_body) "
+                "FROM index_docs"
+            ).fetchone()
+            self._collection = (row[0], {field: (row[i + 1] or 1.0) for i, field in enumerate(INDEX_FIELDS)})
+        return self._collection
+
+    def _doc_lengths(self, ids: Iterable[int]):
+        """Rules id → (id, (필드별 길이...), priority) - 길이는 INDEX_FIELDS 순서"""
+        if self.resident:
+            table = self._doc_table()
+            for doc_id in ids:
+                _, lengths, priority = table[doc_id]
+                yield doc_id, (lengths, priority)
+            return
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for doc_id, *lengths, priority in self._conn.execute(
+                "SELECT id, len_filename, len_description, len_tags, len_body, priority "
+                f"FROM index_docs WHERE id IN ({placeholders})", chunk
+            ):
+                yield doc_id, (tuple(lengths), priority)
+
+    def _doc_table(self) -> Dict[int, Tuple[Dict, Tuple[int, ...], int]]:
+        """상주 문서 테이블 id → (문서, 필드별 길이, priority) - 재색인 전까지 캐시"""
+        if self._docs is None:
+            self._docs = {
+                doc_id: (
+                    {"name": name, "path": self.rules_dir / name, "front_matter": json.loads(front_matter)},
+                    tuple(lengths),
+                    priority,
+                )
+                for doc_id, name, front_matter, *lengths, priority in self._conn.execute(
+                    "SELECT id, name, front_matter, len_filename, len_description, len_tags, len_body, priority "
+                    "FROM index_docs"
+                )
+            }
+        return self._docs
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 검색 키워드 사전 (Aho–Corasick)
+
+- 기본 사전 + 외부 사전 파일(.cursor/rules_keywords.txt, 한 줄에 한 단어, # 주석)
+- 사전 전체를 Aho–Corasick 오토마톤 하나로 컴파일 → 문장을 한 번만 훑어 모든 적중 검출
+  (단어마다 `keyword in text`를 반복하던 방식은 사전 크기에 비례)
+- 컴파일 결과는 사전 다이제스트와 함께 디스크(.cursor/rules_keywords_automaton.json)에 캐시
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DICTIONARY_NAME = "rules_keywords.txt"
+AUTOMATON_NAME = "rules_keywords_automaton.json"
+AUTOMATON_FORMAT = 1
+
+# 기본 사전 (외부 사전 파일은 여기에 추가됨)
+DEFAULT_KEYWORDS = [
+    'ssh', '키', 'hpanel', 'hostinger', 'vps', '배포',
+    '보안', '에이전트', '암호', '비밀번호',
+    'rules', '규칙', '우선순위', '무시',
+    'f드라이브', 'f-drive', 'environment', '환경',
+    'workflow', '워크플로우', 'daily', '일일'
+]
+
+# 사전 파일 경로 → ((mtime_ns, size), 매처) / 다이제스트 → 매처
+_by_file = {}
+_by_digest = {}
+
+
+def normalize_keywords(keywords: Iterable[str]) -> List[str]:
+    """소문자화, 공백 제거, 빈 값/중복 제거 (순서 유지)"""
+    result = {}
+    for keyword in keywords:
+        keyword = keyword.strip().lower()
+        if keyword:
+            result[keyword] = None
+    return list(result)
+
+
+def read_dictionary(path: Path) -> List[str]:
+    """외부 사전 파일 읽기 (한 줄에 한 단어, 빈 줄과 # 주석 무시)"""
+    terms = []
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                terms.append(line)
+    return terms
+
+
+def dictionary_digest(keywords: List[str]) -> str:
+    """정규화된 사전 다이제스트 (디스크 캐시 키)"""
+    return hashlib.sha1('\n'.join(keywords).encode('utf-8')).hexdigest()
+
+
+class KeywordMatcher:
+    """Aho–Corasick 다중 패턴 매처 (부분 문자열 적중 = 기존 `keyword in text`와 동일)"""
+
+    __slots__ = ("keywords", "digest", "_goto", "_fail", "_out")
+
+    def __init__(self, keywords: List[str], digest: str, goto: List[Dict[str, int]],
+                 fail: List[int], out: List[List[int]]):
+        self.keywords = keywords
+        self.digest = digest
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    @classmethod
+    def build(cls, keywords: Iterable[str]) -> "KeywordMatcher":
+        """사전 → 오토마톤 (트라이 + 실패 링크, 출력은 실패 링크를 따라 미리 병합)"""
+        keywords = normalize_keywords(keywords)
+        goto = [{}]
+        out = [[]]
+        for i, keyword in enumerate(keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(i)
+
+        # BFS 순서로 실패 링크 계산 (얕은 상태의 출력이 먼저 완성됨)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+        return cls(keywords, dictionary_digest(keywords), goto, fail, out)
+
+    def find(self, text: str) -> List[str]:
+        """text(소문자)에 부분 문자열로 나타나는 사전 단어 (사전 순서)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return [self.keywords[i] for i in sorted(found)]
+
+    def to_dict(self) -> Dict:
+        """디스크 캐시용 직렬화"""
+        return {
+            "format": AUTOMATON_FORMAT,
+            "digest": self.digest,
+            "keywords": self.keywords,
+            "goto": self._goto,
+            "fail": self._fail,
+            "out": self._out,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KeywordMatcher":
+        """디스크 캐시 → 매처"""
+        return cls(data["keywords"], data["digest"], data["goto"], data["fail"], data["out"])
+
+
+def _load_cached(cache_path: Path, digest: str) -> Optional[KeywordMatcher]:
+    """디스크 캐시가 같은 사전으로 만든 것이면 로드"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != AUTOMATON_FORMAT or data.get("digest") != digest:
+        return None
+    return KeywordMatcher.from_dict(data)
+
+
+def _save_cached(cache_path: Path, matcher: KeywordMatcher):
+    """디스크 캐시 저장 (임시 파일 → 교체, 실패해도 무시)"""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(matcher.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_matcher(dictionary_path: Optional[Path] = None, cache_path: Optional[Path] = None) -> KeywordMatcher:
+    """
+    기본 사전 + 외부 사전 파일 → 매처
+
+    같은 프로세스에서는 사전 파일 지문(mtime, size)이 그대로면 재사용하고,
+    프로세스가 새로 뜨면 디스크 캐시(다이제스트 일치 시)에서 로드한다.
+
+    Args:
+        dictionary_path: 외부 사전 파일 (없으면 기본 사전만)
+        cache_path: 컴파일된 오토마톤 캐시 파일 (None이면 디스크 캐시 미사용)
+    """
+    fingerprint = None
+    if dictionary_path is not None:
+        try:
+            st = os.stat(dictionary_path)
+            fingerprint = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            dictionary_path = None
+    memo = _by_file.get(dictionary_path)
+    if memo is not None and memo[0] == fingerprint:
+        return memo[1]
+
+    terms = list(DEFAULT_KEYWORDS)
+    if dictionary_path is not None:
+        try:
+            terms += read_dictionary(dictionary_path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"⚠️ 키워드 사전을 읽을 수 없습니다 ({dictionary_path}): {e} - 기본 사전 사용")
+    keywords = normalize_keywords(terms)
+    digest = dictionary_digest(keywords)
+
+    matcher = _by_digest.get(digest)
+    if matcher is None and cache_path is not None:
+        matcher = _load_cached(cache_path, digest)
+    if matcher is None:
+        matcher = KeywordMatcher.build(keywords)
+        if cache_path is not None:
+            _save_cached(cache_path, matcher)
+    _by_digest[digest] = matcher
+    _by_file[dictionary_path] = (fingerprint, matcher)
+    return matcher
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MinHash / LSH 기반 유사 Rules 후보 탐색
+
+- One Permutation Hashing + 회전 densification (토큰당 해시 1회)
+- LSH 밴딩으로 Jaccard 0.8 이상 쌍을 거의 확실히 후보로 수집
+- 서명은 코퍼스 DB에 파일 지문별로 캐시
+- 최종 판정은 후보 쌍에 대해서만 정확한 Jaccard로 검증
+"""
+
+import hashlib
+import sqlite3
+from array import array
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List
+
+from rules_parallel import map_cpu
+
+# 밴드 25 x 행 5 = 125 bin: P(후보 | J=0.8) ≈ 0.9999, P(후보 | J=0.3) ≈ 0.06
+LSH_BANDS = 25
+LSH_ROWS = 5
+NUM_BINS = LSH_BANDS * LSH_ROWS
+
+_HASH_BITS = 48
+_BIN_RANGE = (1 << _HASH_BITS) // NUM_BINS + 1
+_EMPTY = (1 << 64) - 1
+
+
+def token_hash(token: str) -> int:
+    """프로세스와 무관하게 고정된 48비트 토큰 해시"""
+    digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> (64 - _HASH_BITS)
+
+
+def minhash_signature(tokens: Iterable[str]) -> array:
+    """토큰 집합 → MinHash 서명 (NUM_BINS개, 빈 집합이면 빈 배열)"""
+    bins = [_EMPTY] * NUM_BINS
+    for token in tokens:
+        h = token_hash(token)
+        i = h % NUM_BINS
+        v = h // NUM_BINS
+        if v < bins[i]:
+            bins[i] = v
+
+    filled = [i for i, v in enumerate(bins) if v != _EMPTY]
+    if not filled:
+        return array('Q')
+
+    # 빈 bin은 오른쪽(순환)으로 가장 가까운 채워진 bin 값을 거리만큼 이동시켜 채움
+    signature = array('Q', bins)
+    for i in range(NUM_BINS):
+        if bins[i] != _EMPTY:
+            continue
+        distance = 1
+        while bins[(i + distance) % NUM_BINS] == _EMPTY:
+            distance += 1
+        signature[i] = bins[(i + distance) % NUM_BINS] + distance * _BIN_RANGE
+    return signature
+
+
+class MinHashLSH:
+    """밴딩 LSH 버킷"""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS):
+        self.bands = bands
+        self.rows = rows
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._keys = {}
+
+    def add(self, key: Hashable, signature: array):
+        """서명 등록 (빈 서명은 무시)"""
+        if not signature:
+            return
+        self._keys[key] = (len(self._keys), signature)
+        for band in range(self.bands):
+            start = band * self.rows
+            self._buckets[band][signature[start:start + self.rows].tobytes()].append(key)
+
+    def neighbors(self, key: Hashable) -> List[Hashable]:
+        """하나 이상의 밴드를 공유하는 후보 (등록 순서, 자기 자신 제외)"""
+        if key not in self._keys:
+            return []
+        _, signature = self._keys[key]
+        found = set()
+        for band in range(self.bands):
+            start = band * self.rows
+            found.update(self._buckets[band][signature[start:start + self.rows].tobytes()])
+        found.discard(key)
+        return sorted(found, key=lambda other: self._keys[other][0])
+
+
+class SignatureCache:
+    """코퍼스 DB에 파일 지문별 MinHash 서명 캐시"""
+
+    def __init__(self, conn: sqlite3.Connection, jobs: int = 1):
+        self._conn = conn
+        self.jobs = jobs  # >1 이면 서명 계산을 프로세스 풀로 병렬화
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS minhash (
+                name TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                num_bins INTEGER NOT NULL,
+                signature BLOB NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+    def signatures(self, entries: Dict[str, Dict]) -> Dict[str, array]:
+        """코퍼스 엔트리 → 서명 (지문이 바뀐 파일만 재계산)"""
+        cached = {
+            name: (mtime_ns, size, blob)
+            for name, mtime_ns, size, num_bins, blob in self._conn.execute("SELECT * FROM minhash")
+            if num_bins == NUM_BINS
+        }
+
+        result = {}
+        missing = []
+        for name, entry in entries.items():
+            if "error" in entry:
+                continue
+            hit = cached.get(name)
+            if hit and hit[:2] == (entry["mtime_ns"], entry["size"]):
+                signature = array('Q')
+                signature.frombytes(hit[2])
+                result[name] = signature
+            else:
+                missing.append(name)
+
+        computed = map_cpu(minhash_signature, [entries[name]["tokens"] for name in missing], self.jobs)
+        fresh = []
+        for name, signature in zip(missing, computed):
+            entry = entries[name]
+            fresh.append((name, entry["mtime_ns"], entry["size"], NUM_BINS, signature.tobytes()))
+            result[name] = signature
+        result = {name: result[name] for name in entries if name in result}
+
+        stale = [(name,) for name in cached if name not in entries]
+        self._conn.executemany("DELETE FROM minhash WHERE name = ?", stale)
+        self._conn.executemany("INSERT OR REPLACE INTO minhash VALUES (?, ?, ?, ?, ?)", fresh)
+        self._conn.commit()
+        return result
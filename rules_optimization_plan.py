@@ -4,15 +4,75 @@
 Rules 최적화 계획 생성
 - Priority 0 Rules 분석 및 재조정 제안
 - alwaysApply Rules 분석 및 축소 제안
+- Rule별 변경 목록(operations, 내용 해시 포함) → rules_optimizer.py --plan 으로 적용
+- 카테고리/유지 목록/목표치는 설정 파일(.cursor/rules_plan_config.json)로 조정
+  (카테고리 패턴은 Aho–Corasick 매처 하나로 컴파일 → Rule 이름을 한 번만 훑어 분류)
 """
 
+import argparse
+import hashlib
 import json
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from typing import Dict, List, Optional
+
+from rules_keywords import KeywordMatcher
+from rules_record import RuleRecord, load_rule_records
 
 WORKSPACE = Path(__file__).parent.parent
 ANALYSIS_FILE = WORKSPACE / "daily" / datetime.now().strftime("%Y-%m-%d") / "rules_analysis.json"
+PLAN_FILE = WORKSPACE / "daily" / datetime.now().strftime("%Y-%m-%d") / "rules_optimization_plan.json"
+CONFIG_FILE = WORKSPACE / ".cursor" / "rules_plan_config.json"
+
+# 기본 설정 (설정 파일의 같은 key가 덮어씀)
+DEFAULT_CONFIG = {
+    "priority_0": {
+        "max_count": 10,
+        # 카테고리 순서 = 우선순위 (Rule 이름에 패턴이 부분 문자열로 있으면 첫 카테고리로 분류)
+        "categories": [
+            {"name": "Layer 0 (자율 시스템)", "patterns": ["layer0", "autonomous"]},
+            {"name": "Critical (필수 실행)", "patterns": ["critical", "auto-execution"]},
+            {"name": "환경 독립성", "patterns": ["f-drive", "independence"]},
+            {"name": "MCP 필수", "patterns": ["mcp", "mandatory"]},
+            {"name": "Rules 관리", "patterns": ["rules-priority", "enforcement"]},
+            {"name": "SSH/보안", "patterns": ["ssh", "key"]},
+            {"name": "환경 변수", "patterns": ["subprocess", "env"]},
+            {"name": "검증 필수", "patterns": ["korean-medicine", "verification"]},
+            {"name": "날짜 검증", "patterns": ["date", "validation"]}
+        ],
+        "other_category": "기타",
+        # 카테고리 Rules가 more_than개 초과면 통합 제안
+        "merge": [
+            {"category": "Layer 0 (자율 시스템)", "label": "Layer 0", "more_than": 3,
+             "suggestion": "layer0-*.mdc 파일들을 하나로 통합 (layer0-core.mdc)"},
+            {"category": "Critical (필수 실행)", "label": "Critical", "more_than": 1,
+             "suggestion": "CRITICAL-*.mdc 파일들을 하나로 통합"}
+        ],
+        # max_count 초과 시 Priority 0으로 남길 Rules (나머지는 Priority 1로)
+        "keep": [
+            "f-drive-absolute-independence.mdc",
+            "rules-priority-enforcement.mdc",
+            "CRITICAL-AUTO-EXECUTION.mdc",
+            "mcp-auto-execution-enforcement.mdc"
+        ],
+        "list_limit": 20  # 카테고리별 출력 Rules 수 (대규모 분석 시 출력 제한)
+    },
+    "always_apply": {
+        "target_count": 7,
+        "keep_priorities": [0, 1],
+        "keep": [
+            "f-drive-absolute-independence.mdc",
+            "rules-priority-enforcement.mdc",
+            "CRITICAL-AUTO-EXECUTION.mdc",
+            "mcp-auto-execution-enforcement.mdc",
+            "layer0-autonomous-brain.mdc",
+            "global.mdc",
+            "company-environment-mcp-mandatory.mdc"
+        ],
+        "intelligent_priorities": [1, 2],
+        "file_specific_min_priority": 2
+    }
+}
 
 def load_analysis():
     """분석 데이터 로드"""
@@ -23,51 +83,81 @@ def load_analysis():
     with open(ANALYSIS_FILE, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_priority_0_rules(data):
+def load_plan_config(path: Optional[Path] = None) -> Dict:
+    """
+    계획 설정 로드 (섹션별로 기본 설정 위에 설정 파일 값을 덮어씀)
+
+    Args:
+        path: 설정 파일 (기본 .cursor/rules_plan_config.json, 없으면 기본 설정)
+    """
+    config = {section: dict(values) for section, values in DEFAULT_CONFIG.items()}
+    path = CONFIG_FILE if path is None else Path(path)
+    if not path.exists():
+        return config
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 계획 설정을 읽을 수 없습니다 ({path}): {e} - 기본 설정 사용")
+        return config
+    for section, values in overrides.items():
+        if section in config and isinstance(values, dict):
+            config[section].update(values)
+    return config
+
+class CategoryMatcher:
+    """
+    카테고리 분류기 (이름에 패턴이 부분 문자열로 있는 첫 카테고리, 없으면 기타)
+
+    모든 카테고리 패턴을 카테고리 순서대로 매처 하나에 넣으므로,
+    적중 단어 중 사전 순서가 가장 앞선 단어의 카테고리가 곧 첫 카테고리
+    """
+
+    __slots__ = ("other", "_matcher", "_category")
+
+    def __init__(self, categories: List[Dict], other: str = "기타"):
+        self.other = other
+        self._category = {}  # 패턴 → 카테고리 (여러 카테고리에 있으면 앞 카테고리)
+        patterns = []
+        for category in categories:
+            for pattern in category.get("patterns", []):
+                pattern = pattern.strip().lower()
+                if pattern:
+                    self._category.setdefault(pattern, category["name"])
+                    patterns.append(pattern)
+        self._matcher = KeywordMatcher.build(patterns)
+
+    def classify(self, name: str) -> str:
+        """Rule 이름 → 카테고리"""
+        found = self._matcher.find(name.lower())
+        return self._category[found[0]] if found else self.other
+
+def analyze_priority_0_rules(rules: List[RuleRecord], config: Optional[Dict] = None):
     """Priority 0 Rules 분석"""
-    priority_0 = [r for r in data['rules'] if r.get('priority') == 0]
+    settings = (config or load_plan_config())["priority_0"]
+    priority_0 = [r for r in rules if r.priority == 0]
     
     print("=" * 70)
-    print("🎯 Priority 0 Rules 분석 (18개)")
+    print(f"🎯 Priority 0 Rules 분석 ({len(priority_0)}개)")
     print("=" * 70)
     
     # 카테고리별 분류
-    categories = defaultdict(list)
-    
+    matcher = CategoryMatcher(settings["categories"], settings["other_category"])
+    categories = {}
     for rule in priority_0:
-        name = rule['name']
-        desc = rule.get('description', '')
-        
-        # 카테고리 분류
-        if 'layer0' in name.lower() or 'autonomous' in name.lower():
-            categories['Layer 0 (자율 시스템)'].append(rule)
-        elif 'critical' in name.lower() or 'auto-execution' in name.lower():
-            categories['Critical (필수 실행)'].append(rule)
-        elif 'f-drive' in name.lower() or 'independence' in name.lower():
-            categories['환경 독립성'].append(rule)
-        elif 'mcp' in name.lower() or 'mandatory' in name.lower():
-            categories['MCP 필수'].append(rule)
-        elif 'rules-priority' in name.lower() or 'enforcement' in name.lower():
-            categories['Rules 관리'].append(rule)
-        elif 'ssh' in name.lower() or 'key' in name.lower():
-            categories['SSH/보안'].append(rule)
-        elif 'subprocess' in name.lower() or 'env' in name.lower():
-            categories['환경 변수'].append(rule)
-        elif 'korean-medicine' in name.lower() or 'verification' in name.lower():
-            categories['검증 필수'].append(rule)
-        elif 'date' in name.lower() or 'validation' in name.lower():
-            categories['날짜 검증'].append(rule)
-        else:
-            categories['기타'].append(rule)
+        categories.setdefault(matcher.classify(rule.name), []).append(rule)
     
     # 카테고리별 출력
-    for category, rules in categories.items():
-        print(f"\n📁 {category} ({len(rules)}개)")
-        for rule in rules:
-            always = "✅ Always" if rule.get('always_apply') else "⚪"
-            print(f"  {always} {rule['name']}")
-            if rule.get('description'):
-                print(f"     └─ {rule['description'][:60]}...")
+    list_limit = settings["list_limit"]
+    for category, members in categories.items():
+        print(f"\n📁 {category} ({len(members)}개)")
+        for rule in members[:list_limit]:
+            always = "✅ Always" if rule.always_apply else "⚪"
+            print(f"  {always} {rule.name}")
+            if rule.description:
+                print(f"     └─ {rule.description[:60]}...")
+        if len(members) > list_limit:
+            print(f"  ... 외 {len(members) - list_limit}개")
     
     # 권장 사항
     print("\n" + "=" * 70)
@@ -75,43 +165,29 @@ def analyze_priority_0_rules(data):
     print("=" * 70)
     
     recommendations = []
-    
-    # Layer 0 통합 제안
-    layer0_count = len(categories.get('Layer 0 (자율 시스템)', []))
-    if layer0_count > 3:
-        recommendations.append({
-            "action": "통합",
-            "target": f"Layer 0 Rules {layer0_count}개",
-            "suggestion": "layer0-*.mdc 파일들을 하나로 통합 (layer0-core.mdc)",
-            "priority": "high"
-        })
-    
-    # Critical 통합 제안
-    critical_count = len(categories.get('Critical (필수 실행)', []))
-    if critical_count > 1:
-        recommendations.append({
-            "action": "통합",
-            "target": f"Critical Rules {critical_count}개",
-            "suggestion": "CRITICAL-*.mdc 파일들을 하나로 통합",
-            "priority": "high"
-        })
+    move_to_1 = []
+    
+    # 카테고리 통합 제안
+    for merge in settings["merge"]:
+        count = len(categories.get(merge["category"], []))
+        if count > merge["more_than"]:
+            recommendations.append({
+                "action": "통합",
+                "target": f"{merge['label']} Rules {count}개",
+                "suggestion": merge["suggestion"],
+                "priority": "high"
+            })
     
     # Priority 0 → 1 조정 제안
-    if len(priority_0) > 10:
+    if len(priority_0) > settings["max_count"]:
         # 핵심만 Priority 0 유지, 나머지는 Priority 1로
-        keep_priority_0 = [
-            "f-drive-absolute-independence.mdc",
-            "rules-priority-enforcement.mdc",
-            "CRITICAL-AUTO-EXECUTION.mdc",
-            "mcp-auto-execution-enforcement.mdc"
-        ]
-        
-        move_to_1 = [r for r in priority_0 if r['name'] not in keep_priority_0]
+        keep_priority_0 = set(settings["keep"])
+        move_to_1 = [r for r in priority_0 if r.name not in keep_priority_0]
         
         recommendations.append({
             "action": "Priority 조정",
             "target": f"{len(move_to_1)}개 Rules",
-            "suggestion": f"Priority 0 → 1로 조정: {', '.join([r['name'] for r in move_to_1[:5]])}...",
+            "suggestion": f"Priority 0 → 1로 조정: {', '.join([r.name for r in move_to_1[:5]])}...",
             "priority": "high"
         })
     
@@ -122,27 +198,27 @@ def analyze_priority_0_rules(data):
     return {
         "total": len(priority_0),
         "categories": {k: len(v) for k, v in categories.items()},
-        "recommendations": recommendations
+        "recommendations": recommendations,
+        "move_to_1": [r.name for r in move_to_1]
     }
 
-def analyze_always_apply_rules(data):
+def analyze_always_apply_rules(rules: List[RuleRecord], config: Optional[Dict] = None):
     """alwaysApply Rules 분석"""
-    always_apply = [r for r in data['rules'] if r.get('always_apply')]
+    settings = (config or load_plan_config())["always_apply"]
+    always_apply = [r for r in rules if r.always_apply]
     
     print("\n" + "=" * 70)
-    print("📊 alwaysApply Rules 분석 (77개)")
+    print(f"📊 alwaysApply Rules 분석 ({len(always_apply)}개)")
     print("=" * 70)
     
     # Priority별 분류
-    by_priority = defaultdict(list)
+    by_priority = {}
     for rule in always_apply:
-        priority = rule.get('priority', 5)
-        by_priority[priority].append(rule)
+        by_priority[rule.priority] = by_priority.get(rule.priority, 0) + 1
     
     print("\nPriority별 분포:")
-    for priority in sorted(by_priority.keys()):
-        count = len(by_priority[priority])
-        print(f"  Priority {priority}: {count}개")
+    for priority in sorted(by_priority):
+        print(f"  Priority {priority}: {by_priority[priority]}개")
     
     # 권장 사항
     print("\n" + "=" * 70)
@@ -151,46 +227,36 @@ def analyze_always_apply_rules(data):
     
     recommendations = []
     
-    # 목표: 77개 → 7개 이하
-    target_count = 7
-    reduce_count = len(always_apply) - target_count
-    
-    # Priority 0, 1만 alwaysApply 유지
-    keep_always = [
-        r for r in always_apply 
-        if r.get('priority') in [0, 1] and r.get('name') in [
-            "f-drive-absolute-independence.mdc",
-            "rules-priority-enforcement.mdc",
-            "CRITICAL-AUTO-EXECUTION.mdc",
-            "mcp-auto-execution-enforcement.mdc",
-            "layer0-autonomous-brain.mdc",
-            "global.mdc",
-            "company-environment-mcp-mandatory.mdc"
-        ]
-    ]
-    
-    # 나머지는 intelligent 또는 file-specific로 변경
-    change_to_intelligent = [
-        r for r in always_apply 
-        if r not in keep_always and r.get('priority') in [1, 2]
-    ]
-    
-    change_to_file_specific = [
-        r for r in always_apply 
-        if r not in keep_always and r.get('priority') >= 2 and r.get('globs')
-    ]
+    # 유지 목록의 핵심 Rules만 alwaysApply 유지 (이름 집합으로 판정)
+    keep_names = set(settings["keep"])
+    keep_priorities = set(settings["keep_priorities"])
+    intelligent_priorities = set(settings["intelligent_priorities"])
+    file_specific_min = settings["file_specific_min_priority"]
+    
+    keep_always = []
+    change_to_intelligent = []
+    change_to_file_specific = []
+    for r in always_apply:
+        if r.name in keep_names and r.priority in keep_priorities:
+            keep_always.append(r)
+            continue
+        # 나머지는 intelligent 또는 file-specific로 변경
+        if r.priority in intelligent_priorities:
+            change_to_intelligent.append(r)
+        if r.priority >= file_specific_min and r.globs:
+            change_to_file_specific.append(r)
     
     recommendations.append({
         "action": "alwaysApply → intelligent",
         "count": len(change_to_intelligent),
-        "target": "Priority 1-2 Rules",
+        "target": f"Priority {min(intelligent_priorities)}-{max(intelligent_priorities)} Rules",
         "suggestion": f"{len(change_to_intelligent)}개 Rules를 intelligent 타입으로 변경"
     })
     
     recommendations.append({
         "action": "alwaysApply → file-specific",
         "count": len(change_to_file_specific),
-        "target": "Priority 2+ Rules (globs 있음)",
+        "target": f"Priority {file_specific_min}+ Rules (globs 있음)",
         "suggestion": f"{len(change_to_file_specific)}개 Rules를 file-specific 타입으로 변경"
     })
     
@@ -205,22 +271,76 @@ def analyze_always_apply_rules(data):
         "keep": len(keep_always),
         "change_to_intelligent": len(change_to_intelligent),
         "change_to_file_specific": len(change_to_file_specific),
-        "recommendations": recommendations
+        "recommendations": recommendations,
+        "intelligent": [r.name for r in change_to_intelligent],
+        "file_specific": [r.name for r in change_to_file_specific]
     }
 
-def generate_optimization_plan():
+def build_operations(rules: List[RuleRecord], priority_0_analysis: Dict, always_apply_analysis: Dict):
+    """
+    추천 → Rule별 프론트매터 변경 목록 (rules_optimizer.py --plan 으로 그대로 적용)
+
+    변경 대상 파일만 읽어 계획 시점 내용 해시(SHA-256)를 기록하고,
+    분석 이후 바뀐 파일(크기/mtime 불일치)은 제외한다.
+
+    Returns:
+        (operations, stale) - operations: [{'rule', 'path', 'hash', 'set', 'reasons'}], stale: 제외된 Rules 이름
+    """
+    planned = {}
+    
+    def plan(name, changes, reason):
+        entry = planned.setdefault(name, {"set": {}, "reasons": []})
+        entry["set"].update(changes)
+        entry["reasons"].append(reason)
+    
+    for name in priority_0_analysis["move_to_1"]:
+        plan(name, {"priority": 1}, "priority_0_to_1")
+    file_specific = set(always_apply_analysis["file_specific"])
+    for name in always_apply_analysis["file_specific"]:
+        plan(name, {"alwaysApply": False, "type": "file-specific"}, "always_apply_to_file_specific")
+    for name in always_apply_analysis["intelligent"]:
+        if name not in file_specific:
+            plan(name, {"alwaysApply": False, "type": "intelligent"}, "always_apply_to_intelligent")
+    
+    by_name = {rule.name: rule for rule in rules}
+    operations = []
+    stale = []
+    for name in sorted(planned):
+        rule = by_name[name]
+        rule_file = WORKSPACE / rule.path
+        try:
+            st = rule_file.stat()
+            if st.st_size != rule.size or st.st_mtime != rule.mtime:
+                stale.append(name)
+                continue
+            digest = hashlib.sha256(rule_file.read_bytes()).hexdigest()
+        except OSError:
+            stale.append(name)
+            continue
+        operations.append({
+            "rule": name,
+            "path": rule.path,
+            "hash": digest,
+            "set": planned[name]["set"],
+            "reasons": planned[name]["reasons"]
+        })
+    return operations, stale
+
+def generate_optimization_plan(config_path: Optional[Path] = None):
     """최적화 계획 생성"""
     data = load_analysis()
     if not data:
         return
     
     print("🔍 Rules 최적화 계획 생성 중...\n")
+    rules = load_rule_records(data)
+    config = load_plan_config(config_path)
     
     # Priority 0 분석
-    priority_0_analysis = analyze_priority_0_rules(data)
+    priority_0_analysis = analyze_priority_0_rules(rules, config)
     
     # alwaysApply 분석
-    always_apply_analysis = analyze_always_apply_rules(data)
+    always_apply_analysis = analyze_always_apply_rules(rules, config)
     
     # 최종 계획
     print("\n" + "=" * 70)
@@ -242,12 +362,12 @@ def generate_optimization_plan():
             },
             "step_2": {
                 "action": "Priority 0 최적화",
-                "target": "18개 → 10개 이하",
+                "target": f"{priority_0_analysis['total']}개 → {config['priority_0']['max_count']}개 이하",
                 "recommendations": priority_0_analysis['recommendations']
             },
             "step_3": {
                 "action": "alwaysApply 축소",
-                "target": "77개 → 7개 이하",
+                "target": f"{always_apply_analysis['total']}개 → {config['always_apply']['target_count']}개 이하",
                 "keep": always_apply_analysis['keep'],
                 "change_to_intelligent": always_apply_analysis['change_to_intelligent'],
                 "change_to_file_specific": always_apply_analysis['change_to_file_specific']
@@ -255,16 +375,31 @@ def generate_optimization_plan():
         }
     }
     
+    # Rule별 변경 목록 (적용 단계는 이 목록의 파일만 다룸)
+    operations, stale = build_operations(rules, priority_0_analysis, always_apply_analysis)
+    plan["operations"] = operations
+    print(f"\n📝 Rule별 변경: {len(operations)}개 (적용: python rules_optimizer.py --plan)")
+    if stale:
+        print(f"⚠️ 분석 이후 변경되어 제외: {len(stale)}개 - rules_diagnostics.py를 다시 실행하세요")
+        for name in stale[:10]:
+            print(f"   - {name}")
+    
     # 계획 저장
-    plan_file = WORKSPACE / "daily" / datetime.now().strftime("%Y-%m-%d") / "rules_optimization_plan.json"
-    plan_file.parent.mkdir(parents=True, exist_ok=True)
+    PLAN_FILE.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(plan_file, 'w', encoding='utf-8') as f:
+    with open(PLAN_FILE, 'w', encoding='utf-8') as f:
         json.dump(plan, f, indent=2, ensure_ascii=False, default=str)
     
-    print(f"\n💾 최적화 계획 저장: {plan_file}")
+    print(f"\n💾 최적화 계획 저장: {PLAN_FILE}")
     print("\n✅ 분석 완료!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Rules 최적화 계획 생성")
+    parser.add_argument("--config", type=Path, default=None,
+                        help=f"계획 설정 파일 (기본: {CONFIG_FILE})")
+    args = parser.parse_args()
+    generate_optimization_plan(args.config)
+
 if __name__ == "__main__":
-    generate_optimization_plan()
+    main()
 
@@ -5,40 +5,55 @@ Rules 최적화 실행 스크립트
 - Priority 0 → 1 조정
 - alwaysApply → intelligent 변경
 - 안전한 변경만 실행 (백업 포함)
+- 두 단계의 변경을 한 배치로 모아 프론트매터만, 파일당 한 번, 전부 커밋 또는 전부 롤백
+- --plan: 최적화 계획의 Rule별 변경(내용 해시 확인)만 적용
 """
 
 import json
-import shutil
 from pathlib import Path
 from datetime import datetime
-import re
+
+from rules_backup import BACKUP_ROOT, BackupStore
+from rules_edit import FrontMatterBatch
+from rules_frontmatter import read_front_matter
+from rules_parallel import resolve_jobs
+from rules_record import load_rule_records
 
 WORKSPACE = Path(__file__).parent.parent
 RULES_DIR = WORKSPACE / ".cursor" / "rules"
-BACKUP_DIR = WORKSPACE / ".cursor" / "rules_backup" / datetime.now().strftime("%Y%m%d_%H%M%S")
 ANALYSIS_FILE = WORKSPACE / "daily" / datetime.now().strftime("%Y-%m-%d") / "rules_analysis.json"
+PLAN_FILE = WORKSPACE / "daily" / datetime.now().strftime("%Y-%m-%d") / "rules_optimization_plan.json"
+
+# 새로 추가되는 key의 위치 (이 key 다음 줄)
+FIELD_AFTER = {"type": "alwaysApply"}
 
 def backup_rules():
-    """Rules 백업"""
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-    
-    for rule_file in RULES_DIR.glob("*.mdc"):
-        shutil.copy2(rule_file, BACKUP_DIR / rule_file.name)
+    """Rules 백업 (내용 주소 기반 스냅샷 - 바뀐 파일만 저장)"""
+    result = BackupStore(BACKUP_ROOT).snapshot(RULES_DIR, label="rules_optimizer")
     
-    print(f"✅ 백업 완료: {BACKUP_DIR}")
-    return BACKUP_DIR
+    print(f"✅ 백업 완료: 스냅샷 {result['id']} (새로 저장 {result['new_blobs']}개 / Rules {result['rules']}개)")
+    return result["id"]
 
 def load_analysis():
-    """분석 데이터 로드"""
+    """분석 데이터 로드 (Rules는 RuleRecord 목록)"""
     if not ANALYSIS_FILE.exists():
         print("❌ 분석 파일이 없습니다.")
         return None
     
     with open(ANALYSIS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        data = json.load(f)
+    data["rules"] = load_rule_records(data)
+    return data
 
-def adjust_priority_0_to_1(dry_run=True):
-    """Priority 0 → 1 조정 (안전한 변경만)"""
+def adjust_priority_0_to_1(dry_run=True, batch=None, jobs=1):
+    """
+    Priority 0 → 1 조정 (안전한 변경만)
+    
+    batch가 주어지면 변경을 계획만 추가하고, 없으면 이 단계만 바로 적용
+    """
+    own_batch = batch is None
+    if own_batch:
+        batch = FrontMatterBatch(RULES_DIR)
     # 핵심 Priority 0 유지 목록
     keep_priority_0 = [
         "f-drive-absolute-independence.mdc",
@@ -60,25 +75,29 @@ def adjust_priority_0_to_1(dry_run=True):
             continue
         
         try:
-            content = rule_file.read_text(encoding='utf-8')
-            
-            # Priority 0인지 확인
-            if re.search(r'priority:\s*0', content):
-                # Priority 0 → 1로 변경
-                new_content = re.sub(r'priority:\s*0', 'priority: 1', content)
-                
-                if not dry_run:
-                    rule_file.write_text(new_content, encoding='utf-8')
+            # Priority 0인지 확인 (헤더만 읽음)
+            if read_front_matter(rule_file).priority == 0:
+                # Priority 0 → 1로 변경 (프론트매터만)
+                batch.set(rule_file.name, "priority", 1)
                 
                 changed.append(rule_file.name)
                 print(f"  {'[DRY RUN] ' if dry_run else ''}✅ {rule_file.name}: Priority 0 → 1")
         except Exception as e:
             print(f"  ⚠️ {rule_file.name}: {e}")
     
+    if own_batch and not apply_batch(batch, dry_run, jobs):
+        return []
     return changed
 
-def change_always_apply_to_intelligent(dry_run=True, max_changes=None):
-    """alwaysApply → intelligent 변경"""
+def change_always_apply_to_intelligent(dry_run=True, max_changes=None, batch=None, jobs=1):
+    """
+    alwaysApply → intelligent 변경
+    
+    batch가 주어지면 변경을 계획만 추가하고, 없으면 이 단계만 바로 적용
+    """
+    own_batch = batch is None
+    if own_batch:
+        batch = FrontMatterBatch(RULES_DIR)
     # Priority 0 유지 (8개)
     keep_priority_0 = [
         "company-environment-mcp-mandatory.mdc",
@@ -121,16 +140,14 @@ def change_always_apply_to_intelligent(dry_run=True, max_changes=None):
             break
         
         try:
-            content = rule_file.read_text(encoding='utf-8')
-            
-            # alwaysApply: true인지 확인
-            if re.search(r'alwaysApply:\s*true', content, re.IGNORECASE):
+            # alwaysApply: true인지 확인 (헤더만 읽음)
+            front_matter = read_front_matter(rule_file)
+            if front_matter.always_apply:
                 # Priority 확인
-                priority_match = re.search(r'priority:\s*(\d+)', content)
-                priority = int(priority_match.group(1)) if priority_match else 5
+                priority = front_matter.priority if front_matter.priority is not None else 5
                 
                 # globs 확인
-                has_globs = bool(re.search(r'globs:\s*\[', content))
+                has_globs = bool(front_matter.globs)
                 
                 # 타입 결정
                 if has_globs:
@@ -138,31 +155,9 @@ def change_always_apply_to_intelligent(dry_run=True, max_changes=None):
                 else:
                     target_type = "intelligent"
                 
-                # alwaysApply: true → false
-                new_content = re.sub(
-                    r'alwaysApply:\s*true',
-                    'alwaysApply: false',
-                    content,
-                    flags=re.IGNORECASE
-                )
-                
-                # type 추가 또는 변경
-                if not re.search(r'type:\s*', content):
-                    # type 필드 추가 (alwaysApply 다음 줄에)
-                    new_content = re.sub(
-                        r'(alwaysApply:\s*false)',
-                        f'\\1\ntype: "{target_type}"',
-                        new_content
-                    )
-                else:
-                    new_content = re.sub(
-                        r'type:\s*"[^"]*"',
-                        f'type: "{target_type}"',
-                        new_content
-                    )
-                
-                if not dry_run:
-                    rule_file.write_text(new_content, encoding='utf-8')
+                # alwaysApply: true → false, type 추가(alwaysApply 다음 줄) 또는 변경
+                batch.set(rule_file.name, "alwaysApply", False)
+                batch.set(rule_file.name, "type", target_type, after="alwaysApply")
                 
                 changed.append({
                     "name": rule_file.name,
@@ -173,8 +168,56 @@ def change_always_apply_to_intelligent(dry_run=True, max_changes=None):
         except Exception as e:
             print(f"  ⚠️ {rule_file.name}: {e}")
     
+    if own_batch and not apply_batch(batch, dry_run, jobs):
+        return []
     return changed
 
+def apply_plan(plan_path=PLAN_FILE, dry_run=True, jobs=1):
+    """
+    최적화 계획(rules_optimization_plan.json)의 Rule별 변경만 적용
+    
+    계획에 적힌 파일만 읽고 쓰며(전체 재스캔 없음), 계획 시점 내용 해시와 다르면
+    (계획 이후 누군가 수정) 배치 전체를 롤백한다.
+    """
+    plan_path = Path(plan_path)
+    if not plan_path.exists():
+        print(f"❌ 계획 파일이 없습니다: {plan_path} (rules_optimization_plan.py를 먼저 실행하세요)")
+        return None
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        operations = json.load(f).get("operations")
+    if operations is None:
+        print("❌ 계획에 Rule별 변경 목록(operations)이 없습니다. 계획을 다시 생성하세요.")
+        return None
+    
+    batch = FrontMatterBatch(RULES_DIR)
+    for operation in operations:
+        name = operation["rule"]
+        batch.expect_hash(name, operation["hash"])
+        for key, value in operation["set"].items():
+            batch.set(name, key, value, after=FIELD_AFTER.get(key))
+        changes = ', '.join(f"{key}={value}" for key, value in operation["set"].items())
+        print(f"  {'[DRY RUN] ' if dry_run else ''}✅ {name}: {changes}")
+    
+    snapshot_id = None
+    if not dry_run and operations:
+        # 계획 대상 파일만 부분 스냅샷
+        snapshot_id = BackupStore(BACKUP_ROOT).snapshot(RULES_DIR, label="rules_optimizer --plan", names=batch.names())["id"]
+        print(f"  💾 백업 스냅샷: {snapshot_id}")
+    committed = apply_batch(batch, dry_run, jobs)
+    return {"operations": len(operations), "committed": committed, "snapshot": snapshot_id}
+
+def apply_batch(batch, dry_run=True, jobs=1):
+    """계획된 프론트매터 변경 일괄 적용 (파일당 1회 읽기/쓰기, 전부 커밋 또는 전부 롤백)"""
+    result = batch.apply(dry_run=dry_run, jobs=jobs)
+    for name, error in result["failed"].items():
+        print(f"  ⚠️ {name}: {error}")
+    if result["failed"]:
+        print(f"  ❌ {len(result['failed'])}개 파일 실패 - 모든 변경을 롤백했습니다")
+        return False
+    if not dry_run:
+        print(f"  💾 {len(result['changed'])}개 파일 저장 (원자적 교체, 변경 없음 {len(result['unchanged'])}개)")
+    return True
+
 def main():
     """메인 실행"""
     import argparse
@@ -183,6 +226,9 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="시뮬레이션 모드")
     parser.add_argument("--priority-only", action="store_true", help="Priority 조정만")
     parser.add_argument("--always-apply-only", action="store_true", help="alwaysApply 변경만")
+    parser.add_argument("--jobs", type=int, default=1, help="파일 재작성 병렬 작업 수 (0 = CPU 코어 수)")
+    parser.add_argument("--plan", nargs="?", const=str(PLAN_FILE), default=None,
+                        help="최적화 계획 파일의 Rule별 변경만 적용 (기본: 오늘 계획)")
     
     args = parser.parse_args()
     
@@ -192,32 +238,56 @@ def main():
     print(f"모드: {'DRY RUN (시뮬레이션)' if args.dry_run else '실제 실행'}")
     print()
     
+    if args.plan:
+        print(f"📋 계획 적용: {args.plan}")
+        result = apply_plan(args.plan, dry_run=args.dry_run, jobs=resolve_jobs(args.jobs))
+        print()
+        print("=" * 70)
+        if result is None or not result["committed"]:
+            print("❌ 계획을 적용하지 못했습니다 - Rules는 변경되지 않았습니다.")
+        elif args.dry_run:
+            print(f"⚠️ DRY RUN 모드입니다. {result['operations']}개 Rules가 변경될 예정입니다.")
+        else:
+            print(f"✅ 계획 적용 완료! ({result['operations']}개 Rules)")
+            if result["snapshot"]:
+                print(f"💾 백업 스냅샷: {result['snapshot']} (복원: python rules_backup.py restore {result['snapshot']})")
+        return
+    
     # 백업
     if not args.dry_run:
-        backup_dir = backup_rules()
+        snapshot_id = backup_rules()
         print()
     
+    # 두 단계의 변경을 한 배치로 모아 파일당 한 번만 쓰기
+    batch = FrontMatterBatch(RULES_DIR)
+    
     # Priority 0 → 1 조정
     if not args.always_apply_only:
-        print("1️⃣ Priority 0 → 1 조정 중...")
-        priority_changed = adjust_priority_0_to_1(dry_run=args.dry_run)
-        print(f"   ✅ {len(priority_changed)}개 Rules 변경")
+        print("1️⃣ Priority 0 → 1 조정 계획 중...")
+        priority_changed = adjust_priority_0_to_1(dry_run=args.dry_run, batch=batch)
+        print(f"   ✅ {len(priority_changed)}개 Rules 변경 예정")
         print()
     
     # alwaysApply → intelligent 변경
     if not args.priority_only:
-        print("2️⃣ alwaysApply → intelligent 변경 중...")
-        always_changed = change_always_apply_to_intelligent(dry_run=args.dry_run, max_changes=20)
-        print(f"   ✅ {len(always_changed)}개 Rules 변경")
+        print("2️⃣ alwaysApply → intelligent 변경 계획 중...")
+        always_changed = change_always_apply_to_intelligent(dry_run=args.dry_run, max_changes=20, batch=batch)
+        print(f"   ✅ {len(always_changed)}개 Rules 변경 예정")
         print()
     
+    print(f"3️⃣ 변경 적용 중... ({len(batch)}개 파일)")
+    committed = apply_batch(batch, dry_run=args.dry_run, jobs=resolve_jobs(args.jobs))
+    print()
+    
     print("=" * 70)
     if args.dry_run:
         print("⚠️ DRY RUN 모드입니다. 실제로는 변경되지 않았습니다.")
         print("실제 실행하려면 --dry-run 옵션을 제거하세요.")
+    elif not committed:
+        print("❌ 최적화 실패 - Rules는 변경되지 않았습니다.")
     else:
         print("✅ 최적화 완료!")
-        print(f"💾 백업 위치: {backup_dir}")
+        print(f"💾 백업 스냅샷: {snapshot_id} (복원: python rules_backup.py restore {snapshot_id})")
 
 if __name__ == "__main__":
     main()
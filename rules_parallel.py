@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 병렬 처리 헬퍼 (옵트인)
+
+- I/O(파일 읽기): 스레드 풀
+- CPU(파싱/토큰화/MinHash): 프로세스 풀
+- 결과는 항상 입력 순서 그대로 반환 (결정적)
+- jobs <= 1 이면 순차 실행
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 이보다 적은 작업은 프로세스 기동 비용이 더 크므로 순차 처리
+MIN_ITEMS_FOR_PROCESSES = 64
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs 값 정규화 (0 이하 → CPU 코어 수)"""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def map_io(func: Callable[[T], R], items: Sequence[T], jobs: int = 1) -> List[R]:
+    """I/O 작업 병렬 매핑 (스레드 풀, 입력 순서 유지)"""
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items))
+
+
+def map_cpu(func: Callable[[T], R], items: Sequence[T], jobs: int = 1) -> List[R]:
+    """CPU 작업 병렬 매핑 (프로세스 풀, 입력 순서 유지)
+
+    func는 모듈 최상위 함수여야 한다 (pickle 가능).
+    """
+    if jobs <= 1 or len(items) < MIN_ITEMS_FOR_PROCESSES:
+        return [func(item) for item in items]
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
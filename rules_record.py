@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 레코드 (진단/최적화/계획 공유)
+
+- Rule당 dict 대신 __slots__ 레코드 (원본 metadata dict, datetime 미보관)
+- type은 인터닝된 열거형 (RuleType), priority는 정수, mtime은 epoch 초
+- 디렉토리/globs/tags 문자열은 레코드 간 공유 (sys.intern)
+- rules_analysis.json 형식은 to_dict() / from_dict()로 변환
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Union
+
+from rules_frontmatter import FrontMatter
+
+DEFAULT_PRIORITY = 5
+
+
+class RuleType(str, Enum):
+    """Rules 적용 타입 (str 하위 타입이므로 JSON에는 값 그대로 기록)"""
+
+    NONE = ""
+    ALWAYS = "always"
+    INTELLIGENT = "intelligent"
+    FILE_SPECIFIC = "file-specific"
+    MANUAL = "manual"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+_RULE_TYPES = {member.value: member for member in RuleType}
+
+
+def rule_type(value: Optional[str]) -> Union[RuleType, str]:
+    """type 원문 → RuleType (알 수 없는 값은 인터닝된 문자열 그대로)"""
+    if not value:
+        return RuleType.NONE
+    return _RULE_TYPES.get(value) or sys.intern(value)
+
+
+class RuleRecord:
+    """Rule 한 개의 진단 정보"""
+
+    __slots__ = (
+        "name", "directory", "size", "mtime", "priority", "always_apply",
+        "type", "description", "globs", "tags", "content_lines", "error",
+    )
+
+    def __init__(self, name: str, directory: str = "", size: int = 0, mtime: float = 0.0,
+                 priority: int = DEFAULT_PRIORITY, always_apply: bool = False,
+                 type: Union[RuleType, str] = RuleType.NONE, description: str = "",
+                 globs: str = "", tags: str = "", content_lines: int = 0,
+                 error: Optional[str] = None):
+        self.name = name
+        self.directory = sys.intern(directory)
+        self.size = size
+        self.mtime = mtime
+        self.priority = priority
+        self.always_apply = always_apply
+        self.type = type
+        self.description = description
+        self.globs = sys.intern(globs)
+        self.tags = sys.intern(tags)
+        self.content_lines = content_lines
+        self.error = error
+
+    @classmethod
+    def from_front_matter(cls, name: str, directory: str, size: int, mtime: float,
+                          front_matter: Dict[str, str], content_lines: int) -> "RuleRecord":
+        """프론트매터 원문 → 레코드"""
+        parsed = FrontMatter(front_matter)
+        return cls(
+            name, directory, size, mtime,
+            priority=parsed.priority if parsed.priority is not None else DEFAULT_PRIORITY,
+            always_apply=bool(parsed.always_apply),
+            type=rule_type(front_matter.get("type")),
+            description=parsed.description,
+            globs=front_matter.get("globs", ""),
+            tags=front_matter.get("tags", ""),
+            content_lines=content_lines,
+        )
+
+    @classmethod
+    def failed(cls, name: str, error: str) -> "RuleRecord":
+        """파싱 실패 레코드"""
+        return cls(name, error=error)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RuleRecord":
+        """rules_analysis.json의 Rule 항목 → 레코드"""
+        if "error" in data:
+            record = cls.failed(data["name"], data["error"])
+            record.priority = data.get("priority", DEFAULT_PRIORITY)
+            record.always_apply = bool(data.get("always_apply"))
+            return record
+
+        mtime = data.get("mtime")
+        if mtime is None and data.get("modified"):
+            mtime = datetime.fromisoformat(str(data["modified"])).timestamp()
+        return cls(
+            data["name"], os.path.dirname(data.get("path", "")),
+            data.get("size", 0), mtime or 0.0,
+            priority=data.get("priority", DEFAULT_PRIORITY),
+            always_apply=bool(data.get("always_apply")),
+            type=rule_type(data.get("type")),
+            description=data.get("description", ""),
+            globs=data.get("globs", ""),
+            tags=data.get("tags", ""),
+            content_lines=data.get("content_lines", 0),
+        )
+
+    @property
+    def path(self) -> str:
+        """워크스페이스 기준 상대 경로"""
+        return os.path.join(self.directory, self.name)
+
+    @property
+    def modified(self) -> datetime:
+        """마지막 수정 시각"""
+        return datetime.fromtimestamp(self.mtime)
+
+    def days_old(self, now: Optional[float] = None) -> int:
+        """마지막 수정 후 경과 일수"""
+        return int(((now if now is not None else time.time()) - self.mtime) // 86400)
+
+    def to_dict(self) -> Dict:
+        """rules_analysis.json 항목 (원본 metadata는 기록하지 않음)"""
+        if self.error is not None:
+            return {
+                "name": self.name,
+                "error": self.error,
+                "priority": self.priority,
+                "always_apply": self.always_apply,
+            }
+        return {
+            "name": self.name,
+            "path": self.path,
+            "size": self.size,
+            "modified": str(self.modified),
+            "mtime": self.mtime,
+            "priority": self.priority,
+            "always_apply": self.always_apply,
+            "description": self.description,
+            "globs": self.globs,
+            "type": self.type,
+            "tags": self.tags,
+            "content_lines": self.content_lines,
+        }
+
+    def __repr__(self) -> str:
+        return f"RuleRecord({self.name!r}, priority={self.priority}, always_apply={self.always_apply})"
+
+
+def load_rule_records(data: Dict) -> List[RuleRecord]:
+    """rules_analysis.json 데이터 → 레코드 목록"""
+    return [RuleRecord.from_dict(rule) for rule in data.get("rules", [])]
+
+
+def records_to_dicts(records: Iterable[RuleRecord]) -> List[Dict]:
+    """레코드 목록 → JSON 직렬화용 dict 목록"""
+    return [record.to_dict() for record in records]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 토큰화 및 토큰 집합 유사도
+
+- 텍스트당 한 번만 토큰화 (한국어 인식: 조사 제거 어간 + 음절 바이그램)
+- 토큰 문자열을 정수 id로 인터닝 → frozenset[int]로 보관
+- 유사도(Jaccard)는 인터닝된 집합끼리 계산 (쌍마다 재토큰화 없음)
+- 임계값 이상 쌍 탐색은 prefix filtering으로 후보만 비교
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+WORD_RE = re.compile(r'\w+')
+HANGUL_RE = re.compile(r'[\uac00-\ud7a3]')
+SCRIPT_RUN_RE = re.compile(r'[\uac00-\ud7a3]+|[^\uac00-\ud7a3]+')
+
+# 어절 끝 조사/어미 (긴 것부터 한 번만 제거)
+KOREAN_SUFFIXES = sorted([
+    '에서는', '으로는', '에게서', '입니다', '합니다', '됩니다',
+    '에서', '에게', '으로', '까지', '부터', '처럼', '보다', '이나', '이며', '에는', '와의', '과의',
+    '하고', '이랑', '해야', '하는', '하기', '하여', '해서', '하면', '한다', '했다', '되는',
+    '을', '를', '이', '가', '은', '는', '에', '의', '와', '과', '도', '로', '만', '나', '랑', '할', '한', '된',
+], key=len, reverse=True)
+_KOREAN_SUFFIX_SET = frozenset(KOREAN_SUFFIXES)
+KOREAN_NGRAM = 2  # 이 길이 초과(3음절 이상) 어간은 음절 바이그램도 색인 (복합어 부분 일치, 2음절 어간은 바이그램 = 어간)
+
+TokenSet = FrozenSet[int]
+
+
+def word_tokens(text: str) -> List[str]:
+    """단어 토큰 (소문자 \\w+ 단위, 중복 포함)"""
+    return WORD_RE.findall(text.lower())
+
+
+def _min_stem(suffix: str) -> int:
+    """조사를 떼고 남아야 하는 최소 음절 수 ('나이'→'나' 방지: 한 글자 조사는 2음절, 을/를은 명사 뒤에만 오므로 1음절)"""
+    return 2 if len(suffix) == 1 and suffix not in ('을', '를') else 1
+
+
+def korean_stem(word: str) -> str:
+    """한글 어절 → 어간 (끝의 조사/어미 하나 제거)"""
+    for suffix in KOREAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _min_stem(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def _korean_terms(run: str) -> List[str]:
+    """한글 연속 구간 → 추가 토큰 (어간 + 어간이 3음절 이상이면 음절 바이그램)"""
+    if run in _KOREAN_SUFFIX_SET:
+        return []  # '합니다' 같은 기능어 자체
+    stem = korean_stem(run)
+    terms = [stem] if stem != run else []
+    if len(stem) > KOREAN_NGRAM:
+        terms.extend(stem[i:i + KOREAN_NGRAM] for i in range(len(stem) - KOREAN_NGRAM + 1))
+    return terms
+
+
+def text_tokens(text: str) -> List[str]:
+    """
+    한국어 인식 토큰 (색인/중복 탐지 공용, 중복 포함)
+
+    \\w+ 토큰은 그대로 두고(부분 문자열 후보 검색 불변식 유지), 한글이 있으면
+    조사를 뗀 어간과 음절 바이그램을 덧붙인다. '배포를'/'배포는'이 '배포'로 모이고,
+    '배포자동화'가 '자동화'와 바이그램을 공유한다. 한글 없는 텍스트는 word_tokens와 같다.
+    """
+    tokens = word_tokens(text)
+    if not HANGUL_RE.search(text):
+        return tokens
+    result = []
+    for token in tokens:
+        result.append(token)
+        if not HANGUL_RE.search(token):
+            continue
+        runs = SCRIPT_RUN_RE.findall(token)
+        if len(runs) == 1:
+            result.extend(_korean_terms(token))
+            continue
+        # 'ssh키를' 같은 혼합 토큰은 문자 종류별로 나눠 추가
+        for run in runs:
+            if HANGUL_RE.match(run):
+                result.append(run)
+                result.extend(_korean_terms(run))
+            elif len(run) > 1 and run != '_':
+                result.append(run)
+    return result
+
+
+class TokenInterner:
+    """토큰 문자열 → 정수 id (프로세스 내 공유 어휘)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, tokens: Iterable[str]) -> TokenSet:
+        """토큰 목록 → 정수 id 집합"""
+        ids = self._ids
+        return frozenset([ids.setdefault(token, len(ids)) for token in tokens])
+
+    def intern_text(self, text: str) -> TokenSet:
+        """텍스트 → 정수 id 집합"""
+        return self.intern(text_tokens(text))
+
+
+def jaccard(tokens1: TokenSet, tokens2: TokenSet) -> float:
+    """Jaccard 유사도 (빈 집합이 있으면 0)"""
+    if not tokens1 or not tokens2:
+        return 0.0
+    intersection = len(tokens1 & tokens2)
+    return intersection / (len(tokens1) + len(tokens2) - intersection)
+
+
+def similar_pairs(token_sets: Sequence[TokenSet], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Jaccard가 threshold를 초과하는 모든 쌍 (i < j, (i, j) 순 정렬)
+
+    토큰을 전체 빈도 오름차순(희귀 토큰 먼저)으로 정렬했을 때,
+    J >= t인 두 집합은 각자의 앞쪽 |x| - ceil(t|x|) + 1개 토큰 중 하나를 반드시 공유한다.
+    그 prefix만 색인하여 후보를 만들고 크기 필터 후 정확한 Jaccard로 검증한다.
+    ('mdc'처럼 모든 이름에 있는 토큰은 prefix에서 빠지므로 블로킹이 무너지지 않음)
+    """
+    frequency = Counter(token for tokens in token_sets for token in tokens)
+    prefix_index = defaultdict(list)
+    pairs = []
+
+    for i, tokens in enumerate(token_sets):
+        if not tokens:
+            continue
+        size = len(tokens)
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = ordered[:size - math.ceil(threshold * size - 1e-9) + 1]
+
+        candidates = set()
+        for token in prefix:
+            candidates.update(prefix_index[token])
+        for j in candidates:
+            other = token_sets[j]
+            if min(size, len(other)) < threshold * max(size, len(other)) - 1e-9:
+                continue
+            similarity = jaccard(other, tokens)
+            if similarity > threshold:
+                pairs.append((j, i, similarity))
+
+        for token in prefix:
+            prefix_index[token].append(i)
+
+    pairs.sort()
+    return pairs
+
+
+def similar_to(token_sets: Sequence[TokenSet], targets: Iterable[int],
+               threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    targets(인덱스)가 포함된 쌍 중 Jaccard가 threshold를 초과하는 것 (i < j, (i, j) 순 정렬)
+
+    증분 갱신용: 새로 추가된 소수의 집합만 나머지 전체와 비교한다 (O(n x |targets|)).
+    """
+    pairs = set()
+    for i in targets:
+        tokens = token_sets[i]
+        if not tokens:
+            continue
+        size = len(tokens)
+        for j, other in enumerate(token_sets):
+            if j == i or not other or tokens.isdisjoint(other):
+                continue
+            if min(size, len(other)) < threshold * max(size, len(other)) - 1e-9:
+                continue
+            similarity = jaccard(tokens, other)
+            if similarity > threshold:
+                pairs.add((min(i, j), max(i, j), similarity))
+    return sorted(pairs)
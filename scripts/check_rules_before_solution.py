@@ -8,12 +8,26 @@ Rules 파일 자동 확인 스크립트 (기본 버전)
 고급 기능(통합 검색, 자동 승격 등)은 Pro Tier에서 제공됩니다.
 """
 
+import copy
 import os
 import sys
 import re
+import json
+import socket
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from rules_frontmatter import FrontMatter, read_header
+from rules_index import RulesIndex, index_tokens
+from rules_tokens import HANGUL_RE, korean_stem
+from rules_keywords import AUTOMATON_NAME, DICTIONARY_NAME, KeywordMatcher, load_matcher
+
+DAEMON_SOCKET_NAME = "rules_daemon.sock"
+DAEMON_TIMEOUT = 2.0  # 초
+QUERY_CACHE_SIZE = 256  # 검색 결과 LRU 캐시 항목 수
+
 # Windows 콘솔 UTF-8 인코딩 설정
 if sys.platform == 'win32':
     try:
@@ -50,7 +64,7 @@ def parse_rule_metadata(rule_file: Path) -> Dict:
         }
     """
     try:
-        content = rule_file.read_text(encoding='utf-8')
+        front_matter = read_header(rule_file)  # 헤더만 읽음 (본문 미로드)
     except Exception as e:
         print(f"⚠️ 파일 읽기 실패: {rule_file} - {e}")
         return {
@@ -63,93 +77,89 @@ def parse_rule_metadata(rule_file: Path) -> Dict:
             'keywords': []
         }
     
-    metadata = {
-        'priority': 10,  # 기본값
-        'description': '',
-        'alwaysApply': False,
-        'type': None,
-        'tags': [],
-        'globs': [],
-        'keywords': []
-    }
-    
-    # YAML 프론트매터 파싱
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            yaml_content = parts[1]
-            for line in yaml_content.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    
-                    if key == 'priority':
-                        metadata['priority'] = int(value) if value.isdigit() else 10
-                    elif key == 'description':
-                        metadata['description'] = value
-                    elif key == 'alwaysApply':
-                        metadata['alwaysApply'] = value.lower() in ['true', '1', 'yes']
-                    elif key == 'type':
-                        metadata['type'] = value.strip('"').strip("'")
-                    elif key == 'tags':
-                        try:
-                            import ast
-                            if value.strip().startswith('['):
-                                tags_list = ast.literal_eval(value.strip())
-                                metadata['tags'] = tags_list if isinstance(tags_list, list) else []
-                            else:
-                                metadata['tags'] = [value.strip()]
-                        except:
-                            metadata['tags'] = []
-                    elif key == 'globs':
-                        try:
-                            import ast
-                            if value.strip().startswith('['):
-                                globs_list = ast.literal_eval(value.strip())
-                                metadata['globs'] = globs_list if isinstance(globs_list, list) else []
-                            else:
-                                metadata['globs'] = [value.strip()]
-                        except:
-                            metadata['globs'] = []
+    return metadata_from_front_matter(front_matter, rule_file.stem)
+
+def metadata_from_front_matter(front_matter: Dict[str, str], stem: str) -> Dict:
+    """파싱된 프론트매터(key → 원문 값)를 검색용 메타데이터로 변환"""
+    fm = FrontMatter(front_matter)
     
     # 파일명에서 키워드 추출
-    filename_lower = rule_file.stem.lower()
-    metadata['keywords'] = filename_lower.replace('-', ' ').replace('_', ' ').split()
+    filename_lower = stem.lower()
     
-    return metadata
+    return {
+        'priority': fm.priority if fm.priority is not None else 10,  # 기본값
+        'description': fm.description,
+        'alwaysApply': bool(fm.always_apply),
+        'type': fm.type,
+        'tags': fm.tags,
+        'globs': fm.globs,
+        'keywords': filename_lower.replace('-', ' ').replace('_', ' ').split()
+    }
+
+def keyword_matcher() -> KeywordMatcher:
+    """키워드 사전 매처 (RULES_KEYWORDS_FILE 또는 .cursor/rules_keywords.txt + 기본 사전)"""
+    cursor_dir = get_workspace_root() / ".cursor"
+    dictionary_path = Path(os.getenv("RULES_KEYWORDS_FILE") or cursor_dir / DICTIONARY_NAME)
+    cache_path = cursor_dir / AUTOMATON_NAME if cursor_dir.is_dir() else None
+    return load_matcher(dictionary_path, cache_path)
 
 def extract_keywords(problem_description: str) -> List[str]:
     """문제 설명에서 키워드 추출"""
-    keywords = []
-    
-    # 일반적인 키워드
-    common_keywords = [
-        'ssh', '키', 'hpanel', 'hostinger', 'vps', '배포',
-        '보안', '에이전트', '암호', '비밀번호',
-        'rules', '규칙', '우선순위', '무시',
-        'f드라이브', 'f-drive', 'environment', '환경',
-        'workflow', '워크플로우', 'daily', '일일'
-    ]
-    
     problem_lower = problem_description.lower()
-    for keyword in common_keywords:
-        if keyword in problem_lower:
-            keywords.append(keyword)
+    
+    # 사전 단어 (Aho–Corasick 한 번 순회로 전체 적중 검출)
+    keywords = keyword_matcher().find(problem_lower)
     
     # 단어 추출 (간단한 방식)
     words = re.findall(r'\b\w+\b', problem_lower)
     keywords.extend([w for w in words if len(w) > 3])
     
+    # 한글 어절은 조사를 뗀 2음절 이상 어간도 키워드로 ('보안을' → '보안')
+    for word in words:
+        if HANGUL_RE.search(word):
+            stem = korean_stem(word)
+            if len(stem) >= 2:
+                keywords.append(stem)
+    
     return list(set(keywords))  # 중복 제거
 
-def search_rules_files(problem_description: str, rules_dir: Optional[Path] = None) -> List[Dict]:
+def daemon_socket_path(rules_dir: Path) -> Path:
+    """Rules 검색 데몬 소켓 경로 (.cursor/rules_daemon.sock)"""
+    return Path(rules_dir).parent / DAEMON_SOCKET_NAME
+
+def query_daemon(rules_dir: Path, request: Dict, timeout: float = DAEMON_TIMEOUT) -> Optional[Dict]:
+    """
+    실행 중인 Rules 검색 데몬에 JSON 한 줄 요청
+    
+    Returns:
+        응답 dict (데몬이 없거나 실패하면 None → 호출 측에서 직접 처리)
+    """
+    if os.getenv("RULES_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = daemon_socket_path(rules_dir)
+    if not socket_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return response if response.get('ok') else None
+
+def search_rules_files(problem_description: str, rules_dir: Optional[Path] = None,
+                       top_k: Optional[int] = None, use_daemon: bool = True) -> List[Dict]:
     """
     문제 설명과 관련된 Rules 파일 검색
     
     Args:
         problem_description: 문제 설명
         rules_dir: Rules 디렉토리 경로 (None이면 자동 탐색)
+        top_k: 지정 시 BM25 랭킹 모드 - 관련도(+priority 보정) 상위 k개만 반환 ('score' 포함)
+        use_daemon: 검색 데몬(scripts/rules_daemon.py)이 실행 중이면 데몬에 질의
     
     Returns:
         [
@@ -171,20 +181,110 @@ def search_rules_files(problem_description: str, rules_dir: Optional[Path] = Non
         print(f"⚠️ Rules 디렉토리를 찾을 수 없습니다: {rules_dir}")
         return []
     
-    # Rules 파일 목록
-    rules_files = list(rules_dir.glob("*.mdc"))
+    # 데몬이 있으면 메모리에 유지된 색인으로 검색
+    if use_daemon:
+        response = query_daemon(rules_dir, {"op": "search", "problem": problem_description, "top_k": top_k})
+        if response is not None:
+            return response["results"]
     
-    if not rules_files:
-        return []
+    # 역색인으로 후보만 추림 (변경된 파일만 증분 재색인)
+    index = RulesIndex(rules_dir)
+    try:
+        index.update()
+        return search_with_index(index, problem_description, top_k)
+    finally:
+        index.close()
+
+class QueryCache:
+    """
+    검색 결과 LRU 캐시
+    
+    키: (Rules 디렉토리, 코퍼스 버전, 정규화된 키워드 집합, top_k)
+    코퍼스 버전은 Rules가 바뀌어 재색인될 때마다 갱신되므로 오래된 결과는 조회되지 않는다.
+    """
     
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = {}  # Rules 디렉토리 → 마지막으로 본 코퍼스 버전
+    
+    @staticmethod
+    def key(index: RulesIndex, keywords: List[str], top_k: Optional[int]) -> tuple:
+        """캐시 키 (키워드 순서/중복/대소문자 무시)"""
+        return (str(index.rules_dir), index.version,
+                frozenset(keyword.strip().lower() for keyword in keywords), top_k)
+    
+    def get(self, key: tuple) -> Optional[List[Dict]]:
+        """적중 시 결과 깊은 사본 (tags/keywords 목록까지 - 호출 측 수정이 캐시에 번지지 않도록)"""
+        rules_dir, version = key[0], key[1]
+        if self._versions.get(rules_dir, version) != version:
+            # 코퍼스가 바뀜 → 해당 디렉토리의 이전 버전 결과 폐기
+            for stale in [k for k in self._entries if k[0] == rules_dir]:
+                del self._entries[stale]
+        self._versions[rules_dir] = version
+        
+        results = self._entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(results)
+    
+    def put(self, key: tuple, results: List[Dict]):
+        """결과 깊은 사본 저장 (가장 오래 안 쓰인 항목부터 제거)"""
+        self._entries[key] = copy.deepcopy(results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """전체 비우기 (카운터 유지)"""
+        self._entries.clear()
+        self._versions.clear()
+    
+    def stats(self) -> Dict:
+        """적중/실패 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# 프로세스 공용 검색 결과 캐시 (데몬이나 라이브러리로 반복 호출할 때 효과)
+query_cache = QueryCache()
+
+def search_with_index(index: RulesIndex, problem_description: str,
+                      top_k: Optional[int] = None, cache: Optional[QueryCache] = query_cache) -> List[Dict]:
+    """열린 색인으로 검색 (색인 갱신은 호출 측 책임 - 데몬이 재사용, cache=None이면 캐시 미사용)"""
     # 문제 설명에서 키워드 추출
     keywords = extract_keywords(problem_description)
     
-    # 각 Rules 파일 검색
+    if cache is None:
+        return _search(index, keywords, top_k)
+    key = QueryCache.key(index, keywords, top_k)
+    results = cache.get(key)
+    if results is None:
+        results = _search(index, keywords, top_k)
+        cache.put(key, results)
+    return results
+
+def _search(index: RulesIndex, keywords: List[str], top_k: Optional[int]) -> List[Dict]:
+    """키워드 → 검색 결과 (랭킹 모드 또는 키워드 매칭 모드)"""
+    if top_k is not None:
+        return _ranked_rules(index, keywords, top_k)
+    candidates = index.documents(index.candidates(keywords))
+    
+    # 후보 Rules 파일 검증
     related_rules = []
-    for rule_file in rules_files:
-        # Rules 파일 메타데이터 읽기
-        metadata = parse_rule_metadata(rule_file)
+    for doc in candidates.values():
+        rule_file = doc['path']
+        metadata = metadata_from_front_matter(doc['front_matter'], rule_file.stem)
         
         # 키워드 매칭 확인
         matches = False
@@ -219,31 +319,55 @@ def search_rules_files(problem_description: str, rules_dir: Optional[Path] = Non
                 matches = True
         
         if matches:
-            related_rules.append({
-                'file': rule_file.name,
-                'path': str(rule_file),
-                'priority': metadata.get('priority', 10),
-                'description': metadata.get('description', ''),
-                'type': metadata.get('type'),
-                'tags': metadata.get('tags', []),
-                'keywords': keywords
-            })
+            related_rules.append(_rule_result(rule_file, metadata, keywords))
     
     # 우선순위 순 정렬
     related_rules.sort(key=lambda x: x['priority'])
     
     return related_rules
 
+def _ranked_rules(index: RulesIndex, keywords: List[str], top_k: int) -> List[Dict]:
+    """BM25 랭킹 모드: 점수 상위 k개 Rules"""
+    query_tokens = [token for keyword in keywords for token in index_tokens(keyword)]
+    ranked = index.rank(query_tokens, top_k)
+    docs = index.documents(doc_id for _, doc_id in ranked)
+    
+    results = []
+    for score, doc_id in ranked:
+        rule_file = docs[doc_id]['path']
+        metadata = metadata_from_front_matter(docs[doc_id]['front_matter'], rule_file.stem)
+        result = _rule_result(rule_file, metadata, keywords)
+        result['score'] = round(score, 4)
+        results.append(result)
+    return results
+
+def _rule_result(rule_file: Path, metadata: Dict, keywords: List[str]) -> Dict:
+    """검색 결과 항목"""
+    return {
+        'file': rule_file.name,
+        'path': str(rule_file),
+        'priority': metadata.get('priority', 10),
+        'description': metadata.get('description', ''),
+        'type': metadata.get('type'),
+        'tags': metadata.get('tags', []),
+        'keywords': keywords
+    }
+
 def main():
     """메인 함수 (테스트용)"""
-    if len(sys.argv) > 1:
-        problem = ' '.join(sys.argv[1:])
-    else:
-        problem = "SSH 키 문제 해결"
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="문제 해결 전 관련 Rules 검색")
+    parser.add_argument("problem", nargs="*", help="문제 설명")
+    parser.add_argument("--top-k", type=int, default=None, help="BM25 랭킹 모드: 관련도 상위 k개만 출력")
+    parser.add_argument("--no-daemon", action="store_true", help="검색 데몬이 실행 중이어도 직접 검색")
+    args = parser.parse_args()
+    
+    problem = ' '.join(args.problem) if args.problem else "SSH 키 문제 해결"
     
     print(f"🔍 검색 쿼리: {problem}\n")
     
-    results = search_rules_files(problem)
+    results = search_rules_files(problem, top_k=args.top_k, use_daemon=not args.no_daemon)
     
     if not results:
         print("❌ 관련 Rules 파일을 찾을 수 없습니다.")
@@ -253,7 +377,8 @@ def main():
     
     for rule in results:
         priority_icon = "🚨" if rule['priority'] == 0 else "📌"
-        print(f"{priority_icon} [{rule['priority']}] {rule['file']}")
+        score = f" (score {rule['score']:.2f})" if 'score' in rule else ""
+        print(f"{priority_icon} [{rule['priority']}] {rule['file']}{score}")
         print(f"   Description: {rule['description']}")
         if rule.get('tags'):
             print(f"   Tags: {', '.join(rule['tags'])}")
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rules 검색 데몬 (watch 모드, asyncio)
+
+- 코퍼스/역색인 연결을 열어 둔 채 유지 (어휘·통계·문서 테이블 메모리 상주)
+- .cursor/rules 디렉토리를 주기적으로 폴링, 바뀐 파일이 있을 때만 증분 재색인
+- Unix 소켓(.cursor/rules_daemon.sock)으로 JSON-lines 요청/응답 (연결당 여러 줄 가능)
+  - {"op": "search", "problem": "...", "top_k": null}
+  - {"op": "metadata", "file": "rule.mdc"}
+  - {"op": "stats"} / {"op": "ping"} / {"op": "shutdown"}
+- 동시에 들어온 질의는 한 배치로 모아 공유 색인에서 차례로 처리,
+  처리 대기 중인 동일 질의는 한 번만 계산해 결과를 공유 (coalescing)
+- 완료된 검색 결과는 코퍼스 버전별 LRU 캐시(query_cache)로 재사용
+- check_rules_before_solution.py는 소켓이 있으면 자동으로 데몬에 질의
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from rules_frontmatter import FrontMatter
+from rules_index import RulesIndex
+from rules_record import DEFAULT_PRIORITY
+from check_rules_before_solution import (
+    daemon_socket_path, get_workspace_root, metadata_from_front_matter, query_cache, query_daemon, search_with_index
+)
+
+DEFAULT_POLL_INTERVAL = 0.5  # 초
+MAX_REQUEST_BYTES = 1 << 20  # 요청 한 줄 최대 크기
+
+
+def snapshot(rules_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """디렉토리의 *.mdc 지문 {name: (mtime_ns, size)} (glob과 같이 숨김 파일 제외)"""
+    result = {}
+    try:
+        with os.scandir(rules_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.mdc') and not entry.name.startswith('.') and entry.is_file():
+                    st = entry.stat()
+                    result[entry.name] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass
+    return result
+
+
+def query_key(request: Dict) -> Optional[Tuple]:
+    """색인 질의 요청 → coalescing 키 (색인을 쓰지 않는 요청은 None)"""
+    op = request.get("op")
+    if op == "search":
+        top_k = request.get("top_k")
+        return ("search", request.get("problem", ""), None if top_k is None else int(top_k))
+    if op == "metadata":
+        return ("metadata", request.get("file", ""))
+    return None
+
+
+class RulesDaemon:
+    """
+    색인을 메모리에 유지하는 asyncio 검색 서버
+
+    SQLite 연결은 이벤트 루프 스레드에서만 사용한다. 연결 핸들러는 질의를
+    대기열에 넣고 기다리며, 워커 하나가 쌓인 질의를 배치로 꺼내 처리한다.
+    재색인도 같은 루프에서 배치 사이에만 일어나므로 질의와 섞이지 않는다.
+    """
+
+    def __init__(self, rules_dir: Path, socket_path: Path, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.rules_dir = Path(rules_dir)
+        self.socket_path = Path(socket_path)
+        self.poll_interval = poll_interval
+        self.index = RulesIndex(self.rules_dir, resident=True)
+        self.stats = {
+            "started_at": time.time(), "queries": 0, "batches": 0, "max_batch": 0,
+            "coalesced": 0, "updates": 0, "updated_at": None,
+        }
+        self._snapshot = None
+        self._summary = None
+        self._by_name = {}
+        self._inflight = {}  # key → Future (대기 중인 질의)
+        self._queue = []  # 처리할 키 (도착 순)
+        self._wakeup = None
+        self._stopped = None
+        self._handlers = set()  # 열린 연결 핸들러 태스크 (종료 시 닫고 대기)
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """디렉토리 폴링 → 바뀌었으면 증분 재색인"""
+        current = snapshot(self.rules_dir)
+        if current == self._snapshot:
+            return False
+        self._snapshot = current
+        result = self.index.update()
+        self._summary = None
+        self.summary()  # 상주 문서 테이블을 미리 채워 첫 질의 지연 제거
+        self.stats["updates"] += 1
+        self.stats["updated_at"] = time.time()
+        print(f"🔄 재색인: {result['indexed']}개 색인, {result['removed']}개 제거 (총 {len(current)}개)")
+        return True
+
+    async def serve(self):
+        """shutdown 요청이나 취소(Ctrl+C)까지 요청 처리 + 폴링"""
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path), limit=MAX_REQUEST_BYTES)
+        tasks = [asyncio.ensure_future(self._worker()), asyncio.ensure_future(self._watch())]
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            # 아직 열린 연결 (한 연결로 여러 요청 가능) → 취소 후 정리 대기 (루프 종료 시 미처리 취소 방지)
+            tasks.extend(self._handlers)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        """색인 연결 종료 + 소켓 파일 제거"""
+        self.index.close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """연결 하나: 요청 줄마다 응답 한 줄 (요청 순서대로)"""
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # 클라이언트가 먼저 끊었거나 너무 긴 요청
+        except asyncio.CancelledError:
+            pass  # 데몬 종료 - 연결만 닫음
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def dispatch(self, request: Dict) -> Dict:
+        """요청 처리 (색인 질의는 배치 대기열 경유)"""
+        op = request.get("op")
+        key = query_key(request)
+        if key is not None:
+            self.stats["queries"] += 1
+            result = await self._submit(key)
+            return {"ok": True, ("results" if op == "search" else "metadata"): result}
+        if op == "stats":
+            return {"ok": True, "stats": self.summary()}
+        if op == "ping":
+            return {"ok": True}
+        if op == "shutdown":
+            self._stopped.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"알 수 없는 요청: {op}"}
+
+    def _submit(self, key: Tuple) -> asyncio.Future:
+        """질의를 대기열에 추가 (같은 키가 이미 대기 중이면 그 결과를 공유)"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.get_event_loop().create_future()
+            self._inflight[key] = future
+            self._queue.append(key)
+            self._wakeup.set()
+        return asyncio.shield(future)  # 한 연결이 끊겨도 공유 결과는 취소되지 않음
+
+    async def _worker(self):
+        """대기열에 쌓인 질의를 배치로 처리"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await asyncio.sleep(0)  # 같은 틱에 도착한 요청까지 배치에 포함
+            batch, self._queue = self._queue, []
+            if not batch:
+                continue  # 직전 배치가 이미 가져감
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            for key in batch:
+                future = self._inflight.pop(key)
+                try:
+                    future.set_result(self._run(key))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _run(self, key: Tuple):
+        """질의 하나 실행 (루프 스레드, 동기)"""
+        if key[0] == "search":
+            _, problem, top_k = key
+            return search_with_index(self.index, problem, top_k)
+        name = key[1]
+        front_matter = self._by_name.get(name)
+        if front_matter is None:
+            raise KeyError(f"Rules 파일이 없습니다: {name}")
+        return metadata_from_front_matter(front_matter, Path(name).stem)
+
+    async def _watch(self):
+        """폴링 주기마다 디렉토리 확인 (배치 사이에 실행)"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            self.refresh()
+
+    def summary(self) -> Dict:
+        """진단 요약 (Rules 수, alwaysApply 수, priority 분포 + 데몬 상태)"""
+        if self._summary is None:
+            priorities = Counter()
+            always_apply = 0
+            docs = self.index.documents(self.index.ids())
+            self._by_name = {}
+            for doc in docs.values():
+                self._by_name[doc["name"]] = doc["front_matter"]
+                front_matter = FrontMatter(doc["front_matter"])
+                priority = front_matter.priority
+                priorities[priority if priority is not None else DEFAULT_PRIORITY] += 1
+                always_apply += bool(front_matter.always_apply)
+            self._summary = {
+                "rules": len(docs),
+                "always_apply": always_apply,
+                "priority": {str(p): count for p, count in sorted(priorities.items())},
+            }
+        return dict(self._summary, cache=query_cache.stats(), **self.stats)
+
+
+def main():
+    """메인 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rules 검색 데몬 (watch 모드)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="디렉토리 폴링 주기 (초)")
+    parser.add_argument("--status", action="store_true", help="실행 중인 데몬 상태 출력")
+    parser.add_argument("--stop", action="store_true", help="실행 중인 데몬 종료")
+    args = parser.parse_args()
+
+    rules_dir = get_workspace_root() / ".cursor" / "rules"
+    socket_path = daemon_socket_path(rules_dir)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ 이 플랫폼은 Unix 소켓을 지원하지 않습니다. (CLI는 직접 검색으로 동작)")
+        return 1
+
+    if args.status or args.stop:
+        response = query_daemon(rules_dir, {"op": "shutdown" if args.stop else "stats"})
+        if response is None:
+            print("⚪ 실행 중인 데몬이 없습니다.")
+            return 1
+        if args.stop:
+            print("✅ 데몬 종료 요청 완료")
+        else:
+            print(json.dumps(response["stats"], indent=2, ensure_ascii=False))
+        return 0
+
+    if not rules_dir.exists():
+        print(f"⚠️ Rules 디렉토리를 찾을 수 없습니다: {rules_dir}")
+        return 1
+    if query_daemon(rules_dir, {"op": "ping"}) is not None:
+        print(f"⚪ 이미 실행 중입니다: {socket_path}")
+        return 0
+    if socket_path.exists():
+        socket_path.unlink()  # 비정상 종료한 데몬이 남긴 소켓
+
+    daemon = RulesDaemon(rules_dir, socket_path, args.interval)
+    print(f"👀 Rules 감시 중: {rules_dir}")
+    print(f"🔌 소켓: {socket_path} (종료: Ctrl+C 또는 --stop)", flush=True)
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    print("✅ 데몬 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""pytest 공용 설정 - 저장소 루트의 rules_*.py 모듈을 import 경로에 추가"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
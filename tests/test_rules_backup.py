@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""rules_backup: 내용 주소 기반 스냅샷/비교/복원/가져오기"""
+
+import os
+
+import pytest
+
+from rules_backup import BackupStore
+
+
+@pytest.fixture
+def rules_dir(tmp_path):
+    path = tmp_path / "rules"
+    path.mkdir()
+    for name in ("a.mdc", "b.mdc", "c.mdc"):
+        (path / name).write_text(f"# {name}\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(tmp_path / "store")
+
+
+def test_snapshot_stores_each_content_once(store, rules_dir):
+    (rules_dir / "c.mdc").write_text("# a.mdc\n", encoding="utf-8")  # a와 같은 내용
+    first = store.snapshot(rules_dir)
+    assert first["rules"] == 3 and first["new_blobs"] == 2
+
+    second = store.snapshot(rules_dir)
+    assert second["read"] == 0 and second["new_blobs"] == 0  # 지문이 같으면 읽지 않음
+
+
+def test_diff_and_partial_restore_keeps_other_rules(store, rules_dir):
+    snapshot_id = store.snapshot(rules_dir)["id"]
+    (rules_dir / "a.mdc").write_text("# changed a\n", encoding="utf-8")
+    (rules_dir / "b.mdc").write_text("# changed b\n", encoding="utf-8")
+    (rules_dir / "d.mdc").write_text("# new\n", encoding="utf-8")
+
+    assert store.diff(snapshot_id, rules_dir=rules_dir) == {
+        "added": ["d.mdc"], "removed": [], "changed": ["a.mdc", "b.mdc"],
+    }
+
+    result = store.restore(snapshot_id, rules_dir, names=["a.mdc"], delete=True)
+
+    assert result["restored"] == ["a.mdc"]
+    assert result["deleted"] == []
+    assert (rules_dir / "a.mdc").read_text(encoding="utf-8") == "# a.mdc\n"
+    assert (rules_dir / "b.mdc").read_text(encoding="utf-8") == "# changed b\n"
+    assert (rules_dir / "d.mdc").exists()
+
+
+def test_restore_takes_pre_restore_snapshot(store, rules_dir):
+    snapshot_id = store.snapshot(rules_dir)["id"]
+    (rules_dir / "a.mdc").write_text("# edited\n", encoding="utf-8")
+
+    result = store.restore(snapshot_id, rules_dir)
+
+    assert result["restored"] == ["a.mdc"]
+    pre_restore = store.manifest(result["pre_restore"])
+    assert pre_restore["label"] == f"pre-restore {snapshot_id}"
+    # 복원도 되돌릴 수 있음
+    store.restore(result["pre_restore"], rules_dir)
+    assert (rules_dir / "a.mdc").read_text(encoding="utf-8") == "# edited\n"
+
+
+def test_restore_without_changes_skips_pre_restore(store, rules_dir):
+    snapshot_id = store.snapshot(rules_dir)["id"]
+    result = store.restore(snapshot_id, rules_dir)
+    assert result["restored"] == [] and result["pre_restore"] is None
+
+
+def test_full_restore_with_delete_removes_new_rules(store, rules_dir):
+    snapshot_id = store.snapshot(rules_dir)["id"]
+    (rules_dir / "d.mdc").write_text("# new\n", encoding="utf-8")
+    assert store.restore(snapshot_id, rules_dir, delete=True)["deleted"] == ["d.mdc"]
+    assert not (rules_dir / "d.mdc").exists()
+
+
+def test_restore_preserves_mtime(store, rules_dir):
+    os.utime(rules_dir / "a.mdc", ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    snapshot_id = store.snapshot(rules_dir)["id"]
+    (rules_dir / "a.mdc").write_text("# edited\n", encoding="utf-8")
+    store.restore(snapshot_id, rules_dir)
+    assert (rules_dir / "a.mdc").stat().st_mtime_ns == 1_600_000_000_000_000_000
+
+
+def test_import_is_dated_by_folder_timestamp_and_not_latest(store, rules_dir, tmp_path):
+    current_id = store.snapshot(rules_dir)["id"]
+    old_dir = tmp_path / "rules_backup_20240101_000000"
+    old_dir.mkdir()
+    (old_dir / "a.mdc").write_text("# old a\n", encoding="utf-8")
+
+    store.import_dir(old_dir)
+
+    assert store.manifest(old_dir.name)["created_at"].startswith("2024-01-01T00:00:00")
+    assert store.manifest("latest")["id"] == current_id
+    assert store.snapshot_ids() == [old_dir.name, current_id]
+    assert store.snapshot(rules_dir)["read"] == 0  # 가져온 폴더가 지문 기준이 되지 않음
+
+
+def test_import_without_timestamp_uses_file_mtime(store, rules_dir, tmp_path):
+    current_id = store.snapshot(rules_dir)["id"]
+    old_dir = tmp_path / "old-copy"
+    old_dir.mkdir()
+    (old_dir / "a.mdc").write_text("# old a\n", encoding="utf-8")
+    os.utime(old_dir / "a.mdc", (1_500_000_000, 1_500_000_000))
+
+    store.import_dir(old_dir)
+
+    assert store.manifest("latest")["id"] == current_id
+    assert store.snapshot_ids()[0] == "old-copy"
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""rules_edit: 프론트매터 재작성 + 트랜잭션 배치 적용"""
+
+import hashlib
+
+import pytest
+
+import rules_edit
+from rules_edit import FrontMatterBatch, TMP_SUFFIX, rewrite_front_matter
+
+
+def write_rules(rules_dir, files):
+    rules_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (rules_dir / name).write_bytes(content.encode("utf-8"))
+
+
+def snapshot(rules_dir):
+    return {path.name: path.read_bytes() for path in sorted(rules_dir.iterdir())}
+
+
+RULES = {
+    "a.mdc": "---\ndescription: a\npriority: 0\nalwaysApply: true\n---\n# A\n",
+    "b.mdc": "---\ndescription: b\npriority: 0\nalwaysApply: true\n---\n# B\n",
+    "c.mdc": "---\ndescription: c\npriority: 0\nalwaysApply: true\n---\n# C\n",
+}
+
+
+def test_rewrite_changes_only_front_matter():
+    content = "---\nalwaysApply: true\n---\n# Rule\n\n```yaml\nalwaysApply: true\n```\n"
+    result = rewrite_front_matter(content, {"alwaysApply": (False, None)})
+    assert result == "---\nalwaysApply: false\n---\n# Rule\n\n```yaml\nalwaysApply: true\n```\n"
+
+
+def test_rewrite_keeps_bom_crlf_comments_and_body():
+    content = "\ufeff---\r\n# 주석\r\ndescription: 설명\r\npriority: 0\r\n---\r\n본문 priority: 0\r\n"
+    result = rewrite_front_matter(content, {"priority": (1, None), "type": ("intelligent", "priority")})
+    assert result == (
+        "\ufeff---\r\n# 주석\r\ndescription: 설명\r\npriority: 1\r\ntype: \"intelligent\"\r\n---\r\n"
+        "본문 priority: 0\r\n"
+    )
+
+
+def test_rewrite_adds_header_to_file_without_front_matter():
+    content = "# Rule\n\npriority: 0 in body\n"
+    result = rewrite_front_matter(content, {"priority": (1, None)})
+    assert result == "---\npriority: 1\n---\n# Rule\n\npriority: 0 in body\n"
+
+
+def test_rewrite_unchanged_returns_same_content():
+    content = "---\npriority: 1\n---\nbody\n"
+    assert rewrite_front_matter(content, {"priority": (1, None)}) is content
+
+
+def test_apply_commits_all_files(tmp_path):
+    write_rules(tmp_path, RULES)
+    batch = FrontMatterBatch(tmp_path)
+    for name in RULES:
+        batch.set(name, "priority", 1)
+    batch.set("c.mdc", "priority", 0)  # 변경 없음
+
+    result = batch.apply()
+
+    assert result["committed"]
+    assert result["changed"] == ["a.mdc", "b.mdc"]
+    assert result["unchanged"] == ["c.mdc"]
+    assert (tmp_path / "a.mdc").read_text(encoding="utf-8").startswith("---\ndescription: a\npriority: 1\n")
+    assert not list(tmp_path.glob("*" + TMP_SUFFIX))
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    write_rules(tmp_path, RULES)
+    before = snapshot(tmp_path)
+    batch = FrontMatterBatch(tmp_path)
+    batch.set("a.mdc", "alwaysApply", False)
+
+    result = batch.apply(dry_run=True)
+
+    assert result["changed"] == ["a.mdc"]
+    assert not result["committed"]
+    assert snapshot(tmp_path) == before
+
+
+def test_replace_failure_rolls_back_committed_files(tmp_path, monkeypatch):
+    write_rules(tmp_path, RULES)
+    before = snapshot(tmp_path)
+    batch = FrontMatterBatch(tmp_path)
+    for name in RULES:
+        batch.set(name, "alwaysApply", False)
+
+    real_replace = rules_edit.os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:  # 두 번째 파일 커밋 중 실패
+            raise OSError("disk full")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(rules_edit.os, "replace", failing_replace)
+    result = batch.apply()
+
+    assert not result["committed"]
+    assert "b.mdc" in result["failed"]
+    assert snapshot(tmp_path) == before  # 이미 교체한 a.mdc도 원본으로, 임시 파일 없음
+
+
+def test_hash_mismatch_aborts_batch(tmp_path):
+    write_rules(tmp_path, RULES)
+    batch = FrontMatterBatch(tmp_path)
+    for name in RULES:
+        batch.set(name, "priority", 1)
+        batch.expect_hash(name, hashlib.sha256(RULES[name].encode("utf-8")).hexdigest())
+    (tmp_path / "b.mdc").write_text(RULES["b.mdc"] + "edited\n", encoding="utf-8")
+    before = snapshot(tmp_path)
+
+    result = batch.apply()
+
+    assert not result["committed"]
+    assert list(result["failed"]) == ["b.mdc"]
+    assert snapshot(tmp_path) == before
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_parallel_prepare_matches_serial(tmp_path, jobs):
+    write_rules(tmp_path, RULES)
+    batch = FrontMatterBatch(tmp_path)
+    for name in RULES:
+        batch.set(name, "type", "intelligent", after="alwaysApply")
+
+    assert batch.apply(jobs=jobs)["committed"]
+    assert (tmp_path / "c.mdc").read_text(encoding="utf-8") == (
+        "---\ndescription: c\npriority: 0\nalwaysApply: true\ntype: \"intelligent\"\n---\n# C\n"
+    )
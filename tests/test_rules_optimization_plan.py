@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""최적화 계획 → rules_optimizer.apply_plan: 계획 이후 바뀐/삭제된 파일이 있으면 아무것도 바꾸지 않음"""
+
+import json
+
+import pytest
+
+import rules_diagnostics
+import rules_optimization_plan
+import rules_optimizer
+from rules_diagnostics import RulesManager
+from rules_optimization_plan import (
+    DEFAULT_CONFIG, analyze_always_apply_rules, analyze_priority_0_rules, build_operations,
+)
+
+
+def rule(priority, always_apply, globs=""):
+    lines = ["---", "description: test", f"priority: {priority}", f"alwaysApply: {str(always_apply).lower()}"]
+    if globs:
+        lines.append(f'globs: ["{globs}"]')
+    return "\n".join(lines + ["---", "# Rule", ""])
+
+
+RULES = {
+    "rules-priority-enforcement.mdc": rule(0, True),  # 유지 목록
+    "layer0-one.mdc": rule(0, True),
+    "layer0-two.mdc": rule(0, False),
+    "workflow.mdc": rule(1, True),
+    "python-style.mdc": rule(2, True, "**/*.py"),
+    "manual.mdc": rule(5, False),
+}
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    rules_dir = tmp_path / ".cursor" / "rules"
+    rules_dir.mkdir(parents=True)
+    for name, content in RULES.items():
+        (rules_dir / name).write_text(content, encoding="utf-8")
+    for module in (rules_diagnostics, rules_optimization_plan, rules_optimizer):
+        monkeypatch.setattr(module, "WORKSPACE", tmp_path)
+    monkeypatch.setattr(rules_diagnostics, "RULES_DIR", rules_dir)
+    monkeypatch.setattr(rules_optimizer, "RULES_DIR", rules_dir)
+    monkeypatch.setattr(rules_optimizer, "BACKUP_ROOT", tmp_path / ".cursor" / "rules_backup")
+    return rules_dir
+
+
+def generate_plan(tmp_path):
+    """진단 → 분석 → operations → 계획 파일"""
+    config = {section: dict(values) for section, values in DEFAULT_CONFIG.items()}
+    config["priority_0"]["max_count"] = 1
+    rules = RulesManager().rules
+    operations, stale = build_operations(
+        rules, analyze_priority_0_rules(rules, config), analyze_always_apply_rules(rules, config)
+    )
+    assert not stale
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(json.dumps({"operations": operations}), encoding="utf-8")
+    return plan_path, operations
+
+
+def contents(rules_dir):
+    return {path.name: path.read_bytes() for path in sorted(rules_dir.glob("*.mdc"))}
+
+
+def test_plan_applies_only_planned_files(workspace, tmp_path):
+    plan_path, operations = generate_plan(tmp_path)
+    planned = {operation["rule"] for operation in operations}
+    assert planned == {"layer0-one.mdc", "layer0-two.mdc", "workflow.mdc", "python-style.mdc"}
+    before = contents(workspace)
+
+    result = rules_optimizer.apply_plan(plan_path, dry_run=False)
+
+    assert result["committed"]
+    after = contents(workspace)
+    assert {name for name in before if before[name] != after[name]} == planned
+    assert b'type: "file-specific"' in after["python-style.mdc"]
+    assert b"priority: 1" in after["layer0-two.mdc"]
+
+
+def test_edit_after_plan_aborts_without_changes(workspace, tmp_path):
+    plan_path, _ = generate_plan(tmp_path)
+    edited = workspace / "workflow.mdc"
+    edited.write_text(edited.read_text(encoding="utf-8") + "계획 이후 수정\n", encoding="utf-8")
+    before = contents(workspace)
+
+    result = rules_optimizer.apply_plan(plan_path, dry_run=False)
+
+    assert not result["committed"]
+    assert contents(workspace) == before
+
+
+def test_deleted_rule_is_reported_and_not_applied(workspace, tmp_path, capsys):
+    plan_path, _ = generate_plan(tmp_path)
+    (workspace / "layer0-two.mdc").unlink()
+    before = contents(workspace)
+
+    result = rules_optimizer.apply_plan(plan_path, dry_run=False)
+
+    assert not result["committed"]
+    assert "⚠️ layer0-two.mdc:" in capsys.readouterr().out
+    assert not (workspace / "layer0-two.mdc").exists()
+    assert contents(workspace) == before
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""유사 이름 감지: prefix filtering 결과가 기존 이중 루프(\\w+ 단어 Jaccard)와 동일"""
+
+import random
+import re
+
+from rules_diagnostics import SIMILAR_NAME_THRESHOLD, RulesManager
+from rules_record import RuleRecord
+
+WORDS = ["ssh", "key", "deploy", "layer0", "core", "mcp", "daily", "workflow", "rules",
+         "배포", "배포를", "자동화", "배포자동화", "보안", "검증", "규칙", "우선순위"]
+
+
+def legacy_similarity(s1, s2):
+    """기존 RulesManager._similarity (변경 전 구현)"""
+    words1 = set(re.findall(r'\w+', s1.lower()))
+    words2 = set(re.findall(r'\w+', s2.lower()))
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+def legacy_pairs(names):
+    """기존 이중 루프"""
+    pairs = []
+    for i, name1 in enumerate(names):
+        for j in range(i + 1, len(names)):
+            similarity = legacy_similarity(name1, names[j])
+            if similarity > SIMILAR_NAME_THRESHOLD:
+                pairs.append((name1, names[j], similarity))
+    return pairs
+
+
+def make_names(count, seed=7):
+    rng = random.Random(seed)
+    names = {"배포-자동화.mdc", "배포를-자동화.mdc", "배포자동화.mdc", "ssh-key-deploy.mdc", "ssh-key-deploy-v2.mdc"}
+    while len(names) < count:
+        names.add("-".join(rng.sample(WORDS, rng.randint(1, 4))) + rng.choice(["", "-v2", "_old"]) + ".mdc")
+    return sorted(names)
+
+
+def manager_for(names):
+    manager = RulesManager(scan=False)
+    manager.rules = [RuleRecord(name) for name in names]
+    return manager
+
+
+def test_detect_conflicts_matches_legacy_loop():
+    names = make_names(600)
+    manager = manager_for(names)
+    manager.detect_conflicts()
+    assert manager.similar_names == legacy_pairs(names)
+
+
+def test_korean_names_use_word_tokens():
+    manager = manager_for(["배포-자동화.mdc", "배포를-자동화.mdc"])
+    manager.detect_conflicts()
+    # 조사 제거 어간을 쓰면 같은 이름으로 보이지만, 기존 계약은 \w+ 단어 비교
+    assert manager.similar_names == legacy_pairs(["배포-자동화.mdc", "배포를-자동화.mdc"]) == []
+
+
+def test_incremental_update_matches_full_detection():
+    names = make_names(300)
+    added = names[::7]
+    manager = manager_for([name for name in names if name not in added])
+    manager.detect_conflicts()
+    manager.rules = [RuleRecord(name) for name in names]
+    manager._update_similar_names(added, set())
+    assert manager.similar_names == legacy_pairs(names)